@@ -0,0 +1,203 @@
+"""Opt-in selection of the fastest concrete algorithm based on measured timings.
+
+When enabled (`core.autotune.enabled`), the first dispatch of an abstract algorithm
+for a given (input size bucket, property profile) times each viable solution,
+including the cost of any required translations. The winner is stored in a JSON
+profile and preferred by `find_algorithm_solutions` on subsequent dispatches.
+Every `core.autotune.revalidate_every` dispatches, the candidates are timed again.
+Dispatch counts are saved with the profile, or at exit if nothing else was saved.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import List, Optional, Dict, Any
+from .. import config
+from .plugin import AbstractType
+from .typing import Combo
+from .dask.placeholder import Placeholder
+
+logger = logging.getLogger(__name__)
+
+
+class Autotuner:
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._profile: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.RLock()
+        self._unsaved_calls = False
+        self._save_at_exit = False
+
+    @property
+    def enabled(self) -> bool:
+        return bool(config.get("core.autotune.enabled", False))
+
+    @property
+    def path(self) -> str:
+        if self._path is not None:
+            return self._path
+        path = config.get("core.autotune.profile", None)
+        if path is None:
+            path = os.path.join(config.main_path, "autotune.json")
+        return os.path.expanduser(path)
+
+    @property
+    def profile(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            if self._profile is None:
+                self._profile = self._load()
+            return self._profile
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Write the profile to disk, replacing the previous file atomically"""
+        path = self.path
+        with self._lock:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.profile, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+            self._unsaved_calls = False
+
+    def save_calls(self):
+        """Write the profile if dispatch counts changed since it was last saved"""
+        with self._lock:
+            if self._unsaved_calls:
+                self.save()
+
+    def clear(self):
+        with self._lock:
+            self._profile = {}
+
+    @staticmethod
+    def algo_id(plan) -> str:
+        func = plan.algo.func
+        return f"{func.__module__}.{func.__qualname__}"
+
+    @staticmethod
+    def make_key(resolver, algo_name: str, args, kwargs) -> Optional[str]:
+        """
+        Builds the profile key for a call: (abstract algorithm, size bucket, property profile).
+        The size bucket is the bit length of the total number of nodes and edges (or bytes
+        when those are unknown). The property profile is the concrete type of each graph-like
+        argument along with the abstract properties required by the abstract algorithm.
+
+        Returns None if the call cannot be keyed (e.g. lazy Placeholder arguments).
+        """
+        abstract_algo = resolver.abstract_algorithms[algo_name]
+        try:
+            bound_args = abstract_algo.__signature__.bind(*args, **kwargs)
+        except TypeError:
+            return None
+        parameters = bound_args.signature.parameters
+        magnitude = 0
+        profile = []
+        for arg_name, arg_value in bound_args.arguments.items():
+            param_type = parameters[arg_name].annotation
+            if isinstance(param_type, Combo):
+                param_type = next(
+                    (t for t in param_type.types if isinstance(t, AbstractType)), None
+                )
+            if not isinstance(param_type, AbstractType) or arg_value is None:
+                continue
+            if isinstance(arg_value, Placeholder):
+                return None
+            try:
+                typeclass = resolver.typeclass_of(arg_value)
+            except TypeError:
+                return None
+            size = typeclass.estimate_size(arg_value)
+            if size.num_nodes is not None or size.num_edges is not None:
+                magnitude += (size.num_nodes or 0) + (size.num_edges or 0)
+            elif size.nbytes is not None:
+                magnitude += size.nbytes
+            required_props = {
+                k for k, v in param_type.prop_val.items() if v is not None
+            }
+            props = typeclass.compute_abstract_properties(arg_value, required_props)
+            prop_str = ",".join(f"{k}={props[k]}" for k in sorted(required_props))
+            profile.append(f"{arg_name}={typeclass.__name__}({prop_str})")
+        bucket = int(magnitude).bit_length()
+        return f"{algo_name}|{bucket}|{';'.join(profile)}"
+
+    def needs_tuning(self, key: str) -> bool:
+        entry = self.profile.get(key)
+        if entry is None:
+            return True
+        return entry["calls"] >= config.get("core.autotune.revalidate_every", 100)
+
+    def record_call(self, key: str):
+        with self._lock:
+            entry = self.profile.get(key)
+            if entry is not None:
+                entry["calls"] += 1
+                # Saving on every dispatch would be too costly
+                self._unsaved_calls = True
+                if not self._save_at_exit:
+                    self._save_at_exit = True
+                    atexit.register(self.save_calls)
+
+    def prefer(self, key: Optional[str], solutions: List) -> List:
+        """Move the measured-fastest solution to the front, keeping the remaining order"""
+        if key is None:
+            return solutions
+        entry = self.profile.get(key)
+        if entry is None:
+            return solutions
+        for i, plan in enumerate(solutions):
+            if self.algo_id(plan) == entry["winner"]:
+                if plan.exceeds_memory_limit:
+                    break
+                return [plan] + solutions[:i] + solutions[i + 1 :]
+        return solutions
+
+    def tune(self, key: str, solutions: List, args, kwargs):
+        """
+        Times each candidate solution (including translation cost) and records the fastest.
+        Returns the result computed by the fastest candidate.
+        """
+        max_candidates = config.get("core.autotune.max_candidates", 4)
+        candidates = [plan for plan in solutions if not plan.exceeds_memory_limit]
+        candidates = candidates[:max_candidates]
+        timings = {}
+        best_time = None
+        best_result = None
+        last_error = None
+        for plan in candidates:
+            start = time.perf_counter()
+            try:
+                result = plan(*args, **kwargs)
+            except Exception as e:
+                logger.warning(
+                    "Autotuning candidate %s failed for %s",
+                    self.algo_id(plan),
+                    key,
+                    exc_info=e,
+                )
+                last_error = e
+                continue
+            elapsed = time.perf_counter() - start
+            timings[self.algo_id(plan)] = elapsed
+            if best_time is None or elapsed < best_time:
+                best_time = elapsed
+                best_result = result
+                winner = self.algo_id(plan)
+            # Release any non-winning result before timing the next candidate
+            del result
+        if best_time is None:
+            raise last_error
+
+        with self._lock:
+            self.profile[key] = {"winner": winner, "timings": timings, "calls": 0}
+        self.save()
+        return best_result
@@ -0,0 +1,219 @@
+"""A bounded cache of functions produced by compiler plugins.
+
+Compiled functions are specialized on the literal (Python scalar) arguments and the
+types and dtypes of the data arguments of each call, so different specializations
+of the same concrete algorithm are kept side by side. Entries are evicted in least
+recently used order once `core.compiler.cache.maxsize` is reached.
+
+If `core.compiler.cache.directory` is set, compiled functions which the compiler
+can serialize are also written to that directory, allowing other processes to skip
+compilation.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Optional, Tuple, Hashable
+
+from dask.base import tokenize
+
+from .plugin import ConcreteType, ConcreteAlgorithm, Compiler
+from .. import config
+
+logger = logging.getLogger(__name__)
+
+# Parameter annotations whose values are frozen into compiled functions
+_LITERAL_TYPES = (bool, int, float, str)
+
+
+@dataclass
+class CompileStats:
+    """Instrumentation for a CompileCache.
+
+    hits: lookups satisfied from memory
+    disk_hits: lookups satisfied by loading from the cache directory
+    misses: lookups which required compilation
+    compile_seconds: total time spent compiling
+    """
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    compile_seconds: float = 0.0
+
+
+def _dtype_of(value) -> Optional[str]:
+    dtype = getattr(value, "dtype", None)
+    if dtype is None:
+        dtype = getattr(getattr(value, "value", None), "dtype", None)
+    return None if dtype is None else str(dtype)
+
+
+def specialize(
+    algo: ConcreteAlgorithm, args, kwargs
+) -> Tuple[Dict[str, Any], Tuple[Tuple[str, str, Optional[str]], ...]]:
+    """
+    Returns the literal parameter values and the input type profile for a call.
+
+    Literals are arguments annotated as bool, int, float, or str. The profile contains
+    (parameter name, concrete type name, dtype) for each argument annotated with a
+    ConcreteType.
+    """
+    sig = algo.__signature__
+    try:
+        bound = sig.bind_partial(*args, **kwargs)
+    except TypeError:
+        return {}, ()
+    literals = {}
+    profile = []
+    for name, value in bound.arguments.items():
+        annotation = sig.parameters[name].annotation
+        if isinstance(annotation, ConcreteType):
+            profile.append((name, type(value).__qualname__, _dtype_of(value)))
+        elif annotation in _LITERAL_TYPES and isinstance(value, _LITERAL_TYPES):
+            literals[name] = value
+    return literals, tuple(profile)
+
+
+class CompileCache:
+    def __init__(self, maxsize: Optional[int] = None, directory: Optional[str] = None):
+        self._maxsize = maxsize
+        self._directory = directory
+        self._cache: "OrderedDict[Hashable, Callable]" = OrderedDict()
+        self._pending: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.RLock()
+        self.stats = CompileStats()
+
+    @property
+    def maxsize(self) -> int:
+        if self._maxsize is not None:
+            return self._maxsize
+        return config.get("core.compiler.cache.maxsize", 128)
+
+    @property
+    def directory(self) -> Optional[str]:
+        if self._directory is not None:
+            return self._directory
+        directory = config.get("core.compiler.cache.directory", None)
+        return None if directory is None else os.path.expanduser(directory)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def clear(self):
+        """Remove all in-memory entries and reset the stats; files on disk are kept"""
+        with self._lock:
+            self._cache.clear()
+            self.stats = CompileStats()
+
+    @staticmethod
+    def make_key(
+        algo: ConcreteAlgorithm,
+        compiler: Compiler,
+        literals: Dict[str, Any],
+        profile: Tuple = (),
+    ) -> Tuple:
+        func = algo.func
+        return (
+            f"{func.__module__}.{func.__qualname__}",
+            algo.version,
+            compiler.name,
+            # include the type so that e.g. True and 1 are distinct specializations
+            tuple(sorted((k, type(v).__name__, v) for k, v in literals.items())),
+            tuple(profile),
+        )
+
+    def get_or_compile(
+        self,
+        algo: ConcreteAlgorithm,
+        compiler: Compiler,
+        literals: Dict[str, Any] = None,
+        profile: Tuple = (),
+    ) -> Callable:
+        if literals is None:
+            literals = {}
+        key = self.make_key(algo, compiler, literals, profile)
+        while True:
+            with self._lock:
+                func = self._cache.get(key)
+                if func is not None:
+                    self._cache.move_to_end(key)
+                    self.stats.hits += 1
+                    return func
+                pending = self._pending.get(key)
+                if pending is None:
+                    # this thread compiles; others asking for the same key wait
+                    pending = self._pending[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            func = self._load(key, compiler)
+            if func is not None:
+                self.stats.disk_hits += 1
+            else:
+                func = self._compile(algo, compiler, literals, profile)
+                self._store(key, func, compiler)
+
+            with self._lock:
+                self._cache[key] = func
+                while len(self._cache) > max(self.maxsize, 1):
+                    self._cache.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.set()
+        return func
+
+    def _compile(self, algo, compiler, literals, profile) -> Callable:
+        start = time.perf_counter()
+        func = compiler.compile_algorithm(algo, literals=literals)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.stats.misses += 1
+            self.stats.compile_seconds += elapsed
+        if config.get("core.logging.compiles"):
+            print(
+                f"Compiled {algo.__name__} with {compiler.name} in {elapsed:.3f}s "
+                f"(literals={literals}, inputs={profile})"
+            )
+        return func
+
+    def _path(self, key) -> Optional[str]:
+        directory = self.directory
+        if directory is None:
+            return None
+        return os.path.join(directory, f"{tokenize(key)}.pkl")
+
+    def _load(self, key, compiler: Compiler) -> Optional[Callable]:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                return compiler.deserialize_compiled(f.read())
+        except Exception as e:
+            logger.debug("Unable to load compiled function from %s", path, exc_info=e)
+            return None
+
+    def _store(self, key, func: Callable, compiler: Compiler):
+        path = self._path(key)
+        if path is None:
+            return
+        try:
+            data = compiler.serialize_compiled(func)
+        except Exception as e:
+            # Not every compiled function can be persisted (e.g. closures)
+            logger.debug("Unable to serialize compiled function", exc_info=e)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -1,10 +1,11 @@
+import heapq
 import logging
-from dataclasses import dataclass
+import operator
+from dataclasses import dataclass, field
 from typing import List, Dict, Hashable, Optional, Tuple, Generator
-from functools import reduce
 
-from dask.core import get_deps
-import dask.optimization
+from dask.base import tokenize
+from dask.core import get_deps, reverse_dict
 
 from metagraph.core.plugin import ConcreteAlgorithm, Compiler, CompileError
 from metagraph.core.dask.tasks import DelayedAlgo, DelayedJITAlgo
@@ -14,33 +15,60 @@ from metagraph.core.dask.tasks import DelayedAlgo, DelayedJITAlgo
 class DaskSubgraph:
     """A subgraph of a larger Dask task graph.
 
-    Currently subgraph must have 0 or more inputs and only 1 output
+    Subgraph may have 0 or more inputs and 1 or more outputs.  Outputs are the
+    tasks whose values are needed outside of the subgraph.  When there is a
+    single output, it is available as output_key; otherwise output_key is None.
     """
 
     tasks: dict
     input_keys: List[Hashable]
-    output_key: Hashable
+    output_key: Optional[Hashable] = None
+    output_keys: List[Hashable] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.output_keys and self.output_key is not None:
+            self.output_keys = [self.output_key]
+        elif self.output_key is None and len(self.output_keys) == 1:
+            self.output_key = self.output_keys[0]
+
+    @property
+    def is_multi_output(self):
+        return len(self.output_keys) > 1
 
 
 def extract_compilable_subgraphs(
-    dsk: Dict, compiler: str, output_keys: List[str], include_singletons=True
+    dsk: Dict,
+    compiler: str,
+    output_keys: List[str],
+    include_singletons=True,
+    *,
+    dependencies: Optional[Dict[Hashable, set]] = None,
+    dependents: Optional[Dict[Hashable, set]] = None,
 ) -> List[DaskSubgraph]:
     """Find compilable subgraphs in this Dask task graph.
 
-    Currently only works with one compiler at a time, and only will return
-    linear chains of compilable tasks.  If include_singletons is True,
-    returned chains may be of length 1.  If False, the chain length must be
-    >1.
+    Currently only works with one compiler at a time.  Returns maximal convex
+    subgraphs of compilable tasks, meaning no path between two tasks of a
+    subgraph leaves the subgraph, so each subgraph can be replaced by a single
+    fused task without introducing a cycle.  Subgraphs may have multiple inputs
+    (e.g. fan-in) and multiple outputs (e.g. branches used elsewhere).  If
+    include_singletons is True, returned subgraphs may have 1 task.  If False,
+    subgraphs must have >1 task.
+
+    Tasks corresponding to output_keys are always outputs of their subgraph.
 
-    If present in a subgraph, tasks corresponding to output_keys can only be
-    at the end of a chain.
+    If already known (e.g. from culling), dependencies and dependents of the graph
+    can be passed in to avoid recomputing them.
     """
 
     if include_singletons:
-        chain_threshold = 1
+        size_threshold = 1
     else:
-        chain_threshold = 2
-    dependencies, dependents = get_deps(dsk)
+        size_threshold = 2
+    if dependencies is None:
+        dependencies, dependents = get_deps(dsk)
+    elif dependents is None:
+        dependents = reverse_dict(dependencies)
 
     compilable_keys, non_compilable_keys = _get_compilable_dask_keys(dsk, compiler)
 
@@ -49,54 +77,100 @@ def extract_compilable_subgraphs(
 
     output_keys_set = set(output_keys)
 
+    # Groups of tasks are tracked with union-find; the root of each group is one of its keys
+    parent = {}
+    members = {}  # root -> list of keys in topological order
+    external_deps = {}  # root -> dependencies of members which are outside the group
+    # key -> group ids reachable upstream of (and including) the task
+    reach = {}
+
+    def find(group):
+        while parent[group] != group:
+            parent[group] = parent[parent[group]]
+            group = parent[group]
+        return group
+
+    def reachable_groups(key):
+        return {find(group) for group in reach[key]}
+
+    for key in _topo_sorted_dask_keys(dsk, dependencies):
+        deps = dependencies[key]
+        upstream = set()
+        for dep in deps:
+            upstream |= reachable_groups(dep)
+        if key not in compilable_keys:
+            reach[key] = upstream
+            continue
+
+        # Candidate groups to merge with are those of the compilable dependencies.
+        # A candidate is blocked if a path from it reaches this task (or another
+        # candidate) through a task outside of the merged group.
+        candidates = {find(dep) for dep in deps if dep in parent}
+        while candidates:
+            merged_keys = set().union(*(members[group] for group in candidates))
+            external = set(deps).union(*(external_deps[g] for g in candidates))
+            external -= merged_keys
+            blocked = set()
+            for ext_key in external:
+                blocked |= reachable_groups(ext_key) & candidates
+            if not blocked:
+                break
+            candidates -= blocked
+
+        parent[key] = key
+        if candidates:
+            merged_keys = []
+            merged_external = set(deps)
+            for group in candidates:
+                parent[group] = key
+                merged_keys.extend(members.pop(group))
+                merged_external |= external_deps.pop(group)
+            members[key] = merged_keys + [key]
+            external_deps[key] = merged_external - set(members[key])
+        else:
+            members[key] = [key]
+            external_deps[key] = set(deps)
+        reach[key] = upstream | {key}
+
     subgraphs = []
-    ordered_keys = _dfs_sorted_dask_keys(compilable_keys, dependencies, dependents)
-    key = next(ordered_keys)
-    current_chain = [key]
-
-    def _note_subgraph(chain):
-        output_key = chain[-1]
-        chain = set(chain)
-        inputs = reduce(
-            set.union, (dependencies[chain_key] - chain for chain_key in chain)
-        )
-        tasks = {chain_key: dsk[chain_key] for chain_key in chain}
+    topo_index = {key: i for i, key in enumerate(reach)}
+    for group_keys in members.values():
+        if len(group_keys) < size_threshold:
+            continue
+        group_keys.sort(key=topo_index.__getitem__)
+        group_key_set = set(group_keys)
+        input_keys = set().union(*(dependencies[k] for k in group_keys))
+        input_keys -= group_key_set
+        outputs = [
+            k
+            for k in group_keys
+            if k in output_keys_set or (dependents[k] - group_key_set)
+        ]
+        if not outputs:
+            # Nothing outside uses the results; keep the last task addressable
+            outputs = [group_keys[-1]]
         subgraphs.append(
-            DaskSubgraph(tasks=tasks, input_keys=list(inputs), output_key=output_key)
+            DaskSubgraph(
+                tasks={k: dsk[k] for k in group_keys},
+                input_keys=sorted(input_keys, key=topo_index.__getitem__),
+                output_keys=outputs,
+            )
         )
 
-    for next_key in ordered_keys:
-        next_key_dependencies = dependencies[next_key]
-        key_dependents = dependents[key]
-
-        if (
-            len(next_key_dependencies) == 1
-            and len(key_dependents) == 1
-            and next_key in key_dependents
-            and key in next_key_dependencies
-            and key not in output_keys_set  # output keys must be at the end of a chain
-        ):
-            current_chain.append(next_key)
-        elif len(current_chain) >= chain_threshold:
-            _note_subgraph(current_chain)
-            current_chain = [next_key]
-        else:
-            current_chain = [next_key]
-        key = next_key
-
-    if len(current_chain) >= chain_threshold:
-        _note_subgraph(current_chain)
-
     return subgraphs
 
 
 def _get_compilable_dask_keys(dsk: Dict, compiler: str) -> Tuple[set, set]:
 
     compilable_keys = set()
-    for key in dsk.keys():
-        task_callable = dsk[key][0]
+    for key, task in dsk.items():
+        task_callable = task[0] if isinstance(task, tuple) and task else None
         if isinstance(task_callable, DelayedAlgo):
-            if task_callable.algo._compiler == compiler:
+            # tasks which must check the properties of their arguments are not fused
+            if (
+                task_callable.algo._compiler == compiler
+                and not task_callable.property_checks
+            ):
                 compilable_keys.add(key)
 
     non_compilable_keys = set(dsk.keys()) - compilable_keys
@@ -104,34 +178,42 @@ def _get_compilable_dask_keys(dsk: Dict, compiler: str) -> Tuple[set, set]:
     return compilable_keys, non_compilable_keys
 
 
-def _dfs_sorted_dask_keys(
-    compilable_keys: set,
-    dependencies: Dict[Hashable, set],
-    dependents: Dict[Hashable, set],
+def _topo_sorted_dask_keys(
+    dsk: Dict, dependencies: Dict[Hashable, set]
 ) -> Generator[Hashable, None, None]:
+    """Yields keys such that every key comes after all of its dependencies.
 
-    visited = set()
-
-    def _dfs(key):
-        if key not in visited:
-            visited.add(key)
-            child_keys = dependents[key]
-            yield key
-            for child_key in child_keys:
-                yield from _dfs(child_key)
-
-    input_keys = filter(lambda key: len(dependencies[key]) == 0, compilable_keys)
-    for input_key in input_keys:
-        yield from _dfs(input_key)
-
-    return
-
-
-def compile_subgraphs(dsk, output_keys, compiler: Compiler):
+    Ties are broken using the order of keys in dsk to keep results repeatable.
+    """
+    order = {key: i for i, key in enumerate(dsk)}
+    num_deps = {key: len(dependencies[key]) for key in dsk}
+    dependents = {key: [] for key in dsk}
+    for key in dsk:
+        for dep in dependencies[key]:
+            dependents[dep].append(key)
+    ready = [order[key] for key in dsk if num_deps[key] == 0]
+    heapq.heapify(ready)
+    keys = list(dsk)
+    while ready:
+        key = keys[heapq.heappop(ready)]
+        yield key
+        for child in dependents[key]:
+            num_deps[child] -= 1
+            if num_deps[child] == 0:
+                heapq.heappush(ready, order[child])
+
+
+def compile_subgraphs(
+    dsk, output_keys, compiler: Compiler, *, dependencies=None, dependents=None
+):
     """Return a modified dask graph with compilable subgraphs fused together."""
 
     subgraphs = extract_compilable_subgraphs(
-        dsk, output_keys=output_keys, compiler=compiler.name
+        dsk,
+        output_keys=output_keys,
+        compiler=compiler.name,
+        dependencies=dependencies,
+        dependents=dependents,
     )
     if len(subgraphs) == 0:
         return dsk  # no change, nothing to compile
@@ -139,68 +221,74 @@ def compile_subgraphs(dsk, output_keys, compiler: Compiler):
     # make a new graph we can mutate
     new_dsk = dsk.copy()
     for subgraph in subgraphs:
+        output = (
+            subgraph.output_keys if subgraph.is_multi_output else subgraph.output_key
+        )
         try:
             fused_func = compiler.compile_subgraph(
-                subgraph.tasks, subgraph.input_keys, subgraph.output_key
+                subgraph.tasks, subgraph.input_keys, output
             )
-
-            # remember the algorithms being fused and return type
-            # this assumes all tasks in the subgraph are DelayedAlgo tasks!
-            source_algos = [task[0].algo for task in subgraph.tasks.values()]
-            output_task = subgraph.tasks[subgraph.output_key]
-            result_type = output_task[0].result_type
-            resolver = output_task[0].resolver
-
-            # remove keys for existing tasks in subgraph, including the output task
-            for key in subgraph.tasks:
-                del new_dsk[key]
-
-            # create a fused task with the output task's old key
-            fused_task = DelayedJITAlgo(
-                fused_func,
-                compiler=compiler.name,
-                source_algos=source_algos,
-                result_type=result_type,
-                resolver=resolver,
-            )
-            new_dsk[subgraph.output_key] = (fused_task, *subgraph.input_keys)
         except CompileError as e:
             logging.debug(
-                "Unable to compile subgraph with output key: %s",
-                subgraph.output_key,
+                "Unable to compile subgraph with output keys: %s",
+                subgraph.output_keys,
                 exc_info=e,
             )
             # continue with graph unchanged to next subgraph
+            continue
+
+        # remember the algorithms being fused and return type
+        # this assumes all tasks in the subgraph are DelayedAlgo tasks!
+        source_algos = [task[0].algo for task in subgraph.tasks.values()]
+        output_tasks = [subgraph.tasks[key] for key in subgraph.output_keys]
+        result_types = tuple(task[0].result_type for task in output_tasks)
+        resolver = output_tasks[0][0].resolver
+
+        # remove keys for existing tasks in subgraph, including the output tasks
+        for key in subgraph.tasks:
+            del new_dsk[key]
+
+        fused_task = DelayedJITAlgo(
+            fused_func,
+            compiler=compiler.name,
+            source_algos=source_algos,
+            result_type=result_types if subgraph.is_multi_output else result_types[0],
+            resolver=resolver,
+        )
+        if subgraph.is_multi_output:
+            # the fused task returns a tuple; each output keeps its old key
+            # so downstream tasks and requested outputs are unaffected
+            fused_key = f"{compiler.name}-fused-{tokenize(*subgraph.output_keys)}"
+            new_dsk[fused_key] = (fused_task, *subgraph.input_keys)
+            for i, key in enumerate(subgraph.output_keys):
+                new_dsk[key] = (operator.getitem, fused_key, i)
+        else:
+            # create a fused task with the output task's old key
+            new_dsk[subgraph.output_key] = (fused_task, *subgraph.input_keys)
 
     return new_dsk
 
 
+def find_compilers(dsk) -> Dict[str, Compiler]:
+    """Return all the compilers referenced by compilable tasks in this DAG"""
+    compilers = {}
+    for task in dsk.values():
+        task_callable = task[0] if isinstance(task, tuple) and task else None
+        if isinstance(task_callable, DelayedAlgo):
+            compiler_name = task_callable.algo._compiler
+            if compiler_name is not None and compiler_name not in compilers:
+                compilers[compiler_name] = task_callable.resolver.compilers[
+                    compiler_name
+                ]
+    return compilers
+
+
 def optimize(dsk, output_keys, **kwargs):
-    """Top level optimizer function for Metagraph DAGs"""
-    # FUTURE: swap nodes in graph with compilable implementations if they exist?
-    optimized_dsk = dsk
+    """Top level optimizer function for Metagraph DAGs
 
-    # cull unused nodes
-    optimized_dsk, dependencies = dask.optimization.cull(optimized_dsk, output_keys)
-    # FUTURE: could speed up extract_compilable_subgraphs by using this dependencies
-    # dict to compute dependents as well and passing both dicts into the function
-    # so redunant work isn't performed.
+    Runs the passes of the default optimizer pipeline (see metagraph.core.optimizer).
+    """
+    # Import here to avoid circular references
+    from .optimizer import default_optimizer
 
-    # discover all the compilers referenced in this DAG
-    compilers = {}
-    for key in optimized_dsk.keys():
-        task_callable = optimized_dsk[key][0]
-        if isinstance(task_callable, DelayedAlgo):
-            if task_callable.algo._compiler is not None:
-                compiler_name = task_callable.algo._compiler
-                if compiler_name not in compilers:
-                    compilers[compiler_name] = task_callable.resolver.compilers[
-                        compiler_name
-                    ]
-
-    # allow each compiler to optimize the graph
-    for compiler in compilers.values():
-        optimized_dsk = compile_subgraphs(
-            optimized_dsk, output_keys=output_keys, compiler=compiler
-        )
-    return optimized_dsk
+    return default_optimizer.run(dsk, output_keys)
@@ -0,0 +1,154 @@
+"""
+Opt-in cache of translation and algorithm results shared by dask compute calls.
+
+When `core.dask.cache.enabled` is set, results of DelayedTranslate and DelayedAlgo
+tasks are kept by key after they are computed. Later computations of graphs which
+contain the same keys (for example, several results derived from one lazily translated
+graph) use the cached values and skip the tasks which produced them.
+
+The cache holds at most `core.dask.cache.memory_limit` bytes. When full, the entries
+which are cheapest to recompute per byte (measured compute time, weighted by how often
+they were reused, divided by their estimated size) are evicted first.
+
+Cached values are shared, so they must not be mutated by the caller.
+"""
+
+import sys
+import time
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+from dask.utils import parse_bytes
+
+from metagraph import config
+from .tasks import MetagraphTask
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+@dataclass
+class _Entry:
+    value: Any
+    nbytes: int
+    seconds: float
+    hits: int = 0
+
+    @property
+    def score(self) -> float:
+        # higher scores are more valuable to keep
+        return self.seconds * (1 + self.hits) / max(self.nbytes, 1)
+
+
+def _nbytes(value, resolver) -> int:
+    if resolver is not None:
+        try:
+            nbytes = resolver.typeclass_of(value).estimate_size(value).nbytes
+        except TypeError:
+            nbytes = None
+        if nbytes is not None:
+            return nbytes
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    def __init__(self, memory_limit=None):
+        self._memory_limit = memory_limit
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._lock = threading.Lock()
+        self.total_nbytes = 0
+        self.stats = CacheStats()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(config.get("core.dask.cache.enabled", False))
+
+    @property
+    def memory_limit(self) -> int:
+        limit = self._memory_limit
+        if limit is None:
+            limit = config.get("core.dask.cache.memory_limit", "1GB")
+        if isinstance(limit, str):
+            limit = parse_bytes(limit)
+        return limit
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_nbytes = 0
+            self.stats = CacheStats()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return default
+            entry.hits += 1
+            self.stats.hits += 1
+            return entry.value
+
+    def put(self, key, value, seconds: float, nbytes: int):
+        """Store value, evicting the least valuable entries to stay within memory_limit"""
+        if seconds < config.get("core.dask.cache.min_seconds", 0.0):
+            return
+        limit = self.memory_limit
+        if nbytes > limit:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_nbytes -= old.nbytes
+            self._entries[key] = _Entry(value, nbytes, seconds)
+            self.total_nbytes += nbytes
+            while self.total_nbytes > limit:
+                evict_key = min(self._entries, key=lambda k: self._entries[k].score)
+                self.total_nbytes -= self._entries.pop(evict_key).nbytes
+                self.stats.evictions += 1
+
+
+class CachedTask(MetagraphTask):
+    """Runs a MetagraphTask and stores its result in a ResultCache"""
+
+    def __init__(self, task: MetagraphTask, key, cache: ResultCache):
+        self.task = task
+        self.key = key
+        self.cache = cache
+        resolver = getattr(task, "resolver", None)
+
+        def call(*args, **kwargs):
+            start = time.perf_counter()
+            result = task(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            cache.put(key, result, elapsed, _nbytes(result, resolver))
+            return result
+
+        super().__init__(
+            callable=call,
+            result_type=task.result_type,
+            gil_bound=task.gil_bound,
+            memory=task.memory,
+        )
+
+    @property
+    def func_label(self):
+        return self.task.func_label
+
+    @property
+    def data_label(self):
+        return self.task.data_label
+
+
+# Cache used when computing Placeholders
+result_cache = ResultCache()
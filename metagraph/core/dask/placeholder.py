@@ -8,6 +8,8 @@ from metagraph.core.plugin import ConcreteAlgorithm, Translator, ConcreteType
 from metagraph.core.compiler import optimize
 from .visualize import visualize
 from .tasks import DelayedAlgo, DelayedTranslate
+from .scheduler import default_get
+from typing import Optional
 
 
 def single_key(seq):
@@ -31,8 +33,41 @@ def taskify(arg, dsk):
         return _taskify(arg, dsk)
 
 
-def rebuild(dsk, cls, key):
-    return cls(key, dsk)
+def _estimate_input_nbytes(resolver, args, kwargs) -> Optional[int]:
+    """
+    Returns the estimated total size of the Metagraph objects in args and kwargs,
+    or None if any size is unknown
+    """
+    if resolver is None:
+        return None
+    total = 0
+    values = list(args) + list((kwargs or {}).values())
+    for value in values:
+        if isinstance(value, Placeholder):
+            nbytes = value.estimated_nbytes
+        elif is_dask_collection(value):
+            return None
+        else:
+            try:
+                typeclass = resolver.typeclass_of(value)
+            except TypeError:
+                # not a Metagraph object (e.g. a function or scalar)
+                continue
+            nbytes = typeclass.estimate_size(value).nbytes
+        if nbytes is None:
+            return None
+        total += nbytes
+    return total
+
+
+def rebuild(dsk, cls, key, abstract_props=None, concrete_props=None, nbytes=None):
+    return cls(
+        key,
+        dsk,
+        abstract_props=abstract_props,
+        concrete_props=concrete_props,
+        nbytes=nbytes,
+    )
 
 
 def ph_apply(func, args, kwargs):
@@ -56,16 +91,26 @@ def finalize(collection):
 class Placeholder(DaskMethodsMixin):
     """
     Acts as a stand-in for the actual `value_type` of a ConcreteType in a delayed context
+
+    The abstract and concrete properties which are known before computing (for example,
+    from the return annotation of the algorithm producing it) are available as
+    `known_abstract_props` and `known_concrete_props`. `estimated_nbytes` is the
+    estimated size of the computed value, or None if unknown.
     """
 
     concrete_type = None  # subclasses should override this
-    __dask_scheduler__ = staticmethod(dask.threaded.get)
+    __dask_scheduler__ = staticmethod(default_get)
 
-    def __init__(self, key, dsk=None):
+    def __init__(
+        self, key, dsk=None, *, abstract_props=None, concrete_props=None, nbytes=None
+    ):
         self._key = key
         if dsk is None:  # pragma: no cover
             dsk = {}
         self._dsk = dsk
+        self.known_abstract_props = dict(abstract_props or {})
+        self.known_concrete_props = dict(concrete_props or {})
+        self.estimated_nbytes = nbytes
 
     @property
     def key(self):
@@ -84,7 +129,16 @@ class Placeholder(DaskMethodsMixin):
         return single_key, ()
 
     def __dask_postpersist__(self):
-        return rebuild, (self.__class__, self._key)
+        return (
+            rebuild,
+            (
+                self.__class__,
+                self._key,
+                self.known_abstract_props,
+                self.known_concrete_props,
+                self.estimated_nbytes,
+            ),
+        )
 
     @staticmethod
     def __dask_optimize__(dsk, keys, **kwargs):
@@ -109,7 +163,13 @@ class Placeholder(DaskMethodsMixin):
         source_type=None,
         result_type=None,
         resolver=None,
+        *,
+        abstract_props=None,
+        concrete_props=None,
+        property_checks=None,
     ):
+        input_nbytes = _estimate_input_nbytes(resolver, args, kwargs)
+        nbytes = None
         dsk = {}
         new_args = []
         for arg in args:
@@ -124,21 +184,37 @@ class Placeholder(DaskMethodsMixin):
             new_kwargs_flat.append([kw, val])
         # Add this func to the task graph
         if isinstance(func, ConcreteAlgorithm):
-            task_func = DelayedAlgo(func, result_type=result_type, resolver=resolver)
+            task_func = DelayedAlgo(
+                func,
+                result_type=result_type,
+                resolver=resolver,
+                property_checks=property_checks,
+                # the inputs are held while the algorithm allocates its result
+                memory=input_nbytes,
+            )
             dsk[key] = (task_func, new_args, (dict, new_kwargs_flat))
         elif isinstance(func, Translator):
+            if input_nbytes is not None:
+                nbytes = int(input_nbytes * func.memory_expansion)
             task_func = DelayedTranslate(
                 func,
                 source_type=source_type,
                 result_type=result_type,
                 resolver=resolver,
+                memory=nbytes,
             )
             dsk[key] = (task_func, new_args, (dict, new_kwargs_flat))
         else:
             task_func = ph_apply
             dsk[key] = (task_func, func, new_args, (dict, new_kwargs_flat))
 
-        return cls(key, dsk)
+        return cls(
+            key,
+            dsk,
+            abstract_props=abstract_props,
+            concrete_props=concrete_props,
+            nbytes=nbytes,
+        )
 
 
 class DelayedWrapper:
@@ -157,7 +233,10 @@ class DelayedWrapper:
             f"init-{tokenize(self._ph, self._klass, args, kwargs)}",
             self._klass.__name__,
         )
-        return self._ph.build(key, self._klass, args, kwargs)
+        # Abstract properties preset by the caller are known before construction
+        return self._ph.build(
+            key, self._klass, args, kwargs, abstract_props=kwargs.get("aprops")
+        )
 
     def __repr__(self):
         return f"DelayedWrapper<{self._ph.concrete_type.__name__}>"
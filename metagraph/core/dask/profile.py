@@ -0,0 +1,151 @@
+"""
+Measure the tasks of a Metagraph dask computation.
+
+    >>> with TaskProfiler() as prof:
+    ...     result = placeholder.compute()
+    >>> print(prof.critical_path_table())
+    >>> prof.visualize("profile.svg")
+
+The profiler is a dask callback, so it works with dask's own schedulers (the default
+threaded scheduler, `dask.get`, and the multiprocessing scheduler). It records the
+graph which was actually executed, after optimization, so fused and cached tasks are
+shown as they ran.
+"""
+
+import sys
+import time
+import threading
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
+
+from dask.callbacks import Callback
+from dask.core import get_dependencies
+from dask.utils import format_bytes
+
+from .tasks import MetagraphTask
+from .visualize import visualize
+
+
+@dataclass
+class TaskRecord:
+    key: Hashable
+    start: float
+    end: float
+    worker: str  # id of the thread or process reported by the scheduler
+    nbytes: Optional[int] = None
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def _nbytes(task_callable, value) -> Optional[int]:
+    resolver = getattr(task_callable, "resolver", None)
+    if resolver is not None:
+        try:
+            return resolver.typeclass_of(value).estimate_size(value).nbytes
+        except TypeError:
+            pass
+    return sys.getsizeof(value)
+
+
+def _task_callable(task):
+    if isinstance(task, tuple) and task:
+        return task[0]
+    return None
+
+
+class TaskProfiler(Callback):
+    def __init__(self):
+        super().__init__()
+        self.dsk = {}
+        self.records: Dict[Hashable, TaskRecord] = {}
+        self._starts = {}
+        self._lock = threading.Lock()
+
+    def _start(self, dsk):
+        self.dsk.update(dsk)
+
+    def _pretask(self, key, dsk, state):
+        with self._lock:
+            self._starts[key] = time.perf_counter()
+
+    def _posttask(self, key, result, dsk, state, worker_id):
+        end = time.perf_counter()
+        with self._lock:
+            start = self._starts.pop(key)
+        task_callable = _task_callable(dsk.get(key))
+        if not isinstance(task_callable, MetagraphTask):
+            return
+        with self._lock:
+            self.records[key] = TaskRecord(
+                key, start, end, str(worker_id), _nbytes(task_callable, result)
+            )
+
+    def clear(self):
+        self.dsk = {}
+        self.records = {}
+
+    def critical_path(self) -> List[TaskRecord]:
+        """
+        Returns the records of the chain of dependent Metagraph tasks with the largest
+        total duration, in execution order
+        """
+        finish = {}
+        previous = {}
+
+        def finish_time(key):
+            # iterative depth-first search to avoid recursion limits on long chains
+            stack = [key]
+            while stack:
+                k = stack[-1]
+                if k in finish:
+                    stack.pop()
+                    continue
+                deps = [d for d in get_dependencies(self.dsk, k) if d not in finish]
+                if deps:
+                    stack.extend(deps)
+                    continue
+                stack.pop()
+                best = None
+                for dep in get_dependencies(self.dsk, k):
+                    if best is None or finish[dep] > finish[best]:
+                        best = dep
+                record = self.records.get(k)
+                duration = record.duration if record is not None else 0.0
+                finish[k] = duration + (finish[best] if best is not None else 0.0)
+                previous[k] = best
+            return finish[key]
+
+        if not self.dsk:
+            return []
+        end_key = max(self.dsk, key=finish_time)
+        path = []
+        key = end_key
+        while key is not None:
+            if key in self.records:
+                path.append(self.records[key])
+            key = previous[key]
+        return path[::-1]
+
+    def critical_path_table(self) -> str:
+        """Summary of the critical path, one row per task"""
+        path = self.critical_path()
+        total = sum(r.duration for r in path)
+        lines = [f"{'task':<48}{'seconds':>10}{'% path':>8}{'output':>12}  worker"]
+        for record in path:
+            label = " ".join(self.dsk[record.key][0].func_label.split())
+            share = 100 * record.duration / total if total else 0.0
+            nbytes = "" if record.nbytes is None else format_bytes(record.nbytes)
+            lines.append(
+                f"{label[:47]:<48}{record.duration:>10.4f}{share:>7.1f}%"
+                f"{nbytes:>12}  {record.worker}"
+            )
+        lines.append(f"{'total':<48}{total:>10.4f}")
+        return "\n".join(lines)
+
+    def visualize(self, filename="mydask", format=None, **kwargs):
+        """Draw the executed graph, annotating each task with its measurements"""
+        return visualize(
+            self.dsk, filename=filename, format=format, profile=self, **kwargs
+        )
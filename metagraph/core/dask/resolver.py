@@ -3,9 +3,29 @@ from dask.base import tokenize
 from dask import delayed, is_dask_collection
 from ..resolver import Resolver, Namespace, PlanNamespace, Dispatcher, ExactDispatcher
 from .placeholder import Placeholder, DelayedWrapper
-from ..plugin import ConcreteType, MetaWrapper, ConcreteAlgorithm
-from ..planning import AlgorithmPlan
-from typing import Optional
+from .tasks import CheckedCall
+from ..plugin import AbstractType, ConcreteType, MetaWrapper, ConcreteAlgorithm
+from ..planning import AlgorithmPlan, raise_memory_limit_error
+from typing import Optional, Dict, Any, Tuple
+
+
+def _exact_props(prop_val: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the properties with a single specified value"""
+    # Properties allowing several values are stored as a tuple, so are not known exactly
+    return {k: v for k, v in prop_val.items() if v is not None and type(v) is not tuple}
+
+
+def _declared_props(ret, abst_ret) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Returns the abstract and concrete properties declared by the return annotations of
+    a concrete algorithm (ret) and its abstract algorithm (abst_ret).
+    """
+    abstract_props = {}
+    if isinstance(abst_ret, AbstractType):
+        abstract_props.update(_exact_props(abst_ret.prop_val))
+    if ret.abstract_instance is not None:
+        abstract_props.update(_exact_props(ret.abstract_instance.prop_val))
+    return abstract_props, _exact_props(ret.props)
 
 
 class DaskResolver:
@@ -152,18 +172,39 @@ class DaskResolver:
     def _add_translation_plan(self, mst, src, **props):
         """
         Given a translation plan, decompose its pieces and add each step to the task graph.
+        Each step is its own task, so the scheduler releases an intermediate result as soon
+        as the next step has consumed it.
         """
         obj = src
         src_type = mst.src_type
-        for trans, dst_type in zip(mst.translators, mst.dst_types):
+        # Translations preserve abstract properties
+        if isinstance(src, Placeholder):
+            abstract_props = src.known_abstract_props
+        elif src_type.is_typeclass_of(src) and src in src_type._typecache:
+            # Only use properties which have already been computed
+            abstract_props = src_type.get_typeinfo(src).known_abstract_props
+        else:
+            abstract_props = {}
+        props = {**mst.final_props, **props}
+        last_step = len(mst.translators) - 1
+        for step, (trans, dst_type) in enumerate(zip(mst.translators, mst.dst_types)):
             ph = self._get_placeholder(dst_type)
             key = (
                 f"translate-{tokenize(ph, trans, obj, props)}",
                 f"{src_type.__name__}->{dst_type.__name__}",
             )
             kwargs = {}
+            concrete_props = {}
             if dst_type is mst.final_type:
+                kwargs.update(mst.final_props)
+            if step == last_step:
                 kwargs.update(props)
+                # Translators enforce requested properties on the destination
+                concrete_props = {
+                    k: v for k, v in props.items() if k in dst_type.allowed_props
+                }
+            if dst_type.abstract is not src_type.abstract:
+                abstract_props = {}
             obj = ph.build(
                 key,
                 trans,
@@ -172,10 +213,55 @@ class DaskResolver:
                 resolver=self._resolver,
                 source_type=src_type,
                 result_type=dst_type,
+                abstract_props=abstract_props,
+                concrete_props=concrete_props,
             )
             src_type = dst_type
         return obj
 
+    def _find_property_checks(self, algo_plan, bound):
+        """
+        Returns {arg_name: (abstract_props, concrete_props)} for properties required of
+        Placeholder arguments which are not known ahead of time. These are verified when
+        the algorithm is called.
+
+        Translated arguments are checked for the abstract properties which their
+        source did not know; the translation produces the required concrete properties.
+        """
+        algo = algo_plan.algo
+        abst_sig = self._resolver.abstract_algorithms[algo.abstract_name].__signature__
+        property_checks = {}
+        for name, arg_value in bound.arguments.items():
+            if not isinstance(arg_value, Placeholder):
+                continue
+            param_type = algo.__signature__.parameters[name].annotation
+            if not isinstance(param_type, ConcreteType):
+                continue
+            required_abstract = {}
+            abst_param = abst_sig.parameters.get(name)
+            if (
+                abst_param is not None
+                and type(abst_param.annotation) is type(param_type).abstract
+            ):
+                required_abstract.update(abst_param.annotation.prop_val)
+            if param_type.abstract_instance is not None:
+                required_abstract.update(param_type.abstract_instance.prop_val)
+            unknown_abstract = {
+                k: v
+                for k, v in required_abstract.items()
+                if v is not None and k not in arg_value.known_abstract_props
+            }
+            unknown_concrete = {}
+            if name not in algo_plan.required_translations:
+                unknown_concrete = {
+                    k: v
+                    for k, v in param_type.props.items()
+                    if k not in arg_value.known_concrete_props
+                }
+            if unknown_abstract or unknown_concrete:
+                property_checks[name] = (unknown_abstract, unknown_concrete)
+        return property_checks
+
     def _add_algorithm_plan(self, algo_plan, *args, **kwargs):
         """
         Given an algorithm plan, decompose it into individual translations and the actual
@@ -189,10 +275,14 @@ class DaskResolver:
             bound.arguments[name] = self._add_translation_plan(
                 trans, bound.arguments[name]
             )
+        property_checks = self._find_property_checks(algo_plan, bound)
         args, kwargs = bound.args, bound.kwargs
 
         # Determine return type and add task
         ret = sig.return_annotation
+        abst_ret = self._resolver.abstract_algorithms[
+            algo_plan.algo.abstract_name
+        ].__signature__.return_annotation
         if getattr(ret, "__origin__", None) == tuple:
             # Use dask.delayed to compute the tuple
             tpl_call = delayed(algo_plan.algo, nout=len(ret.__args__))
@@ -200,6 +290,14 @@ class DaskResolver:
                 f"call-{tokenize(tpl_call, algo_plan, args, kwargs)}",
                 f"{algo_plan.algo.abstract_name}",
             )
+            if property_checks:
+                tpl_call = delayed(
+                    CheckedCall(algo_plan.algo, property_checks, self._resolver),
+                    nout=len(ret.__args__),
+                )
+            if algo_plan.algo._compiler is not None:
+                # compiled algorithms need the resolver to find their compiler
+                kwargs = dict(kwargs, resolver=self._resolver)
             tpl = tpl_call(*args, **kwargs, dask_key_name=key)
             # Add extraction tasks for each component
             ret_vals = []
@@ -209,7 +307,16 @@ class DaskResolver:
                     ct = type(ret_item)
                     ph = self._get_placeholder(ct)
                     key = f"[{i}]-{tokenize(ph, tpl, i)}"
-                    ret_val = ph.build(key, extract_func, (tpl,))
+                    abstract_props, concrete_props = _declared_props(
+                        ret_item, abst_ret.__args__[i]
+                    )
+                    ret_val = ph.build(
+                        key,
+                        extract_func,
+                        (tpl,),
+                        abstract_props=abstract_props,
+                        concrete_props=concrete_props,
+                    )
                 else:
                     key = f"[{i}]-{tokenize(tpl, i)}"
                     ret_val = delayed(extract_func)(tpl, dask_key_name=key)
@@ -222,6 +329,7 @@ class DaskResolver:
                 f"call-{tokenize(ph, algo_plan, args, kwargs)}",
                 f"{algo_plan.algo.abstract_name}",
             )
+            abstract_props, concrete_props = _declared_props(ret, abst_ret)
             return ph.build(
                 key,
                 algo_plan.algo,
@@ -229,6 +337,9 @@ class DaskResolver:
                 kwargs,
                 result_type=ret,
                 resolver=self._resolver,
+                abstract_props=abstract_props,
+                concrete_props=concrete_props,
+                property_checks=property_checks,
             )
         else:
             # Use dask.delayed instead of a Placeholder
@@ -237,6 +348,13 @@ class DaskResolver:
                 f"call-{tokenize(delayed_call, algo_plan, args, kwargs)}",
                 f"{algo_plan.algo.abstract_name}",
             )
+            if property_checks:
+                delayed_call = delayed(
+                    CheckedCall(algo_plan.algo, property_checks, self._resolver)
+                )
+            if algo_plan.algo._compiler is not None:
+                # compiled algorithms need the resolver to find their compiler
+                kwargs = dict(kwargs, resolver=self._resolver)
             return delayed_call(*args, **kwargs, dask_key_name=key)
 
     def register(self, *args, **kwargs):
@@ -261,6 +379,7 @@ class DaskResolver:
         return trans_plan(value, **props)
 
     def run(self, algo_name: str, *args, **kwargs):
+        args, kwargs = self._check_algorithm_signature(algo_name, *args, **kwargs)
         valid_algos = self.find_algorithm_solutions(algo_name, *args, **kwargs)
         if not valid_algos:
             raise TypeError(
@@ -269,12 +388,17 @@ class DaskResolver:
         else:
             # choose the solutions requiring the fewest translations
             plan = valid_algos[0]
+            if plan.exceeds_memory_limit:
+                raise_memory_limit_error(algo_name, valid_algos, plan.memory_limit)
             # Calling the plan will trigger a call to `_add_algorithm_plan`.
             #   The AlgorithmPlan knows about and checks for a DaskResolver
             #   when the plan is called.
             return plan(*args, **kwargs)
 
     def call_exact_algorithm(self, concrete_algo: ConcreteAlgorithm, *args, **kwargs):
+        args, kwargs = self._check_algorithm_signature(
+            concrete_algo.abstract_name, *args, allow_extras=True, **kwargs
+        )
         plan = AlgorithmPlan.build(self, concrete_algo, *args, **kwargs)
         if plan.unsatisfiable:
             err_msgs = "\n".join(plan.err_msgs)
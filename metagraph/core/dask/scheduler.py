@@ -0,0 +1,179 @@
+"""
+A local dask scheduler which honors the annotations of Metagraph tasks.
+
+GIL-bound tasks whose annotations prefer the "processes" executor run in a process
+pool while all other tasks run in a thread pool. Before a task starts, its estimated
+memory is reserved against `memory_limit`; tasks wait until enough of the budget is
+released by running tasks. A task whose estimate exceeds the whole budget only runs
+when nothing else is running.
+
+Select it for Placeholders with the `core.dask.scheduler` config ("metagraph"), or
+explicitly with `placeholder.compute(scheduler=metagraph.core.dask.scheduler.get)`.
+"""
+
+import os
+import threading
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+    wait,
+    FIRST_COMPLETED,
+)
+from typing import Dict, Hashable, Optional
+
+import cloudpickle
+import dask.threaded
+from dask.callbacks import local_callbacks, unpack_callbacks
+from dask.core import _execute_task, get_dependencies, flatten, reverse_dict
+from dask.system import CPU_COUNT
+from dask.multiprocessing import get_context
+from dask.order import order
+from dask.utils import ensure_dict, parse_bytes
+
+from metagraph import config
+from .tasks import MetagraphTask, TaskAnnotations
+
+
+def _call_pickled(payload):
+    func, args, kwargs = cloudpickle.loads(payload)
+    return func(*args, **kwargs), os.getpid()
+
+
+def _execute_in_thread(task, cache):
+    return _execute_task(task, cache), threading.get_ident()
+
+
+def _annotations(task) -> TaskAnnotations:
+    if isinstance(task, tuple) and task and isinstance(task[0], MetagraphTask):
+        return task[0].annotations
+    return TaskAnnotations()
+
+
+def _pack(keys, results):
+    if isinstance(keys, list):
+        return [_pack(k, results) for k in keys]
+    return results[keys]
+
+
+def get(
+    dsk,
+    keys,
+    *,
+    num_workers: Optional[int] = None,
+    num_processes: Optional[int] = None,
+    memory_limit=None,
+    **kwargs,
+):
+    """
+    Compute keys of dsk, honoring the annotations of Metagraph tasks.
+
+    num_workers: number of threads (default: `core.dask.num_workers` or the CPU count)
+    num_processes: number of processes for GIL-bound tasks
+                   (default: `core.dask.num_processes` or the CPU count)
+    memory_limit: maximum estimated bytes (or a string like "4GB") of the tasks running
+                  at once (default: `core.dask.memory_limit`); None means no limit
+    """
+    dsk = ensure_dict(dsk)
+    if num_workers is None:
+        num_workers = config.get("core.dask.num_workers", None) or CPU_COUNT
+    if num_processes is None:
+        num_processes = config.get("core.dask.num_processes", None) or CPU_COUNT
+    if memory_limit is None:
+        memory_limit = config.get("core.dask.memory_limit", None)
+    if isinstance(memory_limit, str):
+        memory_limit = parse_bytes(memory_limit)
+
+    output_keys = set(flatten(keys)) if isinstance(keys, list) else {keys}
+    dependencies = {k: get_dependencies(dsk, k) for k in dsk}
+    dependents = reverse_dict(dependencies)
+    num_waiting = {k: len(deps) for k, deps in dependencies.items()}
+    priority = order(dsk, dependencies=dependencies)
+    ready = sorted((k for k, n in num_waiting.items() if n == 0), key=priority.get)
+
+    results: Dict[Hashable, object] = {}
+    finished = set()
+    running = {}  # future -> (key, reserved memory)
+    reserved = 0
+    threads = ThreadPoolExecutor(num_workers, thread_name_prefix="metagraph-dask")
+    processes = None
+
+    def admit(memory) -> bool:
+        if memory_limit is None or not running:
+            return True
+        return reserved + (memory or 0) <= memory_limit
+
+    def submit(key):
+        nonlocal processes
+        task = dsk[key]
+        annotations = _annotations(task)
+        if annotations.executor == "processes":
+            task_callable = task[0]
+            args = _execute_task(task[1], results)
+            task_kwargs = _execute_task(task[2], results) if len(task) > 2 else {}
+            payload = cloudpickle.dumps((task_callable.process_func, args, task_kwargs))
+            if processes is None:
+                processes = ProcessPoolExecutor(num_processes, mp_context=get_context())
+            return processes.submit(_call_pickled, payload)
+        cache = {dep: results[dep] for dep in dependencies[key]}
+        return threads.submit(_execute_in_thread, task, cache)
+
+    with local_callbacks(kwargs.get("callbacks")) as callbacks:
+        # dask callbacks (e.g. profilers) are supported without the scheduler state;
+        # like dask's local schedulers, posttask receives the id of the thread or
+        # process which ran the task
+        starts, _, pretasks, posttasks, finishes = unpack_callbacks(callbacks)
+        state = {}
+        for start in starts:
+            start(dsk)
+        errored = True
+        try:
+            while ready or running:
+                # Start ready tasks in priority order while they fit in the memory budget
+                while ready and len(running) < num_workers + num_processes:
+                    key = ready[0]
+                    memory = _annotations(dsk[key]).memory
+                    if not admit(memory):
+                        break
+                    ready.pop(0)
+                    for pretask in pretasks:
+                        pretask(key, dsk, state)
+                    running[submit(key)] = (key, memory or 0)
+                    reserved += memory or 0
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                newly_ready = []
+                for future in done:
+                    key, memory = running.pop(future)
+                    reserved -= memory
+                    results[key], worker_id = future.result()
+                    finished.add(key)
+                    for posttask in posttasks:
+                        posttask(key, results[key], dsk, state, worker_id)
+                    for dependent in dependents[key]:
+                        num_waiting[dependent] -= 1
+                        if num_waiting[dependent] == 0:
+                            newly_ready.append(dependent)
+                    # Release inputs which are no longer needed
+                    for dep in dependencies[key]:
+                        if dep not in output_keys and dependents[dep] <= finished:
+                            results.pop(dep, None)
+                if newly_ready:
+                    ready = sorted(ready + newly_ready, key=priority.get)
+            errored = False
+        finally:
+            for future in running:
+                future.cancel()
+            threads.shutdown(wait=True)
+            if processes is not None:
+                processes.shutdown(wait=True)
+            for finish in finishes:
+                finish(dsk, state, errored)
+
+    return _pack(keys, results)
+
+
+def default_get(dsk, keys, **kwargs):
+    """Scheduler used by Placeholders, chosen by the `core.dask.scheduler` config"""
+    if config.get("core.dask.scheduler", "threads") == "metagraph":
+        return get(dsk, keys, **kwargs)
+    return dask.threaded.get(dsk, keys, **kwargs)
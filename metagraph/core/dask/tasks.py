@@ -1,15 +1,139 @@
+from dataclasses import dataclass
+from metagraph import config
 from metagraph.core.plugin import ConcreteAlgorithm, ConcreteType, Translator
-from typing import Callable, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class TaskAnnotations:
+    """Scheduling hints for a MetagraphTask.
+
+    gil_bound: the task holds the GIL while running (e.g. networkx or pure Python types)
+    memory: estimated bytes allocated by the task, or None if unknown
+    executor: "threads" or "processes"
+    """
+
+    gil_bound: bool = False
+    memory: Optional[int] = None
+    executor: str = "threads"
+
+
+def _signature_types(sig):
+    """Yields the ConcreteTypes of the parameters and return value of sig"""
+    annotations = [p.annotation for p in sig.parameters.values()]
+    ret = sig.return_annotation
+    if getattr(ret, "__origin__", None) == tuple:
+        annotations.extend(ret.__args__)
+    else:
+        annotations.append(ret)
+    for annotation in annotations:
+        if isinstance(annotation, ConcreteType):
+            yield type(annotation)
+        elif isinstance(annotation, type) and issubclass(annotation, ConcreteType):
+            yield annotation
+
+
+def check_properties(
+    resolver: "Resolver",
+    value,
+    abstract_props: Dict[str, Any],
+    concrete_props: Dict[str, Any],
+):
+    """
+    Raises a TypeError if value does not have the required properties.
+    Multiple allowed values of an abstract property are given as a tuple.
+    """
+    typeclass = resolver.typeclass_of(value)
+    unsatisfied = []
+    if abstract_props:
+        actual = typeclass.compute_abstract_properties(value, set(abstract_props))
+        for prop, required in abstract_props.items():
+            allowed = required if type(required) is tuple else (required,)
+            if actual[prop] not in allowed:
+                unsatisfied.append(f" -> `{prop}` must be {required!r}")
+    if concrete_props:
+        actual = typeclass.compute_concrete_properties(value, set(concrete_props))
+        for prop, required in concrete_props.items():
+            if actual[prop] != required:
+                unsatisfied.append(f" -> `{prop}` must be {required!r}")
+    if unsatisfied:
+        raise TypeError(
+            f"{typeclass.__name__} does not meet requirements:\n"
+            + "\n".join(unsatisfied)
+        )
+
+
+def check_arguments(
+    algo: ConcreteAlgorithm,
+    resolver: "Resolver",
+    property_checks: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]],
+    args,
+    kwargs,
+):
+    """Verifies the properties which could not be checked when building the task graph"""
+    kwargs = {k: v for k, v in kwargs.items() if k != "resolver"}
+    bound = algo.__signature__.bind(*args, **kwargs)
+    for name, (abstract_props, concrete_props) in property_checks.items():
+        try:
+            check_properties(
+                resolver, bound.arguments[name], abstract_props, concrete_props
+            )
+        except TypeError as e:
+            raise TypeError(f"{algo.abstract_name}: argument {name!r}: {e}") from None
+
+
+class CheckedCall:
+    """Calls algo after verifying the properties of its arguments"""
+
+    def __init__(self, algo: ConcreteAlgorithm, property_checks, resolver: "Resolver"):
+        self.algo = algo
+        self.property_checks = property_checks
+        self.resolver = resolver
+        self.__name__ = algo.__name__
+
+    def __call__(self, *args, **kwargs):
+        check_arguments(self.algo, self.resolver, self.property_checks, args, kwargs)
+        return self.algo(*args, **kwargs)
 
 
 class MetagraphTask:
-    def __init__(self, callable: Callable, result_type: ConcreteType):
+    def __init__(
+        self,
+        callable: Callable,
+        result_type: ConcreteType,
+        *,
+        gil_bound: bool = False,
+        memory: Optional[int] = None,
+    ):
         self.callable = callable
         self.result_type = result_type
+        self.gil_bound = gil_bound
+        self.memory = memory
 
     def __call__(self, *args, **kwargs):
         return self.callable(*args, **kwargs)
 
+    @property
+    def process_func(self) -> Optional[Callable]:
+        """
+        A function which may be called as `process_func(*args, **kwargs)` in another
+        process, or None if the task must run in this process
+        """
+        return None
+
+    @property
+    def annotations(self) -> TaskAnnotations:
+        executor = "threads"
+        if (
+            self.gil_bound
+            and self.process_func is not None
+            and config.get("core.dask.gil_bound_executor", "threads") == "processes"
+        ):
+            executor = "processes"
+        return TaskAnnotations(
+            gil_bound=self.gil_bound, memory=self.memory, executor=executor
+        )
+
     @property
     def func_label(self):
         return self.callable.__name__
@@ -21,19 +145,44 @@ class MetagraphTask:
 
 class DelayedAlgo(MetagraphTask):
     def __init__(
-        self, algo: ConcreteAlgorithm, result_type: ConcreteType, resolver: "Resolver"
+        self,
+        algo: ConcreteAlgorithm,
+        result_type: ConcreteType,
+        resolver: "Resolver",
+        property_checks: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = None,
+        memory: Optional[int] = None,
     ):
+        """
+        property_checks maps argument names to the (abstract, concrete) properties
+        which could not be verified when the task graph was built
+        memory is the estimated bytes allocated by the algorithm
+        """
         self.algo = algo
         self.resolver = resolver
+        self.property_checks = property_checks or {}
 
         def call(args, kwargs):
+            if self.property_checks:
+                check_arguments(algo, resolver, self.property_checks, args, kwargs)
             if algo._include_resolver or algo._compiler:
                 # do not mutate the kwargs
                 kwargs = kwargs.copy()
                 kwargs["resolver"] = resolver
             return algo(*args, **kwargs)
 
-        super().__init__(callable=call, result_type=result_type)
+        super().__init__(
+            callable=call,
+            result_type=result_type,
+            gil_bound=any(ct.gil_bound for ct in _signature_types(algo.__signature__)),
+            memory=memory,
+        )
+
+    @property
+    def process_func(self):
+        algo = self.algo
+        if self.property_checks or algo._include_resolver or algo._compiler:
+            return None
+        return algo.func
 
     @property
     def func_label(self):
@@ -60,10 +209,22 @@ class DelayedJITAlgo(MetagraphTask):
             label += f" {algo.__name__}\n"
         return label
 
+    @property
+    def data_label(self):
+        if isinstance(self.result_type, tuple):
+            # multi-output fused tasks return a tuple of values
+            return ", ".join(rt.__name__ for rt in self.result_type)
+        return super().data_label
+
 
 class DelayedTranslate(MetagraphTask):
     def __init__(
-        self, translator: Translator, source_type, result_type, resolver: "Resolver"
+        self,
+        translator: Translator,
+        source_type,
+        result_type,
+        resolver: "Resolver",
+        memory: Optional[int] = None,
     ):
         self.translator = translator
         self.resolver = resolver
@@ -76,7 +237,18 @@ class DelayedTranslate(MetagraphTask):
                 kwargs["resolver"] = resolver
             return translator(*args, **kwargs)
 
-        super().__init__(callable=call, result_type=result_type)
+        super().__init__(
+            callable=call,
+            result_type=result_type,
+            gil_bound=source_type.gil_bound or result_type.gil_bound,
+            memory=memory,
+        )
+
+    @property
+    def process_func(self):
+        if self.translator._include_resolver:
+            return None
+        return self.translator.func
 
     @property
     def func_label(self):
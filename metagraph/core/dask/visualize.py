@@ -1,6 +1,7 @@
 import dask.base
 from .tasks import MetagraphTask, DelayedAlgo, DelayedJITAlgo, DelayedTranslate
 from copy import deepcopy
+from dask.utils import format_bytes
 from typing import Dict, Hashable, Any
 from collections.abc import Mapping
 from metagraph.core.compiler import optimize
@@ -20,36 +21,29 @@ def merge_dict_of_dict(
     return result
 
 
-def visualize(*dags, filename="mydask", format=None, optimize_graph=False, **kwargs):
-    """Custom visualization of DAGs with Metagraph nodes.
+def _hotness_color(fraction: float) -> str:
+    """White for idle tasks through red for the slowest task"""
+    level = int(round(255 * (1 - min(max(fraction, 0.0), 1.0))))
+    return f"#ff{level:02x}{level:02x}"
 
-    Arguments are the same as standard dask visualize method"""
 
-    # We customize the behavior of the visualization entirely through function
-    # and data attributes. Function attributes style the node corresponding to
-    # the task execution node whereas data attributes style the output result
-    # node associated with the task.  Result nodes can be hidded with the
-    # ``collapse_ouput`` option. Attribute key/value pairs can be anything
-    # that graphviz can handle.
+def graph_attributes(merged_dag, profile=None):
+    """
+    Returns the graphviz (function_attributes, data_attributes) used to draw the
+    Metagraph tasks of merged_dag.
 
-    # combine arguments into one large task list (cf. dask.base.visualize)
-    merged_dag = {}
-    output_keys = set()
-    for dag in dags:
-        if isinstance(dag, Mapping):
-            merged_dag.update(dag)
-        elif dask.base.is_dask_collection(dag):
-            merged_dag.update(dag.__dask_graph__())
-            output_keys = output_keys.union(set(dag.__dask_keys__()))
-
-    if optimize_graph:
-        merged_dag = optimize(merged_dag, output_keys=list(output_keys))
-
-    # To give the caller priority to override styling, first compute
-    # attributes then overlay any attributes that were passed in.
+    If profile (a TaskProfiler which recorded a computation of merged_dag) is given,
+    each measured task is labeled with its duration, output size, and worker and is
+    colored by its share of the longest task duration.
+    """
     function_attributes = {}
     data_attributes = {}
+    max_duration = 0.0
+    if profile is not None and profile.records:
+        max_duration = max(r.duration for r in profile.records.values())
     for key, task in merged_dag.items():
+        if not isinstance(task, tuple) or not task:
+            continue
         task_callable = task[0]
 
         if isinstance(task_callable, MetagraphTask):
@@ -75,9 +69,55 @@ def visualize(*dags, filename="mydask", format=None, optimize_graph=False, **kwa
         else:
             continue
 
+        record = profile.records.get(key) if profile is not None else None
+        if record is not None:
+            func_attrs["label"] += f"\n{record.duration:.4f}s on {record.worker}"
+            func_attrs["style"] = "filled"
+            func_attrs["fillcolor"] = _hotness_color(
+                record.duration / max_duration if max_duration else 0.0
+            )
+            if record.nbytes is not None:
+                data_attrs["label"] += f"\n{format_bytes(record.nbytes)}"
+
         function_attributes[key] = func_attrs
         data_attributes[key] = data_attrs
 
+    return function_attributes, data_attributes
+
+
+def visualize(
+    *dags, filename="mydask", format=None, optimize_graph=False, profile=None, **kwargs,
+):
+    """Custom visualization of DAGs with Metagraph nodes.
+
+    Arguments are the same as standard dask visualize method. Pass a TaskProfiler as
+    `profile` to annotate the tasks with measurements from a computation (see
+    TaskProfiler.visualize)."""
+
+    # We customize the behavior of the visualization entirely through function
+    # and data attributes. Function attributes style the node corresponding to
+    # the task execution node whereas data attributes style the output result
+    # node associated with the task.  Result nodes can be hidded with the
+    # ``collapse_ouput`` option. Attribute key/value pairs can be anything
+    # that graphviz can handle.
+
+    # combine arguments into one large task list (cf. dask.base.visualize)
+    merged_dag = {}
+    output_keys = set()
+    for dag in dags:
+        if isinstance(dag, Mapping):
+            merged_dag.update(dag)
+        elif dask.base.is_dask_collection(dag):
+            merged_dag.update(dag.__dask_graph__())
+            output_keys = output_keys.union(set(dag.__dask_keys__()))
+
+    if optimize_graph:
+        merged_dag = optimize(merged_dag, output_keys=list(output_keys))
+
+    # To give the caller priority to override styling, first compute
+    # attributes then overlay any attributes that were passed in.
+    function_attributes, data_attributes = graph_attributes(merged_dag, profile)
+
     # overlay user-provided attributes
     user_function_attributes = kwargs.pop("function_attributes", {})
     user_data_attributes = kwargs.pop("data_attributes", {})
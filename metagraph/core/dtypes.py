@@ -82,3 +82,55 @@ dtypes_simplified = {
     timedelta64: "str",
     object: "str",
 }
+
+
+# Index dtypes chosen by the `core.memory.index_dtype` config
+_index_dtype_policies = {"auto", "int64"}
+
+
+def index_dtype(max_value: int = None) -> np.dtype:
+    """
+    Integer dtype for node ids, node positions, and sparse matrix indices no larger than
+    `max_value` (in absolute value), following the `core.memory.index_dtype` config.
+
+    "auto" (the default) uses int32 when it is safe, otherwise int64.
+    "int64" always uses int64.
+    """
+    from metagraph import config
+
+    policy = config.get("core.memory.index_dtype", "auto")
+    if policy not in _index_dtype_policies:
+        raise ValueError(
+            f"core.memory.index_dtype must be one of {sorted(_index_dtype_policies)}, "
+            f"not {policy!r}"
+        )
+    if policy == "int64" or max_value is None:
+        return int64
+    if max_value <= np.iinfo(np.int32).max:
+        return int32
+    return int64
+
+
+def as_index_array(values: np.ndarray) -> np.ndarray:
+    """
+    Integer array of node ids or positions converted to the index dtype (see `index_dtype`).
+    The array is returned unchanged if it already has that dtype or is not an integer array.
+
+    Raises ValueError if an unsigned value does not fit in int64.
+    """
+    if values.dtype.kind not in "iu":
+        return values
+    if values.dtype == int32 and index_dtype(0) == int32:
+        # Narrowest index dtype already; no need to scan the values
+        return values
+    if len(values) == 0:
+        max_value = 0
+    else:
+        max_value = max(abs(int(values.min())), int(values.max()))
+    if values.dtype.kind == "u" and max_value > np.iinfo(int64).max:
+        # astype(int64) would silently wrap these to negative ids
+        raise ValueError(f"Index value {max_value} does not fit in int64")
+    dtype = index_dtype(max_value)
+    if values.dtype == dtype:
+        return values
+    return values.astype(dtype)
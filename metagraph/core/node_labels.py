@@ -1,3 +1,19 @@
+import os
+import numpy as np
+import pandas as pd
+from dask import is_dask_collection
+
+
+# Storage dtype of object labels when saved, by the kind inferred by pandas
+_saved_label_dtypes = {
+    "string": str,
+    "integer": np.int64,
+    "floating": np.float64,
+    "mixed-integer-float": np.float64,
+    "boolean": bool,
+}
+
+
 class NodeLabels:
     """
     Bidirectional mapping from node_id to label
@@ -12,6 +28,12 @@ class NodeLabels:
         any potential conflict with the label being a tuple. Lists are not hashable and therefore
         cannot be used as a valid label, so handling lists specially allows for clear disambiguation
         of meaning by the caller.
+    Passing a numpy array of labels or node_ids will return a numpy array. Array lookups are
+        vectorized, so large batches should be passed as arrays.
+
+    Node ids are stored in an int64 array and labels in an array (or pandas Categorical).
+    Hash tables for lookups are only built on first use, and ids which are sorted are
+    located by binary search without any hash table.
 
     Usage
     -----
@@ -34,24 +56,40 @@ class NodeLabels:
         if len(node_ids) != len(labels):
             raise ValueError(f"lengths must match: {len(node_ids)} != {len(labels)}")
 
-        id2label = {}
-        label2id = {}
-        for nodeid, label in zip(node_ids, labels):
-            if type(nodeid) is not int:
-                raise TypeError(f"node ids must be int, not {type(nodeid)}")
-            id2label[nodeid] = label
-            label2id[label] = nodeid
+        node_ids = np.asarray(node_ids)
+        if len(node_ids) > 0 and not issubclass(node_ids.dtype.type, np.integer):
+            raise TypeError(f"node ids must be int, not {node_ids.dtype}")
+        if not isinstance(labels, (np.ndarray, pd.Categorical)):
+            labels = _object_array(labels)
 
-        if len(id2label) != len(node_ids):
+        self._init_arrays(node_ids.astype(np.int64, copy=False), labels)
+        if self._ids_sorted is None and not self._id_index.is_unique:
             raise ValueError("duplicate node ids")
-        if len(label2id) != len(labels):
+        if not self._label_index.is_unique:
+            if labels.dtype == object:
+                # pandas treats unhashable labels as duplicates
+                for label in labels:
+                    hash(label)
             raise ValueError("duplicate labels")
 
-        self._id2label = id2label
-        self._label2id = label2id
-
+    def _init_arrays(self, node_ids, labels):
+        self.node_ids = node_ids
+        self.labels = labels
+        # Strictly increasing ids are unique and located with np.searchsorted
+        self._ids_sorted = (
+            True if len(node_ids) < 2 or (node_ids[1:] > node_ids[:-1]).all() else None
+        )
+        self._id_index_cache = None
+        self._label_index_cache = None
         self.ids = NodeLabels._ReverseMapper(self)
 
+    @classmethod
+    def _from_arrays(cls, node_ids, labels):
+        # Arrays are trusted to be valid (e.g. saved from a NodeLabels)
+        obj = cls.__new__(cls)
+        obj._init_arrays(node_ids, labels)
+        return obj
+
     @classmethod
     def from_dict(cls, mapping):
         if not hasattr(mapping, "items"):
@@ -61,27 +99,152 @@ class NodeLabels:
 
         # Find whether keys are ids or labels
         sample_key = next(iter(mapping))
-        if type(sample_key) is int:
+        if isinstance(sample_key, (int, np.integer)) and not isinstance(
+            sample_key, bool
+        ):
             node_ids, labels = zip(*mapping.items())
         else:
             labels, node_ids = zip(*mapping.items())
         return NodeLabels(node_ids, labels)
 
+    @property
+    def _id_index(self) -> pd.Index:
+        if self._id_index_cache is None:
+            self._id_index_cache = pd.Index(self.node_ids)
+        return self._id_index_cache
+
+    @property
+    def _label_index(self) -> pd.Index:
+        if self._label_index_cache is None:
+            labels = self.labels
+            if isinstance(labels, np.ndarray) and labels.dtype.kind in "US":
+                labels = labels.astype(object)
+            self._label_index_cache = pd.Index(labels, tupleize_cols=False)
+        return self._label_index_cache
+
+    def _id_positions(self, node_ids) -> np.ndarray:
+        # Positions of node_ids, with -1 for missing ids
+        node_ids = np.asarray(node_ids)
+        if len(node_ids) > 0 and not issubclass(node_ids.dtype.type, np.integer):
+            return np.full(node_ids.shape, -1, dtype=np.intp)
+        if self._ids_sorted is None:
+            return self._id_index.get_indexer(node_ids)
+        size = len(self.node_ids)
+        if size == 0:
+            return np.full(node_ids.shape, -1, dtype=np.intp)
+        index = np.searchsorted(self.node_ids, node_ids)
+        found = self.node_ids[np.minimum(index, size - 1)] == node_ids
+        return np.where(found & (index < size), index, -1)
+
+    def _label_positions(self, labels) -> np.ndarray:
+        if not isinstance(labels, (np.ndarray, pd.Categorical)):
+            labels = _object_array(labels)
+        return self._label_index.get_indexer(labels)
+
+    def labels_to_ids(self, labels) -> np.ndarray:
+        """Node ids of an array of labels"""
+        positions = self._label_positions(labels)
+        if (positions < 0).any():
+            missing = np.asarray(labels, dtype=object)[positions < 0]
+            raise KeyError(f"labels not found: {list(missing[:10])}")
+        return self.node_ids[positions]
+
+    def ids_to_labels(self, node_ids) -> np.ndarray:
+        """Labels of an array of node ids"""
+        positions = self._id_positions(node_ids)
+        if (positions < 0).any():
+            missing = np.asarray(node_ids)[positions < 0]
+            raise KeyError(f"node ids not found: {list(missing[:10])}")
+        return np.asarray(self.labels[positions])
+
+    def relabel(self, x, *, resolver=None):
+        """
+        Replaces node ids by labels in a whole NodeSet or NodeMap (or array of node ids).
+
+        NodeMaps are returned as a pandas Series indexed by label, except for dicts which
+        remain dicts. NodeSets are returned as an array of labels, except for sets which
+        remain sets. Other NodeSet and NodeMap types are translated to their numpy form.
+        Lazy values (e.g. Placeholders) are computed first.
+        """
+        if is_dask_collection(x):
+            x = x.compute()
+        if isinstance(x, np.ndarray):
+            return self.ids_to_labels(x)
+        if isinstance(x, dict):
+            node_ids = np.fromiter(x.keys(), dtype=np.int64, count=len(x))
+            return dict(zip(self.ids_to_labels(node_ids).tolist(), x.values()))
+        if isinstance(x, (set, frozenset)):
+            node_ids = np.fromiter(x, dtype=np.int64, count=len(x))
+            return set(self.ids_to_labels(node_ids).tolist())
+
+        if resolver is None:
+            from metagraph import resolver
+        if hasattr(resolver, "_resolver"):  # DaskResolver
+            resolver = resolver._resolver
+        abstract = resolver.typeclass_of(x).abstract.__name__
+        if abstract == "NodeMap":
+            x = resolver.translate(x, resolver.types.NodeMap.NumpyNodeMapType)
+            return pd.Series(
+                x.value,
+                index=pd.Index(self.ids_to_labels(x.nodes), tupleize_cols=False),
+            )
+        if abstract == "NodeSet":
+            x = resolver.translate(x, resolver.types.NodeSet.NumpyNodeSetType)
+            return self.ids_to_labels(x.value)
+        raise TypeError(f"Cannot relabel {abstract}; expected a NodeSet or NodeMap")
+
+    def save(self, path):
+        """
+        Stores the node ids and labels as .npy files in the directory `path`, which can
+        be loaded (and memory-mapped) with `NodeLabels.load`.
+        Labels must be strings or numbers.
+        """
+        labels = self.labels
+        if isinstance(labels, pd.Categorical):
+            labels = np.asarray(labels)
+        if labels.dtype == object:
+            kind = pd.api.types.infer_dtype(labels, skipna=False)
+            if kind not in _saved_label_dtypes:
+                raise TypeError(
+                    f"only string or numeric labels can be saved, not {kind}"
+                )
+            labels = labels.astype(_saved_label_dtypes[kind])
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "node_ids.npy"), self.node_ids)
+        np.save(os.path.join(path, "labels.npy"), labels)
+
+    @classmethod
+    def load(cls, path, *, mmap_mode="r"):
+        """
+        Loads NodeLabels stored with `save`. By default, the arrays are memory-mapped,
+        so only the parts used by lookups are read.
+        """
+        node_ids = np.load(os.path.join(path, "node_ids.npy"), mmap_mode=mmap_mode)
+        labels = np.load(os.path.join(path, "labels.npy"), mmap_mode=mmap_mode)
+        return cls._from_arrays(node_ids, labels)
+
     def __eq__(self, other):
         if type(other) is not NodeLabels:
             return NotImplemented
-        return self._label2id == other._label2id
+        if len(self) != len(other):
+            return False
+        positions = other._label_positions(self.labels)
+        if (positions < 0).any():
+            return False
+        return np.array_equal(other.node_ids[positions], self.node_ids)
 
     def __len__(self):
-        return len(self._label2id)
+        return len(self.node_ids)
 
     def __getitem__(self, label):
         if type(label) is list:
-            return [self._label2id[x] for x in label]
-        return self._label2id[label]
+            return self.labels_to_ids(label).tolist()
+        if isinstance(label, np.ndarray):
+            return self.labels_to_ids(label)
+        return int(self.node_ids[self._label_index.get_loc(label)])
 
     def __contains__(self, item):
-        return item in self._label2id
+        return item in self._label_index
 
     class _ReverseMapper:
         def __init__(self, outer):
@@ -89,8 +252,33 @@ class NodeLabels:
 
         def __getitem__(self, node_id):
             if type(node_id) is list:
-                return [self._outer._id2label[x] for x in node_id]
-            return self._outer._id2label[node_id]
+                return self._outer.ids_to_labels(node_id).tolist()
+            if isinstance(node_id, np.ndarray):
+                return self._outer.ids_to_labels(node_id)
+            position = self._position(node_id)
+            if position < 0:
+                raise KeyError(node_id)
+            label = self._outer.labels[position]
+            return label.item() if isinstance(label, np.generic) else label
 
         def __contains__(self, node_id):
-            return node_id in self._outer._id2label
+            return self._position(node_id) >= 0
+
+        def _position(self, node_id) -> int:
+            if not isinstance(node_id, (int, np.integer)) or isinstance(node_id, bool):
+                return -1
+            return int(self._outer._id_positions(np.array([node_id]))[0])
+
+
+def _object_array(values) -> np.ndarray:
+    try:
+        arr = np.array(values, dtype=object)
+        if arr.ndim == 1:
+            return arr
+    except ValueError:
+        pass
+    # Keep tuples (and other sequences) as single elements
+    arr = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        arr[i] = value
+    return arr
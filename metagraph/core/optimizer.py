@@ -0,0 +1,429 @@
+"""Pipeline of optimization passes for Metagraph task graphs.
+
+The default pipeline is run by `metagraph.core.compiler.optimize` whenever a graph of
+Placeholders is computed.  Passes operate on a shared GraphState, so dependency
+information computed by one pass (e.g. culling) is reused by later passes rather
+than recomputed.  Plugins and users can add their own passes:
+
+    from metagraph.core.optimizer import default_optimizer, OptimizerPass
+
+    class MyPass(OptimizerPass):
+        name = "my_pass"
+
+        def run(self, state):
+            ...
+            state.set_graph(new_dsk)
+
+    default_optimizer.register(MyPass(), before="compile")
+
+Each run records how long every pass took along with graph statistics before and
+after it in `Optimizer.last_report`.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Hashable, Optional, Set
+
+import dask.optimization
+from dask.core import flatten, get_deps, reverse_dict, subs, istask, quote
+from dask.core import literal as dask_literal
+
+from .dask.tasks import DelayedAlgo, DelayedJITAlgo, DelayedTranslate
+from .dask.cache import CachedTask, result_cache
+from .compiler import compile_subgraphs, find_compilers
+from .. import config
+
+
+def _task_callable(task):
+    if isinstance(task, tuple) and task:
+        return task[0]
+    return None
+
+
+@dataclass(frozen=True)
+class GraphStats:
+    num_tasks: int = 0
+    num_translations: int = 0
+    num_algorithms: int = 0
+    num_fused: int = 0
+
+    @classmethod
+    def from_graph(cls, dsk) -> "GraphStats":
+        num_translations = num_algorithms = num_fused = 0
+        for task in dsk.values():
+            task_callable = _task_callable(task)
+            if isinstance(task_callable, DelayedTranslate):
+                num_translations += 1
+            elif isinstance(task_callable, DelayedAlgo):
+                num_algorithms += 1
+            elif isinstance(task_callable, DelayedJITAlgo):
+                num_fused += 1
+        return cls(len(dsk), num_translations, num_algorithms, num_fused)
+
+
+@dataclass
+class PassReport:
+    name: str
+    seconds: float
+    before: GraphStats
+    after: GraphStats
+
+
+@dataclass
+class OptimizationReport:
+    passes: List[PassReport] = field(default_factory=list)
+
+    @property
+    def before(self) -> Optional[GraphStats]:
+        return self.passes[0].before if self.passes else None
+
+    @property
+    def after(self) -> Optional[GraphStats]:
+        return self.passes[-1].after if self.passes else None
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(p.seconds for p in self.passes)
+
+    def __str__(self):
+        lines = [
+            f"{'pass':<24}{'seconds':>10}{'tasks':>14}{'translations':>16}{'fused':>10}"
+        ]
+        for p in self.passes:
+            lines.append(
+                f"{p.name:<24}{p.seconds:>10.4f}"
+                f"{f'{p.before.num_tasks}->{p.after.num_tasks}':>14}"
+                f"{f'{p.before.num_translations}->{p.after.num_translations}':>16}"
+                f"{f'{p.before.num_fused}->{p.after.num_fused}':>10}"
+            )
+        return "\n".join(lines)
+
+
+class GraphState:
+    """
+    A task graph being optimized along with its dependency information.
+
+    Dependencies and dependents are computed lazily and reused until a pass replaces
+    the graph with set_graph().
+    """
+
+    def __init__(self, dsk, output_keys: List[Hashable]):
+        self.dsk = dict(dsk)
+        self.output_keys = list(output_keys)
+        self._dependencies = None
+        self._dependents = None
+
+    @property
+    def dependencies(self) -> Dict[Hashable, Set[Hashable]]:
+        if self._dependencies is None:
+            self._dependencies, self._dependents = get_deps(self.dsk)
+        return self._dependencies
+
+    @property
+    def dependents(self) -> Dict[Hashable, Set[Hashable]]:
+        if self._dependents is None:
+            self._dependents = reverse_dict(self.dependencies)
+        return self._dependents
+
+    def set_graph(self, dsk, dependencies=None):
+        """Replace the graph; dependencies should be given if already known"""
+        self.dsk = dsk
+        if dependencies is not None:
+            # cull returns lists which may contain duplicates
+            dependencies = {k: set(v) for k, v in dependencies.items()}
+        self._dependencies = dependencies
+        self._dependents = None
+
+    def replace_with_aliases(self, aliases: Dict[Hashable, object]):
+        """
+        Redirect every use of each key in aliases to its target (another key or a
+        literal).  Output keys are kept as aliases so they remain computable.
+        """
+        if not aliases:
+            return
+
+        def resolve(target):
+            seen = set()
+            # targets may be unhashable literals, which are never keys
+            while _is_key(target, aliases) and target not in seen:
+                seen.add(target)
+                target = aliases[target]
+            return target
+
+        dependents = self.dependents
+        new_dsk = dict(self.dsk)
+        for key in aliases:
+            target = resolve(key)
+            for dependent in dependents.get(key, ()):
+                if dependent in new_dsk and dependent not in aliases:
+                    new_dsk[dependent] = subs(new_dsk[dependent], key, target)
+            new_dsk[key] = target
+        # keys which are no longer used are removed by a later cull
+        self.set_graph(new_dsk)
+
+
+class OptimizerPass:
+    """A single step of the optimization pipeline"""
+
+    name: str = None
+
+    def run(self, state: GraphState):  # pragma: no cover
+        """Optimize state.dsk, calling state.set_graph() with the new graph if changed"""
+        raise NotImplementedError("all optimizer passes must implement run()")
+
+
+class Optimizer:
+    def __init__(self, passes: Optional[List[OptimizerPass]] = None):
+        self.passes: List[OptimizerPass] = []
+        self.last_report: Optional[OptimizationReport] = None
+        for optimizer_pass in passes or ():
+            self.register(optimizer_pass)
+
+    def _index(self, name: str) -> int:
+        for i, optimizer_pass in enumerate(self.passes):
+            if optimizer_pass.name == name:
+                return i
+        raise KeyError(f"No optimizer pass named {name!r}")
+
+    def register(
+        self,
+        optimizer_pass: OptimizerPass,
+        *,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ):
+        """Add a pass at the end of the pipeline, or before/after the named pass"""
+        if optimizer_pass.name is None:
+            raise ValueError("optimizer passes must have a name")
+        if any(p.name == optimizer_pass.name for p in self.passes):
+            raise ValueError(
+                f"An optimizer pass named {optimizer_pass.name!r} is already registered"
+            )
+        if before is not None and after is not None:
+            raise ValueError("Cannot specify both `before` and `after`")
+        if before is not None:
+            self.passes.insert(self._index(before), optimizer_pass)
+        elif after is not None:
+            self.passes.insert(self._index(after) + 1, optimizer_pass)
+        else:
+            self.passes.append(optimizer_pass)
+
+    def unregister(self, name: str) -> OptimizerPass:
+        return self.passes.pop(self._index(name))
+
+    def run(self, dsk, output_keys: List[Hashable]):
+        state = GraphState(dsk, output_keys)
+        report = OptimizationReport()
+        stats = GraphStats.from_graph(state.dsk)
+        for optimizer_pass in self.passes:
+            start = time.perf_counter()
+            optimizer_pass.run(state)
+            elapsed = time.perf_counter() - start
+            new_stats = GraphStats.from_graph(state.dsk)
+            report.passes.append(
+                PassReport(optimizer_pass.name, elapsed, stats, new_stats)
+            )
+            stats = new_stats
+        self.last_report = report
+        if config.get("core.logging.optimizer"):
+            print(report)
+        return state.dsk
+
+
+class CullPass(OptimizerPass):
+    """Remove tasks which are not needed to compute the output keys"""
+
+    name = "cull"
+
+    def run(self, state: GraphState):
+        dsk, dependencies = dask.optimization.cull(state.dsk, state.output_keys)
+        state.set_graph(dsk, dependencies)
+
+
+def _translation_chains(dsk):
+    """
+    For every translation task without extra properties, find the task (or literal)
+    the chain of translations started from.
+
+    Returns {key: (origin, origin_type, result_type, chain_length)}
+    """
+    translations = {}
+    for key, task in dsk.items():
+        task_callable = _task_callable(task)
+        if not isinstance(task_callable, DelayedTranslate):
+            continue
+        args, kwargs = task[1], task[2]
+        if len(args) != 1 or kwargs != (dict, []):
+            continue
+        translations[key] = (args[0], task_callable)
+
+    chains = {}
+
+    def chain_of(key):
+        if key in chains:
+            return chains[key]
+        src, task_callable = translations[key]
+        if _is_key(src, translations):
+            origin, origin_type, _, length = chain_of(src)
+        else:
+            origin, origin_type, length = src, task_callable.source_type, 0
+        chains[key] = (origin, origin_type, task_callable.result_type, length + 1)
+        return chains[key]
+
+    for key in translations:
+        chain_of(key)
+    return chains
+
+
+def _is_key(obj, keys) -> bool:
+    try:
+        return obj in keys
+    except TypeError:  # unhashable literal
+        return False
+
+
+def _origin_token(origin):
+    # Literal arguments are wrapped by dask.core.quote; compare them by identity
+    if istask(origin) and isinstance(origin[0], dask_literal):
+        return ("literal", id(origin[0].data))
+    try:
+        hash(origin)
+    except TypeError:
+        return ("literal", id(origin))
+    return origin
+
+
+class RedundantTranslationPass(OptimizerPass):
+    """
+    Remove chains of translations which return to the type they started from
+    (e.g. A -> B -> A), using the original value instead.
+    """
+
+    name = "redundant_translations"
+
+    def run(self, state: GraphState):
+        aliases = {}
+        for key, (origin, origin_type, result_type, length) in _translation_chains(
+            state.dsk
+        ).items():
+            if length > 1 and origin_type is result_type:
+                aliases[key] = origin
+        state.replace_with_aliases(aliases)
+
+
+class TranslationHoistingPass(OptimizerPass):
+    """
+    When the same value is translated to the same type more than once (possibly
+    through different intermediate types), keep only the shortest translation and
+    share it with every consumer.
+    """
+
+    name = "hoist_translations"
+
+    def run(self, state: GraphState):
+        canonical = {}
+        aliases = {}
+        for key, (origin, _, result_type, length) in _translation_chains(
+            state.dsk
+        ).items():
+            group = (_origin_token(origin), result_type)
+            best = canonical.get(group)
+            if best is None:
+                canonical[group] = (length, key)
+            elif length < best[0]:
+                aliases[best[1]] = key
+                canonical[group] = (length, key)
+            else:
+                aliases[key] = best[1]
+        state.replace_with_aliases(aliases)
+
+
+class CompilerFusionPass(OptimizerPass):
+    """Fuse compilable subgraphs using each compiler referenced in the graph"""
+
+    name = "compile"
+
+    def run(self, state: GraphState):
+        for compiler in find_compilers(state.dsk).values():
+            dsk = compile_subgraphs(
+                state.dsk,
+                output_keys=state.output_keys,
+                compiler=compiler,
+                dependencies=state.dependencies,
+                dependents=state.dependents,
+            )
+            if dsk is not state.dsk:
+                state.set_graph(dsk)
+
+
+class CachedResultPass(OptimizerPass):
+    """
+    Replace tasks whose results are in the result cache with the cached values
+    (only when `core.dask.cache.enabled` is set)
+    """
+
+    name = "use_cached_results"
+
+    def __init__(self, cache=result_cache):
+        self.cache = cache
+
+    def run(self, state: GraphState):
+        if not self.cache.enabled:
+            return
+        missing = object()
+        new_dsk = None
+        # Walk from the outputs and stop at cached results, so tasks which are only
+        # needed upstream of a cached result are never looked up (or counted as used)
+        stack = list(flatten(state.output_keys))
+        seen = set()
+        while stack:
+            key = stack.pop()
+            if key in seen or key not in state.dsk:
+                continue
+            seen.add(key)
+            task = state.dsk[key]
+            if isinstance(_task_callable(task), (DelayedTranslate, DelayedAlgo)):
+                value = self.cache.get(key, missing)
+                if value is not missing:
+                    if new_dsk is None:
+                        new_dsk = dict(state.dsk)
+                    new_dsk[key] = quote(value)
+                    continue
+            stack.extend(state.dependencies[key])
+        if new_dsk is not None:
+            # upstream tasks are no longer needed and are removed by culling
+            state.set_graph(new_dsk)
+
+
+class CacheResultsPass(OptimizerPass):
+    """
+    Store the results of translations and algorithm calls in the result cache when
+    computed (only when `core.dask.cache.enabled` is set)
+    """
+
+    name = "cache_results"
+
+    def __init__(self, cache=result_cache):
+        self.cache = cache
+
+    def run(self, state: GraphState):
+        if not self.cache.enabled:
+            return
+        new_dsk = dict(state.dsk)
+        for key, task in state.dsk.items():
+            task_callable = _task_callable(task)
+            if isinstance(task_callable, (DelayedTranslate, DelayedAlgo)):
+                new_dsk[key] = (CachedTask(task_callable, key, self.cache),) + task[1:]
+        state.set_graph(new_dsk, state.dependencies)
+
+
+default_optimizer = Optimizer(
+    [
+        CachedResultPass(),
+        RedundantTranslationPass(),
+        TranslationHoistingPass(),
+        CullPass(),
+        CompilerFusionPass(),
+        CacheResultsPass(),
+    ]
+)
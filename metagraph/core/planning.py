@@ -5,10 +5,49 @@ from collections import abc
 import inspect
 import numpy as np
 import scipy.sparse as ss
+from dask.utils import parse_bytes, format_bytes
 from metagraph import config, Wrapper, NodeID
 from .dask.placeholder import Placeholder
 
 
+class MemoryLimitError(MemoryError):
+    pass
+
+
+def get_memory_limit() -> Optional[int]:
+    """Returns `core.dispatch.memory_limit` in bytes, or None if there is no limit"""
+    limit = config.get("core.dispatch.memory_limit", None)
+    if limit is None:
+        return None
+    if isinstance(limit, str):
+        return parse_bytes(limit)
+    return int(limit)
+
+
+def raise_memory_limit_error(algo_name, solutions: List["AlgorithmPlan"], limit):
+    """Raise a MemoryLimitError listing the estimated memory needed for each solution"""
+    alternatives = sorted(
+        solutions,
+        key=lambda plan: (
+            plan.estimated_nbytes is None,
+            plan.estimated_nbytes or 0,
+            plan.algo.func.__name__,
+        ),
+    )
+    lines = []
+    for plan in alternatives:
+        if plan.estimated_nbytes is None:
+            est = "unknown"
+        else:
+            est = format_bytes(plan.estimated_nbytes)
+        lines.append(f"    {plan.algo.func.__name__}: {est}")
+    alt_msg = "\n".join(lines)
+    raise MemoryLimitError(
+        f'Translations required for "{algo_name}" exceed core.dispatch.memory_limit '
+        f"({format_bytes(limit)}). Estimated memory needed by each solution:\n{alt_msg}"
+    )
+
+
 class TranslationMatrix:
     def __init__(self, resolver, abstract):
         self.abstract = abstract
@@ -69,6 +108,8 @@ class MultiStepTranslator:
         self.translators = []
         self.dst_types = []
         self.final_type = final_type
+        # Concrete properties required of the result, passed to translators reaching final_type
+        self.final_props = {}
         self.unsatisfiable = False
 
     def __len__(self):
@@ -119,6 +160,59 @@ class MultiStepTranslator:
         self.translators.append(translator)
         self.dst_types.append(dst_type)
 
+    def estimate_memory(self, src_nbytes):
+        """
+        Estimate the memory allocated while translating an object of `src_nbytes` bytes.
+
+        Returns (peak_nbytes, final_nbytes). Each intermediate object is released as soon as
+        the following hop completes, so the peak is the largest (input + output) of any hop,
+        not counting the original source object.
+        """
+        peak = 0
+        cur = src_nbytes
+        for i, translator in enumerate(self.translators):
+            nxt = cur * translator.memory_expansion
+            peak = max(peak, (cur if i > 0 else 0) + nxt)
+            cur = nxt
+        final = cur if self.translators else 0
+        return peak, final
+
+    def _check_memory_limit(self, src, limit):
+        src_nbytes = self.src_type.estimate_size(src).nbytes
+        if src_nbytes is None:
+            return
+        peak, _ = self.estimate_memory(src_nbytes)
+        if peak <= limit:
+            return
+
+        # Look for other concrete types of the same abstract type which fit within the limit
+        alternatives = []
+        for ct in self.resolver.concrete_types:
+            if ct.abstract is not self.final_type.abstract:
+                continue
+            # Leaving the value as it is does not satisfy the caller
+            if ct is self.src_type or ct is self.final_type:
+                continue
+            mst = MultiStepTranslator.find_translation(self.resolver, self.src_type, ct)
+            if mst.unsatisfiable:
+                continue
+            alt_peak, _ = mst.estimate_memory(src_nbytes)
+            if alt_peak <= limit:
+                alternatives.append((alt_peak, ct.__name__))
+        if alternatives:
+            alt_msg = "\n".join(
+                f"    {name}: {format_bytes(alt_peak)}"
+                for alt_peak, name in sorted(alternatives)
+            )
+            alt_msg = f"Alternatives within the limit:\n{alt_msg}"
+        else:
+            alt_msg = "No alternative destination types fit within the limit."
+        raise MemoryLimitError(
+            f"Translation {self.src_type.__name__} -> {self.final_type.__name__} is estimated "
+            f"to need {format_bytes(peak)}, exceeding core.dispatch.memory_limit "
+            f"({format_bytes(limit)}). {alt_msg}"
+        )
+
     def __call__(self, src, **props):
         if self.unsatisfiable:
             raise ValueError(
@@ -128,6 +222,10 @@ class MultiStepTranslator:
         if not self.translators:
             return src
 
+        limit = get_memory_limit()
+        if limit is not None and not isinstance(src, Placeholder):
+            self._check_memory_limit(src, limit)
+
         # Import here to avoid circular references
         from .dask.resolver import DaskResolver
 
@@ -137,10 +235,17 @@ class MultiStepTranslator:
         if config.get("core.logging.translations"):
             self.display()
 
-        for translator in self.translators[:-1]:
-            src = translator(src, resolver=self.resolver)
+        for translator, dst_type in zip(self.translators[:-1], self.dst_types):
+            # Translators reaching the destination type may already produce the required
+            # properties, leaving nothing for a final self-translation to do
+            step_props = self.final_props if dst_type is self.final_type else {}
+            # Only `src` refers to the previous intermediate, so rebinding it frees that
+            # intermediate once this hop completes
+            src = translator(src, resolver=self.resolver, **step_props)
         # Finish by reaching destination along with required properties
-        dst = self.translators[-1](src, resolver=self.resolver, **props)
+        dst = self.translators[-1](
+            src, resolver=self.resolver, **self.final_props, **props
+        )
         return dst
 
     def display(self):
@@ -152,7 +257,10 @@ class MultiStepTranslator:
     ) -> "MultiStepTranslator":
         dst_type = resolver.class_to_concrete.get(dst_type, dst_type)
 
+        # Concrete properties required of the destination (e.g. a sparse matrix format)
+        dst_props = {}
         if not isinstance(dst_type, type):
+            dst_props = dict(dst_type.props)
             dst_type = dst_type.__class__
 
         if exact:
@@ -172,7 +280,15 @@ class MultiStepTranslator:
 
         # Lookup shortest path from stored results
         trans_matrix = resolver._translation_matrices[abstract]
-        return trans_matrix.build_mst(resolver, src_type, dst_type)
+        mst = trans_matrix.build_mst(resolver, src_type, dst_type)
+        if dst_props and not mst.unsatisfiable:
+            # Translators from a type to itself enforce concrete properties, so they finish
+            # any path (including the empty one when only the properties differ)
+            self_translator = resolver.translators.get((dst_type, dst_type))
+            if self_translator is not None:
+                mst.add_after(self_translator, dst_type)
+            mst.final_props = dst_props
+        return mst
 
 
 class AlgorithmPlan:
@@ -182,16 +298,28 @@ class AlgorithmPlan:
         concrete_algorithm,
         required_translations: Dict[str, MultiStepTranslator],
         err_msgs: List[str],
+        *,
+        estimated_nbytes: Optional[float] = None,
+        memory_limit: Optional[int] = None,
     ):
         self.resolver = resolver
         self.algo = concrete_algorithm
         self.required_translations = required_translations
         self.err_msgs = err_msgs
+        # Estimated memory allocated by the required translations (None if unknown)
+        self.estimated_nbytes = estimated_nbytes
+        self.memory_limit = memory_limit
 
     @property
     def unsatisfiable(self):
         return len(self.err_msgs) != 0
 
+    @property
+    def exceeds_memory_limit(self):
+        if self.estimated_nbytes is None or self.memory_limit is None:
+            return False
+        return self.estimated_nbytes > self.memory_limit
+
     @classmethod
     def string_for_annotation(cls, annotation) -> str:
         if type(annotation) is Wrapper:
@@ -221,6 +349,10 @@ class AlgorithmPlan:
                     s.append(f"** {varname} **")
                     anni = sig.parameters[varname].annotation
                     s.append(self.string_for_annotation(anni))
+            if self.estimated_nbytes is not None:
+                s.append(
+                    f"Estimated translation memory: {format_bytes(self.estimated_nbytes)}"
+                )
         s.append("---------------------")
         return "\n".join(s)
 
@@ -248,6 +380,11 @@ class AlgorithmPlan:
             bound_args.arguments[varname] = self.required_translations[varname](
                 bound_args.arguments[varname]
             )
+        if self.algo._compiler is not None and not self.algo._include_resolver:
+            # compiled algorithms need the resolver to find their compiler
+            return self.algo(
+                *bound_args.args, resolver=self.resolver, **bound_args.kwargs
+            )
         return self.algo(*bound_args.args, **bound_args.kwargs)
 
     def display(self):
@@ -287,7 +424,10 @@ class AlgorithmPlan:
                         resolver, src_type, translation_param_type
                     )
                     if translator.unsatisfiable:
-                        failure_message = f"Failed to find translator to {translator.final_type.__name__} for {arg_name}"
+                        failure_message = (
+                            "Failed to find translator to "
+                            f"{translator.final_type.__name__} for {arg_name}"
+                        )
                         err_msgs.append(failure_message)
                         if config.get(
                             "core.planner.build.verbose", False
@@ -300,10 +440,47 @@ class AlgorithmPlan:
             err_msgs.append(failure_message)
             if config.get("core.planner.build.verbose", False):  # pragma: no cover
                 print(failure_message)
+
+        estimated_nbytes = None
+        memory_limit = get_memory_limit()
+        if memory_limit is not None and required_translations and not err_msgs:
+            estimated_nbytes = cls._estimate_translation_memory(
+                bound_args.arguments, required_translations
+            )
         return AlgorithmPlan(
-            resolver, concrete_algorithm, required_translations, err_msgs
+            resolver,
+            concrete_algorithm,
+            required_translations,
+            err_msgs,
+            estimated_nbytes=estimated_nbytes,
+            memory_limit=memory_limit,
         )
 
+    @staticmethod
+    def _estimate_translation_memory(arguments, required_translations):
+        """
+        Returns the estimated peak memory allocated while translating all arguments,
+        or None if the size of any translated argument is unknown.
+
+        Translated arguments are all held until the algorithm is called, so their final sizes
+        add up, while only one translation is in progress at a time.
+        """
+        total_final = 0
+        worst_transient = 0
+        for arg_name, mst in required_translations.items():
+            arg_value = arguments[arg_name]
+            if isinstance(arg_value, Placeholder) or not mst.src_type.is_typeclass_of(
+                arg_value
+            ):
+                return None
+            src_nbytes = mst.src_type.estimate_size(arg_value).nbytes
+            if src_nbytes is None:
+                return None
+            peak, final = mst.estimate_memory(src_nbytes)
+            total_final += final
+            worst_transient = max(worst_transient, peak - final)
+        return total_final + worst_transient
+
     @staticmethod
     def _check_arg_type(resolver, arg_name, arg_value, param_type):
         """
@@ -319,14 +496,25 @@ class AlgorithmPlan:
         elif isinstance(param_type, ConcreteType):
             arg_typeclass = resolver.typeclass_of(arg_value)
 
-            # Handle lazy objects which don't know their properties
+            # Lazy objects only know the properties declared by whatever produces them;
+            # properties which are unknown are checked by the DaskResolver once computed
             if isinstance(arg_value, Placeholder):
                 if arg_typeclass is not param_type.__class__:
                     return param_type
-                else:
-                    # TODO: add a self-translation step to ensure correct properties
-                    return
+                known_props = arg_value.known_concrete_props
+                for prop, required_value in param_type.props.items():
+                    if prop in known_props and known_props[prop] != required_value:
+                        return param_type
+                # Unknown properties are enforced by a self-translation when available
+                if param_type.props.keys() - known_props.keys() and (
+                    (arg_typeclass, arg_typeclass) in resolver.translators
+                ):
+                    return param_type
+                return
 
+            # Concrete properties only apply to values which are already of the required type
+            if arg_typeclass is not param_type.__class__:
+                return param_type
             requested_properties = set(param_type.props.keys())
             properties_dict = arg_typeclass.compute_concrete_properties(
                 arg_value, requested_properties
@@ -1,10 +1,13 @@
 """Base classes for basic metagraph plugins.
 """
 import types
+import pickle
+import threading
 import inspect
 from functools import partial
+from collections import OrderedDict
 from typing import Callable, List, Dict, Set, Union, Any, Optional
-from .typecache import TypeCache, TypeInfo
+from .typecache import TypeCache, TypeInfo, SizeEstimate
 
 
 class AbstractType:
@@ -80,6 +83,7 @@ class ConcreteType:
     value_type = None  # override this for fast path type identification
     allowed_props = {}  # default is no props
     target = "cpu"  # key may be used in future to guide dispatch
+    gil_bound = False  # operations on values hold the GIL (e.g. pure Python objects)
 
     # Override these methods only if necessary
     def __init__(self, **props):
@@ -348,6 +352,25 @@ class ConcreteType:
 
         return concrete_props
 
+    @classmethod
+    def _estimate_size(cls, obj) -> SizeEstimate:
+        # Default is to know nothing about the size
+        return SizeEstimate()
+
+    @classmethod
+    def estimate_size(cls, obj) -> SizeEstimate:
+        """Return a SizeEstimate with the number of nodes, number of edges, and bytes of this object.
+
+        Estimates are intended to be cheap to compute (O(1) where possible) and are
+        cached alongside the properties of the object.
+        """
+        assert cls.is_typeclass_of(obj), f"Cannot estimate size of {obj} using {cls}"
+
+        typeinfo = cls.get_typeinfo(obj)
+        if typeinfo.size is None:
+            typeinfo.size = cls._estimate_size(obj)
+        return typeinfo.size
+
     @classmethod
     def get_type(cls, obj):
         """Get an instance of this type class that fully describes obj
@@ -425,6 +448,10 @@ class MetaWrapper(type):
         return cls
 
 
+# Set while a wrapper is constructed with Wrapper.trusted
+_trusted_construction = threading.local()
+
+
 class Wrapper(metaclass=MetaWrapper):
     """Helper class for creating wrappers around data objects
 
@@ -464,6 +491,31 @@ class Wrapper(metaclass=MetaWrapper):
         if aprops is not None:
             self.Type.preset_abstract_properties(self, **aprops)
 
+    @classmethod
+    def trusted(cls, *args, **kwargs):
+        """
+        Constructs the wrapper from data which is valid by construction (e.g. the outputs of
+        translators and algorithms), skipping the validation done for user-facing construction.
+        Inputs are still converted (e.g. lists to arrays), but not checked, sorted or deduplicated.
+
+        Set the `core.debug.validate_trusted` config to validate these wrappers as well.
+        """
+        previous = getattr(_trusted_construction, "active", False)
+        _trusted_construction.active = True
+        try:
+            return cls(*args, **kwargs)
+        finally:
+            _trusted_construction.active = previous
+
+    @staticmethod
+    def _validating() -> bool:
+        """Whether the wrapper being constructed must validate its inputs"""
+        if not getattr(_trusted_construction, "active", False):
+            return True
+        from metagraph import config
+
+        return bool(config.get("core.debug.validate_trusted", False))
+
     @staticmethod
     def _assert_instance(obj, klass, err_msg=None):
         if not isinstance(obj, klass):
@@ -507,9 +559,12 @@ class Translator:
     """Converts from one concrete type to another, enforcing properties on the
     destination if requested."""
 
-    def __init__(self, func: Callable, include_resolver: bool):
+    def __init__(
+        self, func: Callable, include_resolver: bool, memory_expansion: float = 1.0
+    ):
         self.func = func
         self._include_resolver = include_resolver
+        self.memory_expansion = memory_expansion
         self.__name__ = func.__name__
         self.__doc__ = func.__doc__
         self.__wrapped__ = func
@@ -525,7 +580,12 @@ class Translator:
             return self.func(src, **props)
 
 
-def translator(func: Callable = None, *, include_resolver: bool = False):
+def translator(
+    func: Callable = None,
+    *,
+    include_resolver: bool = False,
+    memory_expansion: float = 1.0,
+):
     """
     decorator which can be called as either:
     >>> @translator
@@ -538,12 +598,23 @@ def translator(func: Callable = None, *, include_resolver: bool = False):
     If the resolver is needed as part of the translator, use this format
     >>> @translate(include_resolver=True)
     >>> def myfunc(x: FromType, *, resolver, **props) -> ToType: ...
+
+    memory_expansion is the approximate ratio of bytes used by the output compared to the input.
+    It is used to plan translations within `core.dispatch.memory_limit`.
+    >>> @translate(memory_expansion=20)
+    >>> def myfunc(x: CompactType, **props) -> BloatedType: ...
     """
     # FIXME: signature checks?
     if func is None:
-        return partial(Translator, include_resolver=include_resolver)
+        return partial(
+            Translator,
+            include_resolver=include_resolver,
+            memory_expansion=memory_expansion,
+        )
     else:
-        return Translator(func, include_resolver=include_resolver)
+        return Translator(
+            func, include_resolver=include_resolver, memory_expansion=memory_expansion
+        )
 
 
 def normalize_type(t):
@@ -612,7 +683,10 @@ class ConcreteAlgorithm:
         self.version = version
         self._include_resolver = include_resolver
         self._compiler = compiler
-        self._compiled_func = None
+        # Functions compiled for earlier calls, keyed on their specialization, which
+        # are used when called without a resolver
+        self._compiled_funcs = OrderedDict()
+        self._compiled_funcs_lock = threading.Lock()
         self.__name__ = func.__name__
         self.__doc__ = func.__doc__
         self.__wrapped__ = func
@@ -621,17 +695,19 @@ class ConcreteAlgorithm:
 
     def __call__(self, *args, resolver=None, **kwargs):
         if self._compiler is not None:
-            if self._compiled_func is not None:
-                func = self._compiled_func
-            elif resolver is not None:
-                func = resolver.compile_algorithm(
-                    self, literals={}
-                )  # TODO: pass literals here
-                self._compiled_func = func
+            key = self._specialization_key(args, kwargs)
+            if resolver is not None:
+                # specialized on literal arguments and input types
+                func = resolver.compile_algorithm(self, args=args, kwargs=kwargs)
+                self._remember_compiled(key, func)
             else:
-                raise CompileError(
-                    f"Cannot call {self.__name__} without a 'resolver' argument to generate compiled function."
-                )
+                with self._compiled_funcs_lock:
+                    func = self._compiled_funcs.get(key)
+                if func is None:
+                    raise CompileError(
+                        f"Cannot call {self.__name__} without a 'resolver' argument to generate "
+                        "compiled function for these arguments."
+                    )
         else:
             func = self.func
 
@@ -646,6 +722,26 @@ class ConcreteAlgorithm:
         else:
             return func(*args, **kwargs)
 
+    def _specialization_key(self, args, kwargs):
+        from .compilecache import specialize
+
+        literals, profile = specialize(self, args, kwargs)
+        # include the type so that e.g. True and 1 are distinct specializations
+        return (
+            tuple(sorted((k, type(v).__name__, v) for k, v in literals.items())),
+            profile,
+        )
+
+    def _remember_compiled(self, key, func):
+        from metagraph import config
+
+        maxsize = config.get("core.compiler.cache.maxsize", 128)
+        with self._compiled_funcs_lock:
+            self._compiled_funcs[key] = func
+            self._compiled_funcs.move_to_end(key)
+            while len(self._compiled_funcs) > maxsize:
+                self._compiled_funcs.popitem(last=False)
+
 
 def concrete_algorithm(
     abstract_name: str,
@@ -720,13 +816,29 @@ class Compiler:
         )
 
     def compile_subgraph(
-        self, subgraph: Dict, inputs: List[str], output: str
+        self, subgraph: Dict, inputs: List[str], output: Union[str, List[str]]
     ) -> Callable:
         """Compile a subgraph of compilable functions into a single callable with
         inputs in the order listed, returning output value.
 
+        If output is a list of keys, the subgraph has multiple outputs and the
+        callable must return a tuple of values in the same order.
+
         Raises CompileError if unsuccessful.
         """
         raise NotImplementedError(
             "all compiler plugins must implement compile_subgraph()"
         )
+
+    def serialize_compiled(self, func: Callable) -> bytes:
+        """Serialize a function returned by compile_algorithm() so it can be stored
+        in the on-disk compile cache.
+
+        Raise an exception if func cannot be serialized; it will then only be cached
+        in memory.
+        """
+        return pickle.dumps(func)
+
+    def deserialize_compiled(self, data: bytes) -> Callable:
+        """Inverse of serialize_compiled()"""
+        return pickle.loads(data)
@@ -5,6 +5,7 @@ to concrete algorithms.
 import copy
 import inspect
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
 from collections import defaultdict, abc
 from typing import (
     List,
@@ -28,8 +29,17 @@ from .plugin import (
     Compiler,
     CompileError,
 )
-from .planning import MultiStepTranslator, AlgorithmPlan, TranslationMatrix
+from .planning import (
+    MultiStepTranslator,
+    AlgorithmPlan,
+    TranslationMatrix,
+    raise_memory_limit_error,
+)
+from .dask.placeholder import Placeholder
+from .typecache import SizeEstimate
 from .entrypoints import load_plugins
+from .autotune import Autotuner
+from .compilecache import CompileCache, specialize
 from . import typing as mgtyping
 from .. import config
 from .typing import NodeID
@@ -166,6 +176,12 @@ class Resolver:
         # Single-source shortest path matrix and predecessor matrix from scipy.sparse.csgraph.dijkstra
         self._translation_matrices: Dict[AbstractType, TranslationMatrix] = {}
 
+        # measured timings used to select the fastest solution (if enabled)
+        self.autotuner = Autotuner()
+
+        # compiled functions specialized on literal arguments and input types
+        self.compile_cache = CompileCache()
+
         self.algos = Namespace()
         self.wrappers = Namespace()
         self.types = Namespace()
@@ -211,6 +227,8 @@ class Resolver:
     def register(self, plugins_by_name):
         """Register plugins for use with a resolver."""
         _ResolverRegistrar.register(self, plugins_by_name)
+        if config.get("core.compiler.warmup.on_register", False):
+            self.warmup()
 
     def load_plugins_from_environment(self):
         """Scans environment for plugins and populates registry with them."""
@@ -240,6 +258,16 @@ class Resolver:
         """
         return self.typeclass_of(value).get_type(value)
 
+    def size_of(self, value):
+        """Return a SizeEstimate (num_nodes, num_edges, nbytes) for this value.
+
+        The estimate is cheap to compute and is cached with the type information of the value.
+        Placeholders only know their estimated nbytes (which may be None).
+        """
+        if isinstance(value, Placeholder):
+            return SizeEstimate(nbytes=value.estimated_nbytes)
+        return self.typeclass_of(value).estimate_size(value)
+
     def assert_equal(self, obj1, obj2, *, rel_tol=1e-9, abs_tol=0.0):
         # Ensure all properties are fully calculated
         type1 = self.type_of(obj1)
@@ -312,7 +340,10 @@ class Resolver:
         #  - Wrapper, instance of Wrapper, or string of Wrapper class name
         #  - ConcreteType or string of ConcreteType class name
         #  - ConcreteType's value_type or instance of ConcreteType's value_type
+        #  - instance of ConcreteType, whose concrete properties the result must have
         orig_dst_type = dst_type
+        if isinstance(dst_type, ConcreteType):
+            return dst_type
         if not isinstance(dst_type, type):
             if isinstance(dst_type, str):
                 dst_type = self._find_translatable_concrete_type_by_name(
@@ -344,6 +375,16 @@ class Resolver:
     def find_algorithm_solutions(
         self, algo_name: str, *args, **kwargs
     ) -> List[AlgorithmPlan]:
+        solutions, _ = self._find_algorithm_solutions(algo_name, args, kwargs)
+        return solutions
+
+    def _find_algorithm_solutions(
+        self, algo_name: str, args, kwargs
+    ) -> Tuple[List[AlgorithmPlan], Optional[str]]:
+        """
+        Returns the sorted solutions along with the autotuner key of the call
+        (None when the autotuner is not used)
+        """
         if algo_name not in self.abstract_algorithms:
             raise ValueError(f'No abstract algorithm "{algo_name}" has been registered')
 
@@ -360,9 +401,21 @@ class Resolver:
 
         # TODO: improve this in the future. for now, use total number of translations
         #       as well as algorithm name to ensure repeatability of solutions
-        solutions.sort(key=lambda x: (total_num_translations(x), x.algo.func.__name__))
+        #       Solutions exceeding the memory limit are always placed last
+        solutions.sort(
+            key=lambda x: (
+                x.exceeds_memory_limit,
+                total_num_translations(x),
+                x.algo.func.__name__,
+            )
+        )
 
-        return solutions
+        autotune_key = None
+        if self.autotuner.enabled and len(solutions) > 1:
+            autotune_key = self.autotuner.make_key(self, algo_name, args, kwargs)
+            solutions = self.autotuner.prefer(autotune_key, solutions)
+
+        return solutions, autotune_key
 
     def find_algorithm_exact(
         self, algo_name: str, *args, **kwargs
@@ -384,8 +437,12 @@ class Resolver:
     def run(self, algo_name: str, *args, **kwargs):
         args, kwargs = self._check_algorithm_signature(algo_name, *args, **kwargs)
 
+        autotune_key = None
         if config.get("core.dispatch.allow_translation"):
-            algo = self.find_algorithm(algo_name, *args, **kwargs)
+            solutions, autotune_key = self._find_algorithm_solutions(
+                algo_name, args, kwargs
+            )
+            algo = solutions[0] if solutions else None
         else:
             algo = self.find_algorithm_exact(algo_name, *args, **kwargs)
 
@@ -393,6 +450,13 @@ class Resolver:
             raise TypeError(
                 f'No concrete algorithm for "{algo_name}" can be satisfied for the given inputs'
             )
+        if algo.exceeds_memory_limit:
+            raise_memory_limit_error(algo_name, solutions, algo.memory_limit)
+
+        if autotune_key is not None:
+            if self.autotuner.needs_tuning(autotune_key):
+                return self.autotuner.tune(autotune_key, solutions, args, kwargs)
+            self.autotuner.record_call(autotune_key)
 
         if config.get("core.logging.plans"):
             algo.display()
@@ -512,15 +576,27 @@ class Resolver:
             requested_properties = set(
                 k for k, v in param_type.prop_val.items() if v is not None
             )
-            properties_dict = this_typeclass.compute_abstract_properties(
-                arg_value, requested_properties
-            )
+            if isinstance(arg_value, Placeholder):
+                # Only check what is known now; the DaskResolver checks the rest once computed
+                known_props = arg_value.known_abstract_props
+                if this_typeclass.abstract != param_class:
+                    known_props = {}
+                properties_dict = {
+                    k: v for k, v in known_props.items() if k in requested_properties
+                }
+                requested_properties = set(properties_dict)
+            else:
+                properties_dict = this_typeclass.compute_abstract_properties(
+                    arg_value, requested_properties
+                )
             this_abs_type = this_typeclass.abstract(**properties_dict)
 
             unsatisfied_requirements = []
             for abst_prop, required_value in param_type.prop_val.items():
                 if required_value is None:  # unspecified
                     continue
+                if abst_prop not in requested_properties:  # not yet known
+                    continue
                 if type(required_value) is tuple:
                     if this_abs_type.prop_val[abst_prop] not in required_value:
                         unsatisfied_requirements.append(
@@ -539,8 +615,19 @@ class Resolver:
                 )
 
     def compile_algorithm(
-        self, concrete_algo: ConcreteAlgorithm, literals: Dict[str, Any] = None
+        self,
+        concrete_algo: ConcreteAlgorithm,
+        literals: Dict[str, Any] = None,
+        *,
+        args: Tuple = None,
+        kwargs: Dict[str, Any] = None,
     ) -> Callable:
+        """
+        Returns the compiled function for concrete_algo, using the compile cache.
+
+        If the call arguments are given, the literal values are taken from them and the
+        compiled function is specialized on the types and dtypes of the inputs.
+        """
         compiler_name = concrete_algo._compiler
         if compiler_name is None:
             raise CompileError(
@@ -551,8 +638,101 @@ class Resolver:
         if compiler is None:
             raise CompileError(f"Required compiler '{compiler_name}' not found")
 
-        func = compiler.compile_algorithm(concrete_algo, literals=literals)
-        return func
+        profile = ()
+        if args is not None or kwargs is not None:
+            call_literals, profile = specialize(concrete_algo, args or (), kwargs or {})
+            if literals is None:
+                literals = call_literals
+        return self.compile_cache.get_or_compile(
+            concrete_algo, compiler, literals, profile
+        )
+
+    def warmup(
+        self,
+        algos: Optional[List[str]] = None,
+        signatures: Optional[List[Union[tuple, dict]]] = None,
+        *,
+        wait: bool = False,
+    ) -> List[Future]:
+        """
+        Initialize compiler runtimes and compile concrete algorithms ahead of time on a
+        background thread pool, so the first call does not pay the compile latency.
+
+        algos: abstract algorithm names whose compiled implementations should be warmed up;
+               None means all of them
+        signatures: sample arguments, each either a tuple of positional arguments or a dict
+                    of keyword arguments.  Every compiled concrete algorithm which accepts a
+                    sample is compiled for the matching specialization (literal values and
+                    input types).  Without signatures, only the compiler runtimes are
+                    initialized.
+        wait: block until the warm-up is finished, raising the first error encountered
+
+        Returns the futures of the submitted work.
+        """
+        if algos is None:
+            algos = [
+                name
+                for name, concrete_algos in self.concrete_algorithms.items()
+                if any(ca._compiler is not None for ca in concrete_algos)
+            ]
+            compiler_names = set(self.compilers)
+        else:
+            compiler_names = set()
+
+        to_compile = []
+        for algo_name in algos:
+            if algo_name not in self.abstract_algorithms:
+                raise ValueError(
+                    f'No abstract algorithm "{algo_name}" has been registered'
+                )
+            for concrete_algo in self.concrete_algorithms.get(algo_name, ()):
+                if concrete_algo._compiler is None:
+                    continue
+                compiler_names.add(concrete_algo._compiler)
+                for sample in signatures or ():
+                    if isinstance(sample, dict):
+                        args, kwargs = (), sample
+                    else:
+                        args, kwargs = tuple(sample), {}
+                    if self._accepts_sample(concrete_algo, args, kwargs):
+                        to_compile.append((concrete_algo, args, kwargs))
+
+        executor = ThreadPoolExecutor(
+            max_workers=config.get("core.compiler.warmup.max_workers", 2),
+            thread_name_prefix="metagraph-warmup",
+        )
+        futures = [
+            executor.submit(self.compilers[name].initialize_runtime)
+            for name in sorted(compiler_names)
+            if name in self.compilers
+        ]
+        for concrete_algo, args, kwargs in to_compile:
+            futures.append(
+                executor.submit(
+                    self.compile_algorithm, concrete_algo, args=args, kwargs=kwargs
+                )
+            )
+        executor.shutdown(wait=False)
+
+        if wait:
+            for future in futures:
+                future.result()
+        return futures
+
+    @staticmethod
+    def _accepts_sample(concrete_algo: ConcreteAlgorithm, args, kwargs) -> bool:
+        sig = concrete_algo.__signature__
+        try:
+            bound = sig.bind(*args, **kwargs)
+        except TypeError:
+            return False
+        for name, value in bound.arguments.items():
+            annotation = sig.parameters[name].annotation
+            if isinstance(annotation, ConcreteType) and not type(
+                annotation
+            ).is_typeclass_of(value):
+                return False
+        return True
 
 
 class _ResolverRegistrar:
@@ -2,17 +2,33 @@
 tracks object lifetime to remove records as needed.
 """
 
-from typing import Dict, List, Iterable, Any
+from typing import Dict, List, Iterable, Any, Optional
 import weakref
 from dataclasses import dataclass
 
 
+@dataclass(frozen=True)
+class SizeEstimate:
+    """Approximate footprint of an object.
+
+    num_nodes: number of nodes (None if not applicable or unknown)
+    num_edges: number of edges as stored by the underlying representation; an undirected
+               edge stored in both directions counts twice (None if not applicable or unknown)
+    nbytes: approximate memory used by the object in bytes (None if unknown)
+    """
+
+    num_nodes: Optional[int] = None
+    num_edges: Optional[int] = None
+    nbytes: Optional[int] = None
+
+
 @dataclass
 class TypeInfo:
     abstract_typeclass: Any
     known_abstract_props: Dict[str, Any]
     concrete_typeclass: Any
     known_concrete_props: Dict[str, Any]
+    size: Optional[SizeEstimate] = None
 
     @property
     def known_props(self):
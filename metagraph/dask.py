@@ -1,5 +1,6 @@
 import metagraph as mg
 from .core.dask.resolver import DaskResolver
+from .core.dask.cache import result_cache
 
 # Wrap the default resolver as a DaskResolver
 resolver = DaskResolver(mg.resolver)
@@ -64,12 +64,14 @@ registry = metagraph.PluginRegistry("core")
 
 
 def find_plugins():
-    from . import core, graphblas, networkx, numpy, pandas, python, scipy
+    from . import core, dask, graphblas, networkx, numba, numpy, pandas, python, scipy
 
     # Default Plugins
     registry.register_from_modules(core)
+    registry.register_from_modules(dask, name="core_dask")
     registry.register_from_modules(graphblas, name="core_graphblas")
     registry.register_from_modules(networkx, name="core_networkx")
+    registry.register_from_modules(numba, name="core_numba")
     registry.register_from_modules(numpy, name="core_numpy")
     registry.register_from_modules(pandas, name="core_pandas")
     registry.register_from_modules(python, name="core_python")
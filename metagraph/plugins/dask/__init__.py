@@ -0,0 +1 @@
+from . import algorithms, translators, types
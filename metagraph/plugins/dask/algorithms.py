@@ -0,0 +1,175 @@
+from functools import partial
+import numpy as np
+from metagraph import concrete_algorithm
+from metagraph.plugins import has_scipy
+from .. import has_numba
+from typing import Any, Callable
+
+if has_numba:
+    import numba
+
+if has_scipy:
+    import scipy.sparse as ss
+    from ..numpy.types import NumpyNodeMap
+    from .types import PartitionedGraph, map_blocks, map_reduce
+
+    def _is_directed(graph):
+        return PartitionedGraph.Type.compute_abstract_properties(
+            graph, {"is_directed"}
+        )["is_directed"]
+
+    def _out_degree(block, start):
+        return np.diff(block.tocsr().indptr)
+
+    def _in_degree(block, start, num_nodes):
+        return np.bincount(block.tocoo().col, minlength=num_nodes)
+
+    def _self_loops(block, start):
+        coo = block.tocoo()
+        loops = np.zeros(block.shape[0], dtype=np.int64)
+        np.add.at(loops, coo.row[coo.row + start == coo.col], 1)
+        return loops
+
+    @concrete_algorithm("util.graph.degree")
+    def partitioned_graph_degree(
+        graph: PartitionedGraph, in_edges: bool, out_edges: bool
+    ) -> NumpyNodeMap:
+        num_nodes = len(graph.node_list)
+        degrees = np.zeros(num_nodes, dtype=np.int64)
+        if in_edges or out_edges:
+            # Rows of the blocks are disjoint, so out-degrees are concatenated and
+            # in-degrees are summed over all blocks
+            if not _is_directed(graph):
+                # Every edge is stored in both directions, except for self-loops
+                degrees += np.concatenate(
+                    map_blocks(_out_degree, graph.blocks, graph.offsets)
+                )
+                degrees += np.concatenate(
+                    map_blocks(_self_loops, graph.blocks, graph.offsets)
+                )
+            else:
+                if out_edges:
+                    degrees += np.concatenate(
+                        map_blocks(_out_degree, graph.blocks, graph.offsets)
+                    )
+                if in_edges:
+                    degrees += map_reduce(
+                        _in_degree, np.add, graph.blocks, graph.offsets, num_nodes
+                    )
+        return NumpyNodeMap(degrees, nodes=graph.node_list)
+
+    def _reduce_rows(block, start, func):
+        csr = block.tocsr()
+        keep_mask = np.diff(csr.indptr).astype(bool)
+        values = np.empty(block.shape[0], dtype=object)
+        if keep_mask.any():
+            values[keep_mask] = func.reduceat(
+                csr.data, csr.indptr[:-1][keep_mask], dtype=object
+            )
+        return values, keep_mask
+
+    def _reduce_columns(block, start, func):
+        csc = block.tocsc()
+        keep_mask = np.diff(csc.indptr).astype(bool)
+        values = np.empty(block.shape[1], dtype=object)
+        if keep_mask.any():
+            values[keep_mask] = func.reduceat(
+                csc.data, csc.indptr[:-1][keep_mask], dtype=object
+            )
+        return values, keep_mask
+
+    def _combine_reduced(left, right, func):
+        left_values, left_mask = left
+        right_values, right_mask = right
+        values = np.where(left_mask, left_values, right_values)
+        both = left_mask & right_mask
+        values[both] = func(left_values[both], right_values[both])
+        return values, left_mask | right_mask
+
+    @concrete_algorithm("util.graph.aggregate_edges")
+    def partitioned_graph_aggregate_edges(
+        graph: PartitionedGraph,
+        func: Callable[[Any, Any], Any],
+        initial_value: Any,
+        in_edges: bool,
+        out_edges: bool,
+    ) -> NumpyNodeMap:
+        if (in_edges or out_edges) and not _is_directed(graph):
+            in_edges = True
+            out_edges = False
+        if not isinstance(func, np.ufunc):
+            func = np.frompyfunc(func, 2, 1)
+        agg_values = np.full(len(graph.node_list), initial_value)
+        if in_edges:
+            # Partial reductions of each column are combined in block order
+            values, keep_mask = map_reduce(
+                _reduce_columns,
+                partial(_combine_reduced, func=func),
+                graph.blocks,
+                graph.offsets,
+                func,
+            )
+            agg_values[keep_mask] = func(agg_values[keep_mask], values[keep_mask])
+        if out_edges:
+            reduced = map_blocks(_reduce_rows, graph.blocks, graph.offsets, func)
+            values = np.concatenate([values for values, _ in reduced])
+            keep_mask = np.concatenate([mask for _, mask in reduced])
+            agg_values[keep_mask] = func(agg_values[keep_mask], values[keep_mask])
+        return NumpyNodeMap(agg_values, nodes=graph.node_list)
+
+    def _filter_block(block, start, func):
+        coo = block.tocoo(copy=True)
+        to_keep_mask = func(coo.data)
+        if not to_keep_mask.all():
+            coo.row = coo.row[to_keep_mask]
+            coo.col = coo.col[to_keep_mask]
+            coo.data = coo.data[to_keep_mask]
+        return coo.tocsr()
+
+    @concrete_algorithm("util.graph.filter_edges")
+    def partitioned_graph_filter_edges(
+        graph: PartitionedGraph, func: Callable[[Any], bool]
+    ) -> PartitionedGraph:
+        func_vectorized = numba.vectorize(func) if has_numba else np.vectorize(func)
+        blocks = map_blocks(_filter_block, graph.blocks, graph.offsets, func_vectorized)
+        return PartitionedGraph(blocks, graph.node_list, graph.node_vals)
+
+    def _representatives(labels):
+        # Smallest node position of the component of each node
+        reps = np.full(labels.max() + 1, len(labels))
+        np.minimum.at(reps, labels, np.arange(len(labels)))
+        return reps[labels]
+
+    def _block_components(block, start):
+        coo = block.tocoo()
+        num_nodes = block.shape[1]
+        matrix = ss.coo_matrix(
+            (np.ones(coo.nnz, dtype=bool), (coo.row + start, coo.col)),
+            shape=(num_nodes, num_nodes),
+        )
+        _, labels = ss.csgraph.connected_components(matrix, directed=False)
+        return _representatives(labels)
+
+    def _merge_components(left, right):
+        # Nodes are connected to their representatives from both sides
+        num_nodes = len(left)
+        nodes = np.arange(num_nodes)
+        matrix = ss.coo_matrix(
+            (
+                np.ones(2 * num_nodes, dtype=bool),
+                (np.concatenate([nodes, nodes]), np.concatenate([left, right])),
+            ),
+            shape=(num_nodes, num_nodes),
+        )
+        _, labels = ss.csgraph.connected_components(matrix, directed=False)
+        return _representatives(labels)
+
+    @concrete_algorithm("clustering.connected_components")
+    def partitioned_connected_components(graph: PartitionedGraph) -> NumpyNodeMap:
+        if len(graph.node_list) == 0:
+            return NumpyNodeMap(np.array([], dtype=np.int64), nodes=graph.node_list)
+        reps = map_reduce(
+            _block_components, _merge_components, graph.blocks, graph.offsets
+        )
+        _, labels = np.unique(reps, return_inverse=True)
+        return NumpyNodeMap(labels, nodes=graph.node_list)
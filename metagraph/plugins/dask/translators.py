@@ -0,0 +1,159 @@
+import uuid
+from metagraph import translator
+from metagraph.plugins import has_scipy, has_grblas, has_pandas
+import numpy as np
+
+if has_scipy:
+    import scipy.sparse as ss
+    from ..scipy.types import ScipyEdgeMap, ScipyGraph
+    from .types import (
+        PartitionedEdgeMap,
+        PartitionedGraph,
+        default_npartitions,
+        map_blocks,
+        partition_matrix,
+        partition_offsets,
+        _compute,
+    )
+
+    def _known_aprops(x):
+        return dict(type(x).Type.get_typeinfo(x).known_abstract_props)
+
+    def _csr_block(rows, start, indptr, indices, data, ncols):
+        first, last = indptr[rows.start], indptr[rows.stop]
+        return ss.csr_matrix(
+            (
+                data[first:last],
+                indices[first:last],
+                indptr[rows.start : rows.stop + 1] - first,
+            ),
+            shape=(rows.stop - rows.start, ncols),
+        )
+
+    def blocks_from_csr(indptr, indices, data, offsets):
+        """
+        Splits CSR arrays into blocks at the row offsets. The blocks are views of the
+        arrays, so they must not be shared with the caller.
+        """
+        rows = [slice(start, stop) for start, stop in zip(offsets[:-1], offsets[1:])]
+        return map_blocks(
+            _csr_block, rows, offsets, indptr, indices, data, len(indptr) - 1
+        )
+
+    @translator
+    def edgemap_from_scipy(x: ScipyEdgeMap, **props) -> PartitionedEdgeMap:
+        return PartitionedEdgeMap(
+            partition_matrix(x.value), x.node_list, aprops=_known_aprops(x)
+        )
+
+    @translator
+    def graph_from_scipy(x: ScipyGraph, **props) -> PartitionedGraph:
+        return PartitionedGraph(
+            partition_matrix(x.value),
+            x.node_list,
+            x.node_vals,
+            aprops=_known_aprops(x),
+        )
+
+
+if has_scipy and has_grblas:
+    from ..graphblas.types import GrblasGraph, dtype_grblas_to_mg
+
+    @translator
+    def graph_from_graphblas(x: GrblasGraph, **props) -> PartitionedGraph:
+        aprops = GrblasGraph.Type.compute_abstract_properties(
+            x, {"node_type", "edge_type"}
+        )
+        node_list, node_vals = x.nodes.to_values()
+        if aprops["node_type"] == "set":
+            node_vals = None
+        size = len(node_list)
+
+        compressed = x.value[node_list, node_list].new()
+        rows, cols, vals = compressed.to_values()
+        if aprops["edge_type"] == "set":
+            vals = np.ones_like(vals, dtype=bool)
+        else:
+            vals = vals.astype(dtype_grblas_to_mg[x.value.dtype.name], copy=False)
+        if not (rows[:-1] <= rows[1:]).all():
+            order = np.argsort(rows, kind="stable")
+            rows, cols, vals = rows[order], cols[order], vals[order]
+        indptr = np.searchsorted(rows, np.arange(size + 1))
+
+        offsets = partition_offsets(indptr, default_npartitions())
+        blocks = blocks_from_csr(indptr, cols, vals, offsets)
+        return PartitionedGraph(blocks, node_list, node_vals, aprops=_known_aprops(x))
+
+
+if has_scipy and has_pandas:
+    import pandas as pd
+    from ..pandas.types import PandasEdgeMap
+
+    def _split_edges(chunk, labels, is_directed, node_list, offsets):
+        """Positions of the edges in chunk, grouped by the partition of their source node"""
+        src_label, dst_label, weight_label = labels
+        rows = np.searchsorted(node_list, chunk[src_label].values)
+        cols = np.searchsorted(node_list, chunk[dst_label].values)
+        vals = chunk[weight_label].values
+        if not is_directed:
+            nonself = rows != cols
+            rows, cols = (
+                np.concatenate([rows, cols[nonself]]),
+                np.concatenate([cols, rows[nonself]]),
+            )
+            vals = np.concatenate([vals, vals[nonself]])
+        partition = np.searchsorted(offsets, rows, side="right") - 1
+        order = np.argsort(partition, kind="stable")
+        bounds = np.searchsorted(partition[order], np.arange(len(offsets)))
+        return [
+            (rows[order[a:b]], cols[order[a:b]], vals[order[a:b]])
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+
+    def _build_block(pieces, index, offsets, num_nodes):
+        start, stop = offsets[index], offsets[index + 1]
+        rows = np.concatenate([p[index][0] for p in pieces]) - start
+        cols = np.concatenate([p[index][1] for p in pieces])
+        vals = np.concatenate([p[index][2] for p in pieces])
+        return ss.coo_matrix(
+            (vals, (rows, cols)), shape=(stop - start, num_nodes)
+        ).tocsr()
+
+    @translator
+    def edgemap_from_pandas(x: PandasEdgeMap, **props) -> PartitionedEdgeMap:
+        df = x.value
+        node_list = pd.unique(
+            np.concatenate([df[x.src_label].values, df[x.dst_label].values])
+        )
+        node_list.sort()
+        num_nodes = len(node_list)
+        npartitions = default_npartitions()
+        offsets = np.unique(np.linspace(0, num_nodes, npartitions + 1).astype(np.int64))
+        if len(offsets) == 1:
+            offsets = np.zeros(2, dtype=np.int64)
+
+        # Each chunk of rows is split by source partition, then every partition is
+        # built from its pieces of all chunks
+        name = f"edgemap_from_pandas-{uuid.uuid4().hex}"
+        bounds = np.linspace(0, len(df), npartitions + 1).astype(np.int64)
+        labels = [x.src_label, x.dst_label, x.weight_label]
+        dsk = {
+            (name, "split", i): (
+                _split_edges,
+                df.iloc[a:b],
+                labels,
+                x.is_directed,
+                node_list,
+                offsets,
+            )
+            for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:]))
+        }
+        pieces = list(dsk)
+        keys = []
+        for index in range(len(offsets) - 1):
+            dsk[(name, index)] = (_build_block, pieces, index, offsets, num_nodes)
+            keys.append((name, index))
+        blocks = _compute(dsk, keys)
+        return PartitionedEdgeMap(
+            blocks, node_list, aprops={"is_directed": x.is_directed}
+        )
@@ -0,0 +1,340 @@
+import uuid
+from typing import Set, Dict, Any
+from metagraph import config, dtypes
+from metagraph.core.typecache import SizeEstimate
+from ..core.types import EdgeMap, Graph
+from ..core.wrappers import EdgeMapWrapper, GraphWrapper
+from .. import has_scipy
+import numpy as np
+
+
+def default_npartitions() -> int:
+    """Number of partitions built by translators (`core.dask.npartitions` or the CPU count)"""
+    from dask.system import CPU_COUNT
+
+    return config.get("core.dask.npartitions", None) or CPU_COUNT
+
+
+def _compute(dsk, keys):
+    from metagraph.core.dask.scheduler import default_get
+
+    return default_get(dsk, keys)
+
+
+def map_blocks(func, blocks, offsets, *args):
+    """
+    Computes func(block, start, *args) for every block in parallel, where start is the
+    position of the first row of the block. Returns the results in block order.
+    """
+    name = f"{getattr(func, '__name__', 'block')}-{uuid.uuid4().hex}"
+    dsk = {
+        (name, i): (func, block, int(start)) + args
+        for i, (block, start) in enumerate(zip(blocks, offsets))
+    }
+    return _compute(dsk, list(dsk))
+
+
+def map_reduce(func, combine, blocks, offsets, *args):
+    """
+    Computes func(block, start, *args) for every block in parallel and merges the results
+    with combine(left, right) as a tree of tasks, preserving block order.
+    """
+    name = f"{getattr(func, '__name__', 'block')}-{uuid.uuid4().hex}"
+    dsk = {}
+    keys = []
+    for i, (block, start) in enumerate(zip(blocks, offsets)):
+        dsk[(name, 0, i)] = (func, block, int(start)) + args
+        keys.append((name, 0, i))
+    level = 0
+    while len(keys) > 1:
+        level += 1
+        merged = []
+        for i in range(0, len(keys) - 1, 2):
+            key = (name, level, i // 2)
+            dsk[key] = (combine, keys[i], keys[i + 1])
+            merged.append(key)
+        if len(keys) % 2:
+            merged.append(keys[-1])
+        keys = merged
+    return _compute(dsk, keys[0])
+
+
+if has_scipy:
+    import scipy.sparse as ss
+    from ..scipy.types import (
+        ScipyEdgeMap,
+        ScipyGraph,
+        _is_directed,
+        _sparse_nbytes,
+    )
+
+    def partition_offsets(indptr, npartitions: int) -> np.ndarray:
+        """
+        Row boundaries splitting a CSR matrix into at most npartitions blocks with
+        roughly equal numbers of entries
+        """
+        nrows = len(indptr) - 1
+        if nrows == 0:
+            return np.zeros(2, dtype=np.int64)
+        targets = np.linspace(0, indptr[-1], npartitions + 1)[1:-1]
+        inner = np.searchsorted(indptr, targets)
+        # Use the closer of the row boundaries around each target
+        lower = np.maximum(inner - 1, 0)
+        closer = targets - indptr[lower] < indptr[inner] - targets
+        inner[closer] = lower[closer]
+        return np.unique(np.concatenate([[0], inner, [nrows]]).astype(np.int64))
+
+    def _slice_rows(rows, start, matrix):
+        return matrix[rows]
+
+    def partition_matrix(matrix, npartitions=None):
+        """Splits a square scipy.sparse matrix into CSR blocks of consecutive rows"""
+        if npartitions is None:
+            npartitions = default_npartitions()
+        matrix = matrix.tocsr()
+        offsets = partition_offsets(matrix.indptr, npartitions)
+        rows = [slice(start, stop) for start, stop in zip(offsets[:-1], offsets[1:])]
+        return map_blocks(_slice_rows, rows, offsets, matrix)
+
+    def _block_tocsr(block, start):
+        return block.tocsr()
+
+    def assemble_blocks(blocks, offsets) -> ss.csr_matrix:
+        """Stacks the blocks back into a single CSR matrix"""
+        return ss.vstack(map_blocks(_block_tocsr, blocks, offsets), format="csr")
+
+    def _block_min(block, start):
+        return block.data.min() if block.nnz else None
+
+    def _compute_partitioned_edge_properties(
+        obj, props: Set[str], known_props: Dict[str, Any], *, is_edgemap: bool
+    ) -> Dict[str, Any]:
+        ret = known_props.copy()
+        if is_edgemap and "dtype" not in ret:
+            ret["dtype"] = dtypes.dtypes_simplified[obj.blocks[0].dtype]
+
+        slow_props = props - ret.keys()
+        if "has_negative_weights" in slow_props:
+            if ret["dtype"] in {"bool", "str"}:
+                ret["has_negative_weights"] = None
+            else:
+                mins = [
+                    m
+                    for m in map_blocks(_block_min, obj.blocks, obj.offsets)
+                    if m is not None
+                ]
+                ret["has_negative_weights"] = bool(mins and min(mins) < 0)
+        if "is_directed" in slow_props:
+            ret["is_directed"] = _is_directed(
+                assemble_blocks(obj.blocks, obj.offsets), check_values=is_edgemap
+            )
+        return ret
+
+    def _partitioned_nbytes(obj):
+        return sum(_sparse_nbytes(block) for block in obj.blocks) + obj.node_list.nbytes
+
+    def _check_blocks(wrapper, blocks, node_list):
+        wrapper._assert_instance(blocks, (list, tuple))
+        wrapper._assert(len(blocks) > 0, "at least one block is required")
+        for block in blocks:
+            wrapper._assert_instance(block, ss.spmatrix)
+        ncols = blocks[0].shape[1]
+        wrapper._assert(
+            all(block.shape[1] == ncols for block in blocks),
+            "all blocks must have the same number of columns",
+        )
+        nrows = sum(block.shape[0] for block in blocks)
+        wrapper._assert(
+            nrows == ncols, f"adjacency matrix must be square, not {nrows}x{ncols}"
+        )
+        if node_list is None:
+            node_list = np.arange(nrows)
+        else:
+            wrapper._assert_instance(node_list, (np.ndarray, list, tuple))
+            if not isinstance(node_list, np.ndarray):
+                node_list = np.array(node_list)
+        wrapper._assert(
+            nrows == len(node_list),
+            f"node list size ({len(node_list)}) and data matrix size ({nrows}) don't match.",
+        )
+        offsets = np.cumsum([0] + [block.shape[0] for block in blocks])
+        return list(blocks), node_list, offsets
+
+    class PartitionedEdgeMap(EdgeMapWrapper, abstract=EdgeMap):
+        """
+        Adjacency matrix split by source node into blocks which are processed in parallel.
+        Block i holds the rows offsets[i]:offsets[i+1] of the full matrix as a scipy.sparse
+        matrix with one column per node.
+        If nodes are not sequential, a node_list must be provided to map the matrix index to NodeId.
+        """
+
+        def __init__(self, blocks, node_list=None, *, aprops=None):
+            super().__init__(aprops=aprops)
+            self.blocks, self.node_list, self.offsets = _check_blocks(
+                self, blocks, node_list
+            )
+
+        @property
+        def npartitions(self):
+            return len(self.blocks)
+
+        class TypeMixin:
+            @classmethod
+            def _compute_abstract_properties(
+                cls, obj, props: Set[str], known_props: Dict[str, Any]
+            ) -> Dict[str, Any]:
+                return _compute_partitioned_edge_properties(
+                    obj, props, known_props, is_edgemap=True
+                )
+
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                return SizeEstimate(
+                    num_nodes=len(obj.node_list),
+                    num_edges=sum(block.nnz for block in obj.blocks),
+                    nbytes=_partitioned_nbytes(obj),
+                )
+
+            @classmethod
+            def assert_equal(
+                cls,
+                obj1,
+                obj2,
+                aprops1,
+                aprops2,
+                cprops1,
+                cprops2,
+                *,
+                rel_tol=1e-9,
+                abs_tol=0.0,
+            ):
+                ScipyEdgeMap.Type.assert_equal(
+                    ScipyEdgeMap(
+                        assemble_blocks(obj1.blocks, obj1.offsets), obj1.node_list
+                    ),
+                    ScipyEdgeMap(
+                        assemble_blocks(obj2.blocks, obj2.offsets), obj2.node_list
+                    ),
+                    aprops1,
+                    aprops2,
+                    cprops1,
+                    cprops2,
+                    rel_tol=rel_tol,
+                    abs_tol=abs_tol,
+                )
+
+    class PartitionedGraph(GraphWrapper, abstract=Graph):
+        """
+        Graph whose adjacency matrix is split by source node into blocks which are processed
+        in parallel (see PartitionedEdgeMap). Boolean blocks indicate an edge set.
+        node_vals (if populated) contains node weights
+        """
+
+        def __init__(self, blocks, node_list=None, node_vals=None, *, aprops=None):
+            super().__init__(aprops=aprops)
+            self.blocks, self.node_list, self.offsets = _check_blocks(
+                self, blocks, node_list
+            )
+            if node_vals is not None:
+                self._assert_instance(node_vals, (np.ndarray, list, tuple))
+                if not isinstance(node_vals, np.ndarray):
+                    node_vals = np.array(node_vals)
+                self._assert(
+                    len(self.node_list) == len(node_vals),
+                    f"node vals size ({len(node_vals)}) and node list size ({len(self.node_list)}) don't match",
+                )
+            self.node_vals = node_vals
+
+        @property
+        def npartitions(self):
+            return len(self.blocks)
+
+        class TypeMixin:
+            _edge_prop_map = ScipyGraph.Type._edge_prop_map
+
+            @classmethod
+            def _compute_abstract_properties(
+                cls, obj, props: Set[str], known_props: Dict[str, Any]
+            ) -> Dict[str, Any]:
+                ret = known_props.copy()
+
+                # fast properties
+                for prop in {"node_type", "edge_type"} - ret.keys():
+                    if prop == "node_type":
+                        ret[prop] = "set" if obj.node_vals is None else "map"
+                    elif prop == "edge_type":
+                        ret[prop] = "set" if obj.blocks[0].dtype == bool else "map"
+
+                if ret["edge_type"] == "set":
+                    ret["edge_dtype"] = None
+                    ret["edge_has_negative_weights"] = None
+                edge_props = {
+                    cls._edge_prop_map[p] for p in props if p in cls._edge_prop_map
+                }
+                known_edge_props = {
+                    cls._edge_prop_map[p]: v
+                    for p, v in ret.items()
+                    if p in cls._edge_prop_map
+                }
+                edge_computed_props = _compute_partitioned_edge_properties(
+                    obj,
+                    edge_props,
+                    known_edge_props,
+                    is_edgemap=ret["edge_type"] == "map",
+                )
+                ret.update(
+                    {cls._edge_prop_map[p]: v for p, v in edge_computed_props.items()}
+                )
+
+                # slow properties, only compute if asked
+                for prop in props - ret.keys():
+                    if prop == "node_dtype":
+                        if ret["node_type"] == "set":
+                            ret[prop] = None
+                        else:
+                            ret[prop] = dtypes.dtypes_simplified[obj.node_vals.dtype]
+
+                return ret
+
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                nbytes = _partitioned_nbytes(obj)
+                if obj.node_vals is not None:
+                    nbytes += obj.node_vals.nbytes
+                return SizeEstimate(
+                    num_nodes=len(obj.node_list),
+                    num_edges=sum(block.nnz for block in obj.blocks),
+                    nbytes=nbytes,
+                )
+
+            @classmethod
+            def assert_equal(
+                cls,
+                obj1,
+                obj2,
+                aprops1,
+                aprops2,
+                cprops1,
+                cprops2,
+                *,
+                rel_tol=1e-9,
+                abs_tol=0.0,
+            ):
+                ScipyGraph.Type.assert_equal(
+                    ScipyGraph(
+                        assemble_blocks(obj1.blocks, obj1.offsets),
+                        obj1.node_list,
+                        obj1.node_vals,
+                    ),
+                    ScipyGraph(
+                        assemble_blocks(obj2.blocks, obj2.offsets),
+                        obj2.node_list,
+                        obj2.node_vals,
+                    ),
+                    aprops1,
+                    aprops2,
+                    cprops1,
+                    cprops2,
+                    rel_tol=rel_tol,
+                    abs_tol=abs_tol,
+                )
@@ -1,7 +1,15 @@
 import numpy as np
 from metagraph import translator
 from metagraph.plugins import has_grblas, has_scipy
-from ..numpy.types import NumpyVectorType, NumpyNodeMap, NumpyNodeSet, NumpyMatrixType
+from ..numpy.types import (
+    NumpyVectorType,
+    NumpyNodeMap,
+    NumpyNodeSet,
+    NumpyMatrixType,
+    NumpyEdgeSet,
+    NumpyEdgeMap,
+    NumpyGraph,
+)
 from ..python.types import PythonNodeSetType
 
 
@@ -77,41 +85,132 @@ if has_grblas:
         )
         return vec
 
+    def _matrix_from_edges(src, dst, weights, is_directed, size, dtype):
+        if not is_directed:
+            nonself = src != dst
+            src, dst = (
+                np.concatenate([src, dst[nonself]]),
+                np.concatenate([dst, src[nonself]]),
+            )
+            weights = np.concatenate([weights, weights[nonself]])
+        return grblas.Matrix.from_values(
+            src, dst, weights, nrows=size, ncols=size, dtype=dtype
+        )
+
+    def _num_node_ids(*arrays):
+        return max((int(arr.max()) + 1 for arr in arrays if len(arr) > 0), default=0)
+
+    @translator
+    def edgeset_from_numpy(x: NumpyEdgeSet, **props) -> GrblasEdgeSet:
+        size = _num_node_ids(x.src, x.dst)
+        ones = np.ones(len(x.src), dtype=bool)
+        matrix = _matrix_from_edges(x.src, x.dst, ones, x.is_directed, size, bool)
+        return GrblasEdgeSet(matrix, aprops={"is_directed": x.is_directed})
+
+    @translator
+    def edgemap_from_numpy(x: NumpyEdgeMap, **props) -> GrblasEdgeMap:
+        size = _num_node_ids(x.src, x.dst)
+        dtype = dtype_mg_to_grblas[x.weights.dtype]
+        matrix = _matrix_from_edges(x.src, x.dst, x.weights, x.is_directed, size, dtype)
+        return GrblasEdgeMap(matrix, aprops={"is_directed": x.is_directed})
+
+    @translator
+    def graph_from_numpy(x: NumpyGraph, **props) -> GrblasGraph:
+        aprops = NumpyGraph.Type.compute_abstract_properties(
+            x, {"is_directed", "node_type", "edge_type"}
+        )
+        size = _num_node_ids(x.node_list)
+        if x.node_vals is not None:
+            dtype = dtype_mg_to_grblas[x.node_vals.dtype]
+            nodes = grblas.Vector.from_values(
+                x.node_list, x.node_vals, size=size, dtype=dtype
+            )
+        else:
+            node_vals = np.ones_like(x.node_list, dtype=bool)
+            nodes = grblas.Vector.from_values(
+                x.node_list, node_vals, size=size, dtype=bool
+            )
+        if x.weights is not None:
+            weights = x.weights
+            dtype = dtype_mg_to_grblas[weights.dtype]
+        else:
+            weights = np.ones(len(x.src), dtype=bool)
+            dtype = bool
+        matrix = _matrix_from_edges(x.src, x.dst, weights, x.is_directed, size, dtype)
+        return GrblasGraph(matrix, nodes=nodes, aprops=aprops)
+
 
 if has_grblas and has_scipy:
     from ..scipy.types import ScipyEdgeSet, ScipyEdgeMap, ScipyGraph
     from .types import dtype_mg_to_grblas
 
-    @translator
-    def edgeset_from_scipy(x: ScipyEdgeSet, **props) -> GrblasEdgeSet:
-        aprops = ScipyEdgeSet.Type.compute_abstract_properties(x, {"is_directed"})
-        m = x.value.tocoo()
-        node_list = x.node_list
-        size = max(node_list) + 1
-        out = grblas.Matrix.from_values(
-            node_list[m.row],
-            node_list[m.col],
-            np.ones_like(m.data),
+    def _matrix_from_scipy(matrix, node_list, size, dtype, *, is_set=False):
+        """
+        grblas.Matrix of size x size holding the entries of a scipy.sparse matrix at the
+        rows and columns given by node_list. CSR buffers are imported into SuiteSparse
+        directly when node_list is sorted.
+        """
+        csr = matrix.tocsr()
+        is_own = csr is not matrix
+        if not csr.has_canonical_format:
+            if not is_own:
+                csr = csr.copy()
+                is_own = True
+            csr.sum_duplicates()
+        if is_set:
+            values = np.ones(csr.nnz, dtype=bool)
+        else:
+            # SuiteSparse takes ownership of the values, so they must not be shared
+            values = csr.data if is_own else csr.data.copy()
+
+        nrows = len(node_list)
+        if nrows > 1 and not (node_list[1:] > node_list[:-1]).all():
+            coo = csr.tocoo()
+            return grblas.Matrix.from_values(
+                node_list[coo.row],
+                node_list[coo.col],
+                values,
+                nrows=size,
+                ncols=size,
+                dtype=dtype,
+            )
+        if nrows == size:
+            # node_list is 0..size-1, so the matrix layout is already correct
+            indptr = csr.indptr
+            indices = csr.indices
+        else:
+            # Sorted NodeIds keep the column indices sorted within each row
+            counts = np.zeros(size, dtype=np.uint64)
+            counts[node_list] = np.diff(csr.indptr)
+            indptr = np.zeros(size + 1, dtype=np.uint64)
+            np.cumsum(counts, out=indptr[1:])
+            indices = node_list.astype(np.uint64)[csr.indices]
+        # SuiteSparse takes ownership of uint64 index arrays, which are never scipy's own
+        # (scipy indices are int32 or int64 and get converted)
+        return grblas.Matrix.ss.import_csr(
             nrows=size,
             ncols=size,
+            indptr=indptr,
+            col_indices=indices,
+            values=values,
+            dtype=dtype,
+            sorted_index=True,
+            take_ownership=True,
         )
+
+    @translator
+    def edgeset_from_scipy(x: ScipyEdgeSet, **props) -> GrblasEdgeSet:
+        aprops = ScipyEdgeSet.Type.compute_abstract_properties(x, {"is_directed"})
+        size = int(x.node_list.max()) + 1
+        out = _matrix_from_scipy(x.value, x.node_list, size, bool, is_set=True)
         return GrblasEdgeSet(out, aprops=aprops)
 
     @translator
     def edgemap_from_scipy(x: ScipyEdgeMap, **props) -> GrblasEdgeMap:
         aprops = ScipyEdgeMap.Type.compute_abstract_properties(x, {"is_directed"})
-        m = x.value.tocoo()
-        node_list = x.node_list
-        size = max(node_list) + 1
+        size = int(x.node_list.max()) + 1
         dtype = dtype_mg_to_grblas[x.value.dtype]
-        out = grblas.Matrix.from_values(
-            node_list[m.row],
-            node_list[m.col],
-            m.data,
-            nrows=size,
-            ncols=size,
-            dtype=dtype,
-        )
+        out = _matrix_from_scipy(x.value, x.node_list, size, dtype)
         return GrblasEdgeMap(out, aprops=aprops)
 
     @translator
@@ -135,21 +234,50 @@ if has_grblas and has_scipy:
         else:  # pragma: no cover
             raise TypeError(f"Cannot translate with node_type={aprops['node_type']}")
 
-        edges = x.value.tocoo()
-        rows = x.node_list[edges.row]
-        cols = x.node_list[edges.col]
-
         if aprops["edge_type"] == "map":
-            dtype = dtype_mg_to_grblas[edges.data.dtype]
-            matrix = grblas.Matrix.from_values(
-                rows, cols, edges.data, nrows=size, ncols=size, dtype=dtype
-            )
+            dtype = dtype_mg_to_grblas[x.value.dtype]
+            matrix = _matrix_from_scipy(x.value, x.node_list, size, dtype)
         elif aprops["edge_type"] == "set":
-            node_vals = np.ones_like(rows, dtype=bool)
-            matrix = grblas.Matrix.from_values(
-                rows, cols, node_vals, nrows=size, ncols=size, dtype=bool
-            )
+            matrix = _matrix_from_scipy(x.value, x.node_list, size, bool, is_set=True)
         else:  # pragma: no cover
             raise TypeError(f"Cannot translate with edge_type={aprops['edge_type']}")
 
         return GrblasGraph(matrix, nodes=nodes, aprops=aprops)
+
+
+if has_grblas and has_scipy:
+    from ..dask.types import PartitionedGraph, map_blocks
+
+    def _global_edges(block, start, node_list):
+        coo = block.tocoo()
+        return node_list[coo.row + start], node_list[coo.col], coo.data
+
+    @translator
+    def graph_from_partitioned(x: PartitionedGraph, **props) -> GrblasGraph:
+        aprops = PartitionedGraph.Type.compute_abstract_properties(
+            x, {"node_type", "edge_type"}
+        )
+        size = int(x.node_list.max()) + 1 if len(x.node_list) else 0
+
+        if aprops["node_type"] == "map":
+            dtype = dtype_mg_to_grblas[x.node_vals.dtype]
+            nodes = grblas.Vector.from_values(
+                x.node_list, x.node_vals, size=size, dtype=dtype
+            )
+        else:
+            node_vals = np.ones_like(x.node_list, dtype=bool)
+            nodes = grblas.Vector.from_values(
+                x.node_list, node_vals, size=size, dtype=bool
+            )
+
+        # Map positions to NodeIds for each block in parallel
+        edges = map_blocks(_global_edges, x.blocks, x.offsets, x.node_list)
+        rows = np.concatenate([r for r, _, _ in edges])
+        cols = np.concatenate([c for _, c, _ in edges])
+        vals = np.concatenate([v for _, _, v in edges])
+        dtype = dtype_mg_to_grblas[vals.dtype]
+        matrix = grblas.Matrix.from_values(
+            rows, cols, vals, nrows=size, ncols=size, dtype=dtype
+        )
+        aprops = dict(PartitionedGraph.Type.get_typeinfo(x).known_abstract_props)
+        return GrblasGraph(matrix, nodes=nodes, aprops=aprops)
@@ -1,4 +1,5 @@
 from metagraph import ConcreteType, dtypes
+from metagraph.core.typecache import SizeEstimate
 from ..core.types import Vector, Matrix, NodeSet, NodeMap, EdgeSet, EdgeMap, Graph
 from ..core.wrappers import (
     NodeSetWrapper,
@@ -10,6 +11,7 @@ from ..core.wrappers import (
 from .. import has_grblas
 
 from typing import Set, Dict, Any
+import numpy as np
 
 
 if has_grblas:
@@ -31,6 +33,17 @@ if has_grblas:
 
     dtype_grblas_to_mg = {v.name: k for k, v in dtype_mg_to_grblas.items()}
 
+    def _grblas_nbytes(obj):
+        """
+        Approximate bytes used to store a grblas.Vector or grblas.Matrix.
+        Assumes compressed storage with 64-bit indices (plus row pointers for a Matrix).
+        """
+        itemsize = np.dtype(obj.dtype.np_type).itemsize
+        nbytes = obj.nvals * (itemsize + 8)
+        if isinstance(obj, grblas.Matrix):
+            nbytes += (obj.nrows + 1) * 8
+        return nbytes
+
     class GrblasVectorType(ConcreteType, abstract=Vector):
         value_type = grblas.Vector
 
@@ -49,6 +62,10 @@ if has_grblas:
 
             return ret
 
+        @classmethod
+        def _estimate_size(cls, obj) -> SizeEstimate:
+            return SizeEstimate(nbytes=_grblas_nbytes(obj))
+
         @classmethod
         def assert_equal(
             cls,
@@ -83,6 +100,14 @@ if has_grblas:
             return 0 <= key < self.value.size and self.value[key].value is not None
 
         class TypeMixin:
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                return SizeEstimate(
+                    num_nodes=obj.value.nvals,
+                    num_edges=0,
+                    nbytes=_grblas_nbytes(obj.value),
+                )
+
             @classmethod
             def assert_equal(
                 cls,
@@ -138,6 +163,14 @@ if has_grblas:
 
                 return ret
 
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                return SizeEstimate(
+                    num_nodes=obj.value.nvals,
+                    num_edges=0,
+                    nbytes=_grblas_nbytes(obj.value),
+                )
+
             @classmethod
             def assert_equal(
                 cls,
@@ -183,6 +216,10 @@ if has_grblas:
 
             return ret
 
+        @classmethod
+        def _estimate_size(cls, obj) -> SizeEstimate:
+            return SizeEstimate(nbytes=_grblas_nbytes(obj))
+
         @classmethod
         def assert_equal(
             cls,
@@ -215,6 +252,128 @@ if has_grblas:
         idx, _ = v.to_values()
         return idx
 
+    def _is_directed(matrix, check_values=True):
+        """
+        Determines whether a square adjacency matrix is asymmetric.
+        The transpose is used directly in the comparison rather than being materialized.
+        When `check_values` is False, only the structure is compared.
+        """
+        if matrix.nvals == 0:
+            return False
+        if check_values:
+            return not matrix.isequal(matrix.T)
+        overlap = matrix.ewise_mult(matrix.T, grblas.binary.pair).new()
+        return overlap.nvals != matrix.nvals
+
+    def _triangle(matrix, *, lower: bool):
+        rows, cols, vals = matrix.to_values()
+        keep = rows > cols if lower else rows < cols
+        return grblas.Matrix.from_values(
+            rows[keep],
+            cols[keep],
+            vals[keep],
+            nrows=matrix.nrows,
+            ncols=matrix.ncols,
+            dtype=matrix.dtype,
+        )
+
+    class _DerivedStructures:
+        """
+        Structures derived from an adjacency matrix which are needed by several algorithms.
+        Each one is computed on first use and kept until the wrapper holds a different
+        matrix, so chained algorithms on one graph reuse them. Matrices must not be modified
+        in place after they are wrapped.
+        """
+
+        def __init__(self, matrix):
+            self.matrix = matrix
+            self._cache = {}
+
+        def _get(self, key, compute):
+            if key not in self._cache:
+                self._cache[key] = compute()
+            return self._cache[key]
+
+        @property
+        def transpose(self) -> grblas.Matrix:
+            return self._get("transpose", lambda: self.matrix.T.new())
+
+        @property
+        def out_degrees(self) -> grblas.Vector:
+            """Number of stored entries in each row (rows without entries are missing)"""
+            return self._get("out_degrees", lambda: self._structure.reduce_rows().new())
+
+        @property
+        def in_degrees(self) -> grblas.Vector:
+            """Number of stored entries in each column (columns without entries are missing)"""
+            return self._get(
+                "in_degrees", lambda: self._structure.reduce_columns().new()
+            )
+
+        @property
+        def lower(self) -> grblas.Matrix:
+            """Strictly lower triangle"""
+            return self._get("lower", lambda: _triangle(self.matrix, lower=True))
+
+        @property
+        def upper(self) -> grblas.Matrix:
+            """Strictly upper triangle"""
+            return self._get("upper", lambda: _triangle(self.matrix, lower=False))
+
+        def is_symmetric(self, check_values=True) -> bool:
+            return self._get(
+                ("is_symmetric", check_values),
+                lambda: not _is_directed(self.matrix, check_values=check_values),
+            )
+
+        @property
+        def _structure(self) -> grblas.Matrix:
+            return self.matrix.apply(grblas.unary.one[grblas.dtypes.UINT64]).new()
+
+    def _derived(wrapper) -> _DerivedStructures:
+        derived = getattr(wrapper, "_derived", None)
+        if derived is None or derived.matrix is not wrapper.value:
+            derived = wrapper._derived = _DerivedStructures(wrapper.value)
+        return derived
+
+    def _compute_edge_properties(
+        matrix,
+        props: Set[str],
+        known_props: Dict[str, Any],
+        *,
+        is_edgemap: bool,
+        derived: _DerivedStructures = None,
+    ) -> Dict[str, Any]:
+        """
+        Computes all requested EdgeSet/EdgeMap properties directly from the matrix,
+        ordered from cheapest to most expensive.
+        Symmetry is shared with the derived structures of the wrapper, if given.
+        """
+        ret = known_props.copy()
+
+        # fast properties
+        if is_edgemap and "dtype" not in ret:
+            ret["dtype"] = dtypes.dtypes_simplified[
+                dtype_grblas_to_mg[matrix.dtype.name]
+            ]
+
+        # slow properties, only compute if asked
+        slow_props = props - ret.keys()
+        if "has_negative_weights" in slow_props:
+            if ret["dtype"] in {"bool", "str"}:
+                neg_weights = None
+            else:
+                min_val = matrix.reduce_scalar(grblas.monoid.min).new().value
+                neg_weights = min_val is not None and min_val < 0
+            ret["has_negative_weights"] = neg_weights
+        if "is_directed" in slow_props:
+            if derived is not None:
+                ret["is_directed"] = not derived.is_symmetric(check_values=is_edgemap)
+            else:
+                ret["is_directed"] = _is_directed(matrix, check_values=is_edgemap)
+
+        return ret
+
     class GrblasEdgeSet(EdgeSetWrapper, abstract=EdgeSet):
         """
         Matrix id is the NodeId. Only information about the edges is preserved, meaning nrows and ncols
@@ -234,14 +393,16 @@ if has_grblas:
             def _compute_abstract_properties(
                 cls, obj, props: Set[str], known_props: Dict[str, Any]
             ) -> Dict[str, Any]:
-                ret = known_props.copy()
-
-                # slow properties, only compute if asked
-                for prop in props - ret.keys():
-                    if prop == "is_directed":
-                        ret[prop] = not obj.value.isequal(obj.value.T.new())
+                return _compute_edge_properties(
+                    obj.value, props, known_props, is_edgemap=False
+                )
 
-                return ret
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                # Nodes are implied by the edges and are not cheap to count
+                return SizeEstimate(
+                    num_edges=obj.value.nvals, nbytes=_grblas_nbytes(obj.value)
+                )
 
             @classmethod
             def assert_equal(
@@ -286,35 +447,26 @@ if has_grblas:
             self._assert(data.nrows == data.ncols, "adjacency matrix must be square")
             self.value = data
 
+        @property
+        def derived(self) -> _DerivedStructures:
+            """Cached structures derived from the matrix (transpose, degrees, triangles)"""
+            return _derived(self)
+
         class TypeMixin:
             @classmethod
             def _compute_abstract_properties(
                 cls, obj, props: Set[str], known_props: Dict[str, Any]
             ) -> Dict[str, Any]:
-                ret = known_props.copy()
-
-                # fast properties
-                for prop in {"dtype"} - ret.keys():
-                    if prop == "dtype":
-                        ret[prop] = dtypes.dtypes_simplified[
-                            dtype_grblas_to_mg[obj.value.dtype.name]
-                        ]
-
-                # slow properties, only compute if asked
-                for prop in props - ret.keys():
-                    if prop == "is_directed":
-                        ret[prop] = not obj.value.isequal(obj.value.T.new())
-                    if prop == "has_negative_weights":
-                        if ret["dtype"] in {"bool", "str"}:
-                            neg_weights = None
-                        else:
-                            min_val = (
-                                obj.value.reduce_scalar(grblas.monoid.min).new().value
-                            )
-                            neg_weights = min_val < 0
-                        ret[prop] = neg_weights
+                return _compute_edge_properties(
+                    obj.value, props, known_props, is_edgemap=True, derived=obj.derived
+                )
 
-                return ret
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                # Nodes are implied by the edges and are not cheap to count
+                return SizeEstimate(
+                    num_edges=obj.value.nvals, nbytes=_grblas_nbytes(obj.value)
+                )
 
             @classmethod
             def assert_equal(
@@ -372,9 +524,8 @@ if has_grblas:
                 nrows == ncols, f"Adjacency matrix must be square, not {nrows}x{ncols}"
             )
             if nodes is None:
-                nodes = grblas.Vector.from_values(
-                    range(nrows), [True] * nrows, size=nrows, dtype=bool
-                )
+                nodes = grblas.Vector.new(bool, size=nrows)
+                nodes[:] << True
             self._assert_instance(nodes, grblas.Vector)
             self._assert(
                 nodes.size == matrix.nrows,
@@ -383,6 +534,11 @@ if has_grblas:
             self.value = matrix
             self.nodes = nodes
 
+        @property
+        def derived(self) -> _DerivedStructures:
+            """Cached structures derived from the matrix (transpose, degrees, triangles)"""
+            return _derived(self)
+
         class TypeMixin:
             # Both forward and reverse lookup
             _edge_prop_map = {
@@ -406,24 +562,24 @@ if has_grblas:
                     elif prop == "edge_type":
                         ret[prop] = "set" if obj.value.dtype == bool else "map"
 
-                # Delegate to GrblasEdge{Set/Map} to compute edge properties
+                # Compute edge properties directly from the matrix
                 if ret["edge_type"] == "set":
                     ret["edge_dtype"] = None
                     ret["edge_has_negative_weights"] = None
-                    edgeclass = GrblasEdgeSet
-                else:
-                    edgeclass = GrblasEdgeMap
                 edge_props = {
                     cls._edge_prop_map[p] for p in props if p in cls._edge_prop_map
                 }
                 known_edge_props = {
                     cls._edge_prop_map[p]: v
-                    for p, v in known_props.items()
+                    for p, v in ret.items()
                     if p in cls._edge_prop_map
                 }
-                edges = edgeclass(obj.value)
-                edge_computed_props = edgeclass.Type._compute_abstract_properties(
-                    edges, edge_props, known_edge_props
+                edge_computed_props = _compute_edge_properties(
+                    obj.value,
+                    edge_props,
+                    known_edge_props,
+                    is_edgemap=ret["edge_type"] == "map",
+                    derived=obj.derived,
                 )
                 ret.update(
                     {cls._edge_prop_map[p]: v for p, v in edge_computed_props.items()}
@@ -441,6 +597,14 @@ if has_grblas:
 
                 return ret
 
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                return SizeEstimate(
+                    num_nodes=obj.nodes.nvals,
+                    num_edges=obj.value.nvals,
+                    nbytes=_grblas_nbytes(obj.value) + _grblas_nbytes(obj.nodes),
+                )
+
             @classmethod
             def assert_equal(
                 cls,
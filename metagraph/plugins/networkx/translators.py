@@ -2,45 +2,112 @@ from metagraph import translator
 from metagraph.plugins import has_networkx, has_scipy
 
 
-if has_networkx and has_scipy:
+if has_networkx:
     import networkx as nx
-    import numpy as np
     from .types import NetworkXGraph
+    from ..numpy.types import NumpyGraph
+
+    @translator(memory_expansion=20)
+    def graph_from_numpy(x: NumpyGraph, **props) -> NetworkXGraph:
+        aprops = NumpyGraph.Type.compute_abstract_properties(
+            x, {"is_directed", "node_type", "edge_type"}
+        )
+        nx_graph = nx.DiGraph() if x.is_directed else nx.Graph()
+        if x.node_vals is not None:
+            nx_graph.add_nodes_from(
+                (node, {"weight": val})
+                for node, val in zip(x.node_list.tolist(), x.node_vals.tolist())
+            )
+        else:
+            nx_graph.add_nodes_from(x.node_list.tolist())
+        if x.weights is not None:
+            nx_graph.add_weighted_edges_from(
+                zip(x.src.tolist(), x.dst.tolist(), x.weights.tolist())
+            )
+        else:
+            nx_graph.add_edges_from(zip(x.src.tolist(), x.dst.tolist()))
+        return NetworkXGraph(nx_graph, aprops=aprops)
+
+
+if has_networkx and has_scipy:
+    import numpy as np
+    import scipy.sparse as ss
     from ..scipy.types import ScipyGraph
 
-    @translator
-    def graph_from_scipy(x: ScipyGraph, **props) -> NetworkXGraph:
-        from ..python.types import dtype_casting
+    def _transposed_positions(csr):
+        """
+        For each entry of the transposed matrix (in CSR order), the position of the
+        same entry in csr, along with the transposed indptr and indices
+        """
+        positions = ss.csr_matrix(
+            (np.arange(csr.nnz), csr.indices, csr.indptr), shape=csr.shape
+        )
+        transposed = positions.T.tocsr()
+        transposed.sort_indices()
+        return transposed.indptr, transposed.indices, transposed.data
 
+    def _adjacency(node_ids, indptr, neighbors, attrs):
+        """{node: {neighbor: attrs}} built from CSR-ordered neighbor ids and attr dicts"""
+        bounds = indptr.tolist()
+        return {
+            node: dict(zip(neighbors[start:stop], attrs[start:stop]))
+            for node, start, stop in zip(node_ids, bounds[:-1], bounds[1:])
+        }
+
+    def _edge_attrs(weights, positions):
+        if weights is None:
+            return [{} for _ in range(len(positions))]
+        return [{"weight": weights[pos]} for pos in positions.tolist()]
+
+    @translator(memory_expansion=20)
+    def graph_from_scipy(x: ScipyGraph, **props) -> NetworkXGraph:
         aprops = ScipyGraph.Type.compute_abstract_properties(
             x, {"is_directed", "edge_type", "edge_dtype", "node_type", "node_dtype"}
         )
+        is_directed = aprops["is_directed"]
 
-        nx_graph = nx.from_scipy_sparse_matrix(
-            x.value,
-            create_using=nx.DiGraph if aprops["is_directed"] else nx.Graph,
-            edge_attribute="weight",
-        )
+        csr = x.value.tocsr()
+        if not csr.has_canonical_format:
+            csr = csr.copy()
+            csr.sum_duplicates()
+        nnz = csr.nnz
 
-        if aprops["edge_type"] == "set":
-            # Remove weight attribute
-            for _, _, attr in nx_graph.edges(data=True):
-                del attr["weight"]
+        # Weights are cast to Python objects in bulk, then each edge gets its attr dict
+        weights = None if aprops["edge_type"] == "set" else csr.data.tolist()
+        t_indptr, t_indices, t_positions = _transposed_positions(csr)
+        attrs = np.empty(nnz, dtype=object)
+        if is_directed:
+            attrs[:] = _edge_attrs(weights, np.arange(nnz))
         else:
-            caster = dtype_casting[aprops["edge_dtype"]]
-            for _, _, attr in nx_graph.edges(data=True):
-                attr["weight"] = caster(attr["weight"])
-
-        is_sequential_node_list = (x.node_list == np.arange(len(x.node_list))).all()
-        if not is_sequential_node_list:
-            pos2id = dict(enumerate(x.node_list))
-            nx.relabel_nodes(nx_graph, pos2id, False)
+            # networkx shares one attr dict between both directions of an undirected
+            # edge, so it is created for the entry on or above the diagonal
+            rows = np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+            owner = np.where(rows <= csr.indices, np.arange(nnz), t_positions)
+            is_owner = owner == np.arange(nnz)
+            attrs[is_owner] = _edge_attrs(weights, np.flatnonzero(is_owner))
+            attrs = attrs[owner]
 
+        node_ids = x.node_list.tolist()
         if x.node_vals is not None:
-            caster = dtype_casting[aprops["node_dtype"]]
-            node_weights = {
-                idx: caster(val) for idx, val in zip(x.node_list, x.node_vals)
-            }
-            nx.set_node_attributes(nx_graph, node_weights, name="weight")
+            node_attrs = [{"weight": val} for val in x.node_vals.tolist()]
+        else:
+            node_attrs = [{} for _ in node_ids]
+
+        nx_graph = nx.DiGraph() if is_directed else nx.Graph()
+        nx_graph._node.update(zip(node_ids, node_attrs))
+        nx_graph._adj.update(
+            _adjacency(
+                node_ids, csr.indptr, x.node_list[csr.indices].tolist(), attrs.tolist(),
+            )
+        )
+        if is_directed:
+            nx_graph._pred.update(
+                _adjacency(
+                    node_ids,
+                    t_indptr,
+                    x.node_list[t_indices].tolist(),
+                    attrs[t_positions].tolist(),
+                )
+            )
 
         return NetworkXGraph(nx_graph, aprops=aprops)
@@ -1,18 +1,102 @@
 from typing import Set, Dict, Any
 from ..core.types import Graph, BipartiteGraph
 from ..core.wrappers import GraphWrapper, BipartiteGraphWrapper
+from metagraph.core.typecache import SizeEstimate
 from .. import has_networkx
+import itertools
 import math
+import operator
+import numpy as np
+
+
+def _collect_values(attr_dicts, label):
+    """
+    Single pass over attribute dicts, collecting the value stored under `label`.
+    Returns None as soon as any dict is missing the label.
+    """
+    try:
+        return list(map(operator.itemgetter(label), attr_dicts))
+    except KeyError:
+        return None
 
 
 def _determine_dtype(all_values):
+    arr = np.array(all_values)
+    kind = arr.dtype.kind
+    if kind == "b":
+        return "bool", arr
+    if kind in "iu":
+        return "int", arr
+    if kind == "f":
+        return "float", arr
     all_types = {type(v) for v in all_values}
-    if not all_types or (all_types - {float, int, bool}):
-        # return "str"
-        raise TypeError(f"unable to determine dtype, all_types={all_types}")
-    for type_ in (float, int, bool):
-        if type_ in all_types:
-            return str(type_.__name__)
+    if kind == "O" and all_types and not (all_types - {float, int, bool}):
+        # Python ints too large for int64
+        return ("float" if float in all_types else "int"), arr
+    raise TypeError(f"unable to determine dtype, all_types={all_types}")
+
+
+def adjacency_arrays(nx_graph, weight_label=None, dtype=np.int64):
+    """
+    Source ids, destination ids and (if weight_label is given) weights of every entry in
+    the adjacency of a networkx graph, read in bulk from the adjacency dicts.
+    Undirected edges appear in both directions (self-loops once).
+    Node ids are stored with `dtype`, which must hold every node id.
+    """
+    adj = nx_graph._adj
+    counts = np.fromiter(map(len, adj.values()), np.int64, count=len(adj))
+    nnz = int(counts.sum())
+    src = np.repeat(np.fromiter(adj, dtype, count=len(adj)), counts)
+    dst = np.fromiter(itertools.chain.from_iterable(adj.values()), dtype, nnz)
+    weights = None
+    if weight_label is not None:
+        attrs = itertools.chain.from_iterable(nbrs.values() for nbrs in adj.values())
+        weights = np.array(list(map(operator.itemgetter(weight_label), attrs)))
+    return src, dst, weights
+
+
+# Rough per-item memory used by networkx's dict-of-dicts storage, including attribute dicts
+_NODE_NBYTES = 500
+_EDGE_NBYTES = 300
+
+
+def _estimate_nx_size(nx_graph, num_nodes):
+    num_edges = nx_graph.number_of_edges()
+    if not nx_graph.is_directed():
+        # Undirected edges are stored in the adjacency of both endpoints
+        num_edges *= 2
+    return SizeEstimate(
+        num_nodes=num_nodes,
+        num_edges=num_edges,
+        nbytes=num_nodes * _NODE_NBYTES + num_edges * _EDGE_NBYTES,
+    )
+
+
+def _compute_value_props(
+    attr_dicts, label, slow_props, type_prop, dtype_prop, neg_prop=None
+):
+    """
+    Computes the {type, dtype, has_negative_weights} properties for node or edge values
+    from a single pass over the attributes. The dtype and minimum are computed from the
+    collected values in one vectorized step rather than building intermediate sets.
+    """
+    ret = {}
+    values = _collect_values(attr_dicts, label)
+    if not values:
+        ret[type_prop] = "set"
+        ret[dtype_prop] = None
+        if neg_prop is not None:
+            ret[neg_prop] = None
+        return ret
+
+    ret[type_prop] = "map"
+    need_neg = neg_prop is not None and neg_prop in slow_props
+    if dtype_prop in slow_props or need_neg:
+        dtype, arr = _determine_dtype(values)
+        ret[dtype_prop] = dtype
+        if need_neg:
+            ret[neg_prop] = None if dtype == "bool" else bool(arr.min() < 0)
+    return ret
 
 
 if has_networkx:
@@ -42,6 +126,8 @@ if has_networkx:
         #     )
 
         class TypeMixin:
+            gil_bound = True
+
             @classmethod
             def _compute_abstract_properties(
                 cls, obj, props: Set[str], known_props: Dict[str, Any]
@@ -56,60 +142,43 @@ if has_networkx:
                 # slow properties, only compute if asked
                 slow_props = props - ret.keys()
                 if {"node_type", "node_dtype"} & slow_props:
-                    node_values = set()
-                    for node in obj.value.nodes(data=True):
-                        attrs = node[-1]
-                        try:
-                            node_values.add(attrs[obj.node_weight_label])
-                        except KeyError:
-                            node_values = None
-                            break
-                    if node_values:
-                        ret["node_type"] = "map"
-                        if "node_dtype" in slow_props:
-                            ret["node_dtype"] = _determine_dtype(node_values)
-                    else:
-                        ret["node_type"] = "set"
-                        ret["node_dtype"] = None
+                    ret.update(
+                        _compute_value_props(
+                            obj.value._node.values(),
+                            obj.node_weight_label,
+                            slow_props,
+                            "node_type",
+                            "node_dtype",
+                        )
+                    )
 
                 if {
                     "edge_type",
                     "edge_dtype",
                     "edge_has_negative_weights",
                 } & slow_props:
-                    edge_values = set()
-                    for edge in obj.value.edges(data=True):
-                        attrs = edge[-1]
-                        try:
-                            edge_values.add(attrs[obj.edge_weight_label])
-                        except KeyError:
-                            edge_values = None
-                            break
-                    if edge_values:
-                        ret["edge_type"] = "map"
-                        if (
-                            "edge_dtype" in slow_props
-                            or "edge_has_negative_weights" in slow_props
-                        ):
-                            ret["edge_dtype"] = _determine_dtype(edge_values)
-                        if "edge_has_negative_weights" in slow_props:
-                            if ret["edge_dtype"] in {"bool", "str"}:
-                                neg_weights = None
-                            else:
-                                min_val = min(edge_values)
-                                if min_val < 0:
-                                    neg_weights = True
-                                else:
-                                    neg_weights = False
-
-                            ret["edge_has_negative_weights"] = neg_weights
-                    else:
-                        ret["edge_type"] = "set"
-                        ret["edge_dtype"] = None
-                        ret["edge_has_negative_weights"] = None
+                    # Attr dicts are read from the adjacency without deduplicating the
+                    # two directions of undirected edges, which does not change the result
+                    edge_attrs = itertools.chain.from_iterable(
+                        nbrs.values() for nbrs in obj.value._adj.values()
+                    )
+                    ret.update(
+                        _compute_value_props(
+                            edge_attrs,
+                            obj.edge_weight_label,
+                            slow_props,
+                            "edge_type",
+                            "edge_dtype",
+                            "edge_has_negative_weights",
+                        )
+                    )
 
                 return ret
 
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                return _estimate_nx_size(obj.value, obj.value.number_of_nodes())
+
             @classmethod
             def assert_equal(
                 cls,
@@ -200,6 +269,8 @@ if has_networkx:
                 )
 
         class TypeMixin:
+            gil_bound = True
+
             @classmethod
             def _compute_abstract_properties(
                 cls, obj, props: Set[str], known_props: Dict[str, Any]
@@ -213,78 +284,50 @@ if has_networkx:
 
                 # slow properties, only compute if asked
                 slow_props = props - ret.keys()
-                if {"node0_type", "node0_dtype"} & slow_props:
-                    node0_values = set()
-                    for node_id in obj.nodes[0]:
-                        attrs = obj.value.nodes[node_id]
-                        try:
-                            node0_values.add(attrs[obj.node_weight_label])
-                        except KeyError:
-                            node0_values = None
-                            break
-                    if node0_values:
-                        ret["node0_type"] = "map"
-                        if "node0_dtype" in slow_props:
-                            ret["node0_dtype"] = _determine_dtype(node0_values)
-                    else:
-                        ret["node0_type"] = "set"
-                        ret["node0_dtype"] = None
-
-                if {"node1_type", "node1_dtype"} & slow_props:
-                    node1_values = set()
-                    for node_id in obj.nodes[1]:
-                        attrs = obj.value.nodes[node_id]
-                        try:
-                            node1_values.add(attrs[obj.node_weight_label])
-                        except KeyError:
-                            node1_values = None
-                            break
-                    if node1_values:
-                        ret["node1_type"] = "map"
-                        if "node1_dtype" in slow_props:
-                            ret["node1_dtype"] = _determine_dtype(node1_values)
-                    else:
-                        ret["node1_type"] = "set"
-                        ret["node1_dtype"] = None
+                for part in (0, 1):
+                    type_prop = f"node{part}_type"
+                    dtype_prop = f"node{part}_dtype"
+                    if {type_prop, dtype_prop} & slow_props:
+                        nodes = obj.value.nodes
+                        ret.update(
+                            _compute_value_props(
+                                (nodes[node_id] for node_id in obj.nodes[part]),
+                                obj.node_weight_label,
+                                slow_props,
+                                type_prop,
+                                dtype_prop,
+                            )
+                        )
 
                 if {
                     "edge_type",
                     "edge_dtype",
                     "edge_has_negative_weights",
                 } & slow_props:
-                    edge_values = set()
-                    for edge in obj.value.edges(data=True):
-                        attrs = edge[-1]
-                        try:
-                            edge_values.add(attrs[obj.edge_weight_label])
-                        except KeyError:
-                            edge_values = None
-                            break
-                    if edge_values:
-                        ret["edge_type"] = "map"
-                        if (
-                            "edge_dtype" in slow_props
-                            or "edge_has_negative_weights" in slow_props
-                        ):
-                            ret["edge_dtype"] = _determine_dtype(edge_values)
-                        if "edge_has_negative_weights" in slow_props:
-                            if ret["edge_dtype"] in {"bool", "str"}:
-                                neg_weights = None
-                            else:
-                                min_val = min(edge_values)
-                                if min_val < 0:
-                                    neg_weights = True
-                                else:
-                                    neg_weights = False
-
-                            ret["edge_has_negative_weights"] = neg_weights
-                    else:
-                        ret["edge_type"] = "set"
-                        ret["edge_dtype"] = None
-                        ret["edge_has_negative_weights"] = None
+                    # Attr dicts are read from the adjacency without deduplicating the
+                    # two directions of undirected edges, which does not change the result
+                    edge_attrs = itertools.chain.from_iterable(
+                        nbrs.values() for nbrs in obj.value._adj.values()
+                    )
+                    ret.update(
+                        _compute_value_props(
+                            edge_attrs,
+                            obj.edge_weight_label,
+                            slow_props,
+                            "edge_type",
+                            "edge_dtype",
+                            "edge_has_negative_weights",
+                        )
+                    )
 
                 return ret
 
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                return _estimate_nx_size(
+                    obj.value, len(obj.nodes[0]) + len(obj.nodes[1])
+                )
+
             @classmethod
             def assert_equal(
                 cls,
@@ -0,0 +1,255 @@
+"""
+Compiler plugin which uses numba to JIT compile concrete algorithms.
+
+Concrete algorithms tagged with ``compiler="numba"`` are compiled by this plugin.
+The element-wise NodeMap utilities (``util.nodemap.apply``, ``util.nodemap.filter``
+and ``util.nodemap.reduce``) over NumpyNodeMap are compiled into numba loops. When
+a subgraph contains a chain of ``apply`` calls feeding into another ``apply``,
+``filter`` or ``reduce``, the chain is fused into a single loop over the values so
+no intermediate arrays are created.
+
+Other tagged algorithms are expected to call numba kernels themselves and are used
+unchanged.
+"""
+
+import weakref
+from typing import Callable, Dict, List, Union, Any
+
+import dask.core
+import numpy as np
+
+from metagraph.core.plugin import Compiler, ConcreteAlgorithm
+from .. import has_numba
+
+# Abstract algorithms which operate element-wise over NodeMap values
+_NODEMAP_OPS = {
+    "util.nodemap.apply": "apply",
+    "util.nodemap.filter": "filter",
+    "util.nodemap.reduce": "reduce",
+}
+
+
+def _is_key(obj, keys) -> bool:
+    try:
+        return obj in keys
+    except TypeError:  # unhashable literal
+        return False
+
+
+if has_numba:
+    import numba
+    from numba.core.registry import CPUDispatcher
+    from numba.np.numpy_support import as_dtype
+    from ..numpy.types import NumpyNodeMap, NumpyNodeSet
+
+    @numba.njit
+    def _identity(value):
+        return value
+
+    @numba.njit
+    def _apply_loop(values, func, out):
+        for i in range(len(values)):
+            out[i] = func(values[i])
+
+    @numba.njit
+    def _filter_loop(values, nodes, func):
+        out = np.empty(len(nodes), dtype=nodes.dtype)
+        n = 0
+        for i in range(len(values)):
+            if func(values[i]):
+                out[n] = nodes[i]
+                n += 1
+        return out[:n].copy()
+
+    @numba.njit
+    def _reduce_loop(values, func, reducer):
+        acc = func(values[0])
+        for i in range(1, len(values)):
+            acc = reducer(acc, func(values[i]))
+        return acc
+
+    def _compose(first, second):
+        @numba.njit
+        def composed(value):
+            return second(first(value))
+
+        return composed
+
+    def _wrap_ufunc(ufunc):
+        if ufunc.nin == 1:
+
+            @numba.njit
+            def wrapped(a):
+                return ufunc(a)
+
+        else:
+
+            @numba.njit
+            def wrapped(a, b):
+                return ufunc(a, b)
+
+        return wrapped
+
+    def _result_dtype(func, values):
+        arg_type = numba.from_dtype(values.dtype)
+        func.compile((arg_type,))
+        return as_dtype(func.overloads[(arg_type,)].signature.return_type)
+
+    class NumbaCompiler(Compiler):
+        def __init__(self, name="numba"):
+            super().__init__(name=name)
+            self._jitted = weakref.WeakKeyDictionary()
+            self._ufuncs = {}
+            # Composed dispatchers keyed on the tuple of jitted functions they apply
+            self._composed = {}
+
+        def _jit(self, func):
+            """Returns a numba dispatcher for func, reusing earlier compilations"""
+            if isinstance(func, CPUDispatcher):
+                return func
+            if isinstance(func, np.ufunc):
+                if func not in self._ufuncs:
+                    self._ufuncs[func] = _wrap_ufunc(func)
+                return self._ufuncs[func]
+            try:
+                return self._jitted[func]
+            except KeyError:
+                jitted = self._jitted[func] = numba.njit(func)
+                return jitted
+            except TypeError:  # not weak-referenceable
+                return numba.njit(func)
+
+        def _compose_chain(self, funcs: tuple):
+            """
+            Returns a numba dispatcher applying each of funcs in turn, reusing earlier
+            compositions so repeated chains are not compiled again
+            """
+            if len(funcs) == 1:
+                return funcs[0]
+            try:
+                return self._composed[funcs]
+            except KeyError:
+                composed = _compose(self._compose_chain(funcs[:-1]), funcs[-1])
+                self._composed[funcs] = composed
+                return composed
+
+        @staticmethod
+        def _is_nodemap_op(algo: ConcreteAlgorithm) -> bool:
+            if algo.abstract_name not in _NODEMAP_OPS:
+                return False
+            x_param = algo.__original_signature__.parameters.get("x")
+            return x_param is not None and x_param.annotation is NumpyNodeMap
+
+        def run_nodemap_chain(
+            self, x: NumpyNodeMap, funcs: List[Callable], kind: str, final_func
+        ):
+            """
+            Applies each of funcs element-wise to the values of x, then the final
+            apply, filter or reduce function, in a single loop.
+            """
+            values = x.value
+            funcs = tuple(self._jit(func) for func in funcs)
+
+            if kind == "reduce":
+                reducer = final_func
+                if len(values) == 0:
+                    # Match numpy semantics for reductions over empty arrays
+                    if not isinstance(reducer, np.ufunc):
+                        reducer = np.frompyfunc(reducer, 2, 1)
+                    return reducer.reduce(values)
+                elementwise = self._compose_chain(funcs) if funcs else _identity
+                return _reduce_loop(values, elementwise, self._jit(reducer))
+
+            final_func = self._compose_chain(funcs + (self._jit(final_func),))
+            if kind == "filter":
+                return NumpyNodeSet.trusted(_filter_loop(values, x.nodes, final_func))
+
+            out = np.empty(len(values), dtype=_result_dtype(final_func, values))
+            _apply_loop(values, final_func, out)
+            return NumpyNodeMap.trusted(out, nodes=x.nodes.copy())
+
+        def compile_algorithm(
+            self, algo: ConcreteAlgorithm, literals: Dict[str, Any] = None
+        ) -> Callable:
+            if not self._is_nodemap_op(algo):
+                return algo.func
+
+            kind = _NODEMAP_OPS[algo.abstract_name]
+
+            def compiled(x, func):
+                return self.run_nodemap_chain(x, [], kind, func)
+
+            compiled.__name__ = algo.__name__
+            return compiled
+
+        def _nodemap_task_args(self, task):
+            """Returns (x, func, kind) if the task is a fusable NodeMap operation"""
+            algo = getattr(task[0], "algo", None)
+            if algo is None or algo._compiler != self.name:
+                return None
+            if not self._is_nodemap_op(algo):
+                return None
+            args, kwargs = task[1], task[2]
+            if isinstance(kwargs, tuple) and kwargs and kwargs[0] is dict:
+                kwargs = dict(kwargs[1])
+            bound = algo.__signature__.bind(*args, **kwargs)
+            func = bound.arguments["func"]
+            if not callable(func):
+                return None
+            return bound.arguments["x"], func, _NODEMAP_OPS[algo.abstract_name]
+
+        def compile_subgraph(
+            self, subgraph: Dict, inputs: List[str], output: Union[str, List[str]]
+        ) -> Callable:
+            outputs = output if isinstance(output, list) else [output]
+
+            ops = {}
+            for key, task in subgraph.items():
+                op = self._nodemap_task_args(task)
+                if op is not None:
+                    ops[key] = op
+
+            keys = set(subgraph)
+            num_consumers = dict.fromkeys(subgraph, 0)
+            for task in subgraph.values():
+                for dep in dask.core.keys_in_tasks(keys, [task]):
+                    num_consumers[dep] += 1
+
+            # An apply whose only consumer is another NodeMap operation is folded into it
+            absorbed = set()
+            for key, (src, _, _) in ops.items():
+                if (
+                    _is_key(src, ops)
+                    and ops[src][2] == "apply"
+                    and num_consumers[src] == 1
+                    and src not in outputs
+                ):
+                    absorbed.add(src)
+
+            tasks = {}
+            for key, task in subgraph.items():
+                if key in absorbed:
+                    continue
+                if key not in ops:
+                    tasks[key] = task
+                    continue
+                src, final_func, kind = ops[key]
+                funcs = []
+                while _is_key(src, absorbed):
+                    src, func, _ = ops[src]
+                    funcs.insert(0, func)
+                tasks[key] = (self._nodemap_kernel(funcs, kind, final_func), src)
+
+            def fused(*args):
+                cache = dict(zip(inputs, args))
+                return dask.core.get(tasks, output, cache=cache)
+
+            return fused
+
+        def _nodemap_kernel(self, funcs, kind, final_func):
+            def kernel(x):
+                return self.run_nodemap_chain(x, funcs, kind, final_func)
+
+            return kernel
+
+    numba_compiler = NumbaCompiler()
@@ -13,6 +13,9 @@ from .. import has_numba
 if has_numba:
     import numba
 
+# The element-wise NodeMap utilities are compiled (and fused) by the numba compiler plugin
+_compiler = "numba" if has_numba else None
+
 
 @concrete_algorithm("util.nodeset.choose_random")
 def np_nodeset_choose_random(x: NumpyNodeSet, k: int) -> NumpyNodeSet:
@@ -41,27 +44,27 @@ def np_nodemap_sort(
 
 @concrete_algorithm("util.nodemap.select")
 def np_nodemap_select(x: NumpyNodeMap, nodes: NumpyNodeSet) -> NumpyNodeMap:
-    common_nodes = np.intersect1d(x.nodes, nodes.value)
-    index = np.searchsorted(x.nodes, common_nodes)
-    selected_data = x.value[index].copy()
-    return NumpyNodeMap(selected_data, nodes=common_nodes)
+    positions = x.node_index.locate(nodes.value)
+    found = positions >= 0
+    # nodes.value is sorted, so the selected nodes remain sorted
+    return NumpyNodeMap.trusted(x.value[positions[found]], nodes=nodes.value[found])
 
 
-@concrete_algorithm("util.nodemap.filter")
+@concrete_algorithm("util.nodemap.filter", compiler=_compiler)
 def np_nodemap_filter(x: NumpyNodeMap, func: Callable[[Any], bool]) -> NumpyNodeSet:
     # TODO consider caching this somewhere or enforcing that only vectorized functions are given
     func_vectorized = numba.vectorize(func) if has_numba else np.vectorize(func)
-    return NumpyNodeSet(x.nodes[func_vectorized(x.value)].copy())
+    return NumpyNodeSet.trusted(x.nodes[func_vectorized(x.value)].copy())
 
 
-@concrete_algorithm("util.nodemap.apply")
+@concrete_algorithm("util.nodemap.apply", compiler=_compiler)
 def np_nodemap_apply(x: NumpyNodeMap, func: Callable[[Any], Any]) -> NumpyNodeMap:
     # TODO consider caching this somewhere or enforcing that only vectorized functions are given
     func_vectorized = numba.vectorize(func) if has_numba else np.vectorize(func)
-    return NumpyNodeMap(func_vectorized(x.value), nodes=x.nodes.copy())
+    return NumpyNodeMap.trusted(func_vectorized(x.value), nodes=x.nodes.copy())
 
 
-@concrete_algorithm("util.nodemap.reduce")
+@concrete_algorithm("util.nodemap.reduce", compiler=_compiler)
 def np_nodemap_reduce(x: NumpyNodeMap, func: Callable[[Any, Any], Any]) -> Any:
     if not isinstance(func, np.ufunc):
         func = np.frompyfunc(func, 2, 1)
@@ -1,27 +1,41 @@
 import numpy as np
 from metagraph import translator
-from metagraph.plugins import has_scipy, has_grblas
-from .types import NumpyMatrixType, NumpyVectorType, NumpyNodeSet, NumpyNodeMap
+from metagraph.core.dtypes import index_dtype
+from metagraph.plugins import has_scipy, has_grblas, has_pandas, has_networkx
+from .types import (
+    NumpyMatrixType,
+    NumpyVectorType,
+    NumpyNodeSet,
+    NumpyNodeMap,
+    NumpyEdgeSet,
+    NumpyEdgeMap,
+    NumpyGraph,
+)
 from ..python.types import PythonNodeMapType, PythonNodeSetType
 
 
 @translator
 def nodemap_to_nodeset(x: NumpyNodeMap, **props) -> NumpyNodeSet:
-    return NumpyNodeSet(x.nodes.copy())
+    return NumpyNodeSet.trusted(x.nodes.copy())
 
 
 @translator
+def edgemap_to_edgeset(x: NumpyEdgeMap, **props) -> NumpyEdgeSet:
+    return NumpyEdgeSet.trusted(x.src, x.dst, is_directed=x.is_directed)
+
+
+@translator(memory_expansion=0.2)
 def nodeset_from_python(x: PythonNodeSetType, **props) -> NumpyNodeSet:
     return NumpyNodeSet(x)
 
 
-@translator
+@translator(memory_expansion=0.2)
 def nodemap_from_python(x: PythonNodeMapType, **props) -> NumpyNodeMap:
     aprops = PythonNodeMapType.compute_abstract_properties(x, {"dtype"})
     dtype = aprops["dtype"]
     np_dtype = dtype if dtype != "str" else "object"
     data = np.empty((len(x),), dtype=np_dtype)
-    nodes = np.empty((len(x),), dtype=int)
+    nodes = np.empty((len(x),), dtype=index_dtype(max(map(abs, x), default=0)))
     for i, (node_id, val) in enumerate(x.items()):
         nodes[i] = node_id
         data[i] = val
@@ -34,6 +48,9 @@ if has_grblas:
         GrblasNodeSet,
         GrblasNodeMap,
         GrblasMatrixType,
+        GrblasEdgeSet,
+        GrblasEdgeMap,
+        GrblasGraph,
         dtype_grblas_to_mg,
     )
 
@@ -42,18 +59,165 @@ if has_grblas:
         _, vals = x.to_values()
         return vals
 
+    def _grblas_ids(idx, size):
+        # Ids are below the vector or matrix size, so no scan is needed to narrow them
+        return idx.astype(index_dtype(size), copy=False)
+
     @translator
     def nodeset_from_graphblas(x: GrblasNodeSet, **props) -> NumpyNodeSet:
         idx, _ = x.value.to_values()
-        return NumpyNodeSet(idx)
+        return NumpyNodeSet.trusted(_grblas_ids(idx, x.value.size))
 
     @translator
     def nodemap_from_graphblas(x: GrblasNodeMap, **props) -> NumpyNodeMap:
         idx, vals = x.value.to_values()
-        return NumpyNodeMap(vals, nodes=idx)
+        return NumpyNodeMap.trusted(vals, nodes=_grblas_ids(idx, x.value.size))
 
     @translator
     def matrix_from_grblas(x: GrblasMatrixType, **props) -> NumpyMatrixType:
         _, _, vals = x.to_values()
         vals = vals.reshape((x.nrows, x.ncols))
         return vals
+
+    def _grblas_edges(matrix, is_directed):
+        rows, cols, vals = matrix.to_values()
+        if not is_directed:
+            keep = rows <= cols
+            rows, cols, vals = rows[keep], cols[keep], vals[keep]
+        size = max(matrix.nrows, matrix.ncols)
+        return _grblas_ids(rows, size), _grblas_ids(cols, size), vals
+
+    @translator
+    def edgeset_from_graphblas(x: GrblasEdgeSet, **props) -> NumpyEdgeSet:
+        aprops = GrblasEdgeSet.Type.compute_abstract_properties(x, {"is_directed"})
+        src, dst, _ = _grblas_edges(x.value, aprops["is_directed"])
+        return NumpyEdgeSet.trusted(src, dst, is_directed=aprops["is_directed"])
+
+    @translator
+    def edgemap_from_graphblas(x: GrblasEdgeMap, **props) -> NumpyEdgeMap:
+        aprops = GrblasEdgeMap.Type.compute_abstract_properties(x, {"is_directed"})
+        src, dst, weights = _grblas_edges(x.value, aprops["is_directed"])
+        return NumpyEdgeMap.trusted(
+            src, dst, weights, is_directed=aprops["is_directed"]
+        )
+
+    @translator
+    def graph_from_graphblas(x: GrblasGraph, **props) -> NumpyGraph:
+        aprops = GrblasGraph.Type.compute_abstract_properties(
+            x, {"is_directed", "node_type", "edge_type"}
+        )
+        src, dst, weights = _grblas_edges(x.value, aprops["is_directed"])
+        if aprops["edge_type"] == "set":
+            weights = None
+        node_list, node_vals = x.nodes.to_values()
+        if aprops["node_type"] == "set":
+            node_vals = None
+        return NumpyGraph.trusted(
+            src,
+            dst,
+            weights,
+            _grblas_ids(node_list, x.nodes.size),
+            node_vals,
+            is_directed=aprops["is_directed"],
+            aprops=aprops,
+        )
+
+
+if has_scipy:
+    from ..scipy.types import ScipyEdgeSet, ScipyEdgeMap, ScipyGraph
+
+    def _scipy_edges(matrix, node_list, is_directed):
+        coo = matrix.tocoo()
+        rows, cols, data = coo.row, coo.col, coo.data
+        if not is_directed:
+            keep = rows <= cols
+            rows, cols, data = rows[keep], cols[keep], data[keep]
+        return node_list[rows], node_list[cols], data
+
+    @translator
+    def edgeset_from_scipy(x: ScipyEdgeSet, **props) -> NumpyEdgeSet:
+        aprops = ScipyEdgeSet.Type.compute_abstract_properties(x, {"is_directed"})
+        src, dst, _ = _scipy_edges(x.value, x.node_list, aprops["is_directed"])
+        return NumpyEdgeSet.trusted(src, dst, is_directed=aprops["is_directed"])
+
+    @translator
+    def edgemap_from_scipy(x: ScipyEdgeMap, **props) -> NumpyEdgeMap:
+        aprops = ScipyEdgeMap.Type.compute_abstract_properties(x, {"is_directed"})
+        src, dst, weights = _scipy_edges(x.value, x.node_list, aprops["is_directed"])
+        return NumpyEdgeMap.trusted(
+            src, dst, weights, is_directed=aprops["is_directed"]
+        )
+
+    @translator
+    def graph_from_scipy(x: ScipyGraph, **props) -> NumpyGraph:
+        aprops = ScipyGraph.Type.compute_abstract_properties(
+            x, {"is_directed", "node_type", "edge_type"}
+        )
+        src, dst, weights = _scipy_edges(x.value, x.node_list, aprops["is_directed"])
+        if aprops["edge_type"] == "set":
+            weights = None
+        return NumpyGraph(
+            src,
+            dst,
+            weights,
+            x.node_list,
+            x.node_vals,
+            is_directed=aprops["is_directed"],
+            aprops=aprops,
+        )
+
+
+if has_pandas:
+    from ..pandas.types import PandasEdgeSet, PandasEdgeMap
+
+    @translator
+    def edgeset_from_pandas(x: PandasEdgeSet, **props) -> NumpyEdgeSet:
+        df = x.value
+        return NumpyEdgeSet(
+            df[x.src_label].values, df[x.dst_label].values, is_directed=x.is_directed
+        )
+
+    @translator
+    def edgemap_from_pandas(x: PandasEdgeMap, **props) -> NumpyEdgeMap:
+        df = x.value
+        return NumpyEdgeMap(
+            df[x.src_label].values,
+            df[x.dst_label].values,
+            df[x.weight_label].values,
+            is_directed=x.is_directed,
+        )
+
+
+if has_networkx:
+    from ..networkx.types import NetworkXGraph, adjacency_arrays
+
+    @translator
+    def graph_from_networkx(x: NetworkXGraph, **props) -> NumpyGraph:
+        aprops = NetworkXGraph.Type.compute_abstract_properties(
+            x, {"is_directed", "node_type", "edge_type"}
+        )
+        weight = x.edge_weight_label if aprops["edge_type"] == "map" else None
+        nodes = sorted(x.value._node)
+        dtype = index_dtype(max(abs(nodes[0]), abs(nodes[-1])) if nodes else 0)
+        node_list = np.array(nodes, dtype=dtype)
+        src, dst, weights = adjacency_arrays(x.value, weight, dtype)
+        if not aprops["is_directed"]:
+            keep = src <= dst
+            src, dst = src[keep], dst[keep]
+            if weights is not None:
+                weights = weights[keep]
+        node_vals = None
+        if aprops["node_type"] == "map":
+            node_attrs = x.value._node
+            node_vals = np.array(
+                [node_attrs[n][x.node_weight_label] for n in node_list.tolist()]
+            )
+        return NumpyGraph.trusted(
+            src,
+            dst,
+            weights,
+            node_list,
+            node_vals,
+            is_directed=aprops["is_directed"],
+            aprops=aprops,
+        )
@@ -1,8 +1,16 @@
 from typing import Set, Dict, Any
 import numpy as np
 from metagraph import dtypes, Wrapper, ConcreteType
-from ..core.types import Vector, Matrix, NodeSet, NodeMap
-from ..core.wrappers import NodeSetWrapper, NodeMapWrapper
+from metagraph.core.dtypes import index_dtype, as_index_array
+from metagraph.core.typecache import SizeEstimate
+from ..core.types import Vector, Matrix, NodeSet, NodeMap, EdgeSet, EdgeMap, Graph
+from ..core.wrappers import (
+    NodeSetWrapper,
+    NodeMapWrapper,
+    EdgeSetWrapper,
+    EdgeMapWrapper,
+    GraphWrapper,
+)
 
 
 class NumpyVectorType(ConcreteType, abstract=Vector):
@@ -24,6 +32,10 @@ class NumpyVectorType(ConcreteType, abstract=Vector):
 
         return ret
 
+    @classmethod
+    def _estimate_size(cls, obj) -> SizeEstimate:
+        return SizeEstimate(nbytes=obj.nbytes)
+
     @classmethod
     def assert_equal(
         cls,
@@ -46,28 +58,121 @@ class NumpyVectorType(ConcreteType, abstract=Vector):
             assert (obj1 == obj2).all()
 
 
+# Node ids spanning at most this many times the number of nodes are located with a table
+_DENSE_SPAN_FACTOR = 2
+
+
+class _NodeIndex:
+    """
+    Locates node ids in a sorted array of unique node ids.
+
+    Contiguous ids (such as np.arange(n)) are located by their offset from the first id.
+    Dense ids use a table of positions (or a presence bitmap when only membership is
+    needed), which is built on first use. Sparse ids fall back to np.searchsorted.
+    """
+
+    def __init__(self, nodes, *, positions=True):
+        self.nodes = nodes
+        self.size = len(nodes)
+        self.start = int(nodes[0]) if self.size else 0
+        self.span = int(nodes[-1]) - self.start + 1 if self.size else 0
+        self.is_contiguous = self.span == self.size
+        self.is_dense = (
+            not self.is_contiguous
+            and issubclass(nodes.dtype.type, np.integer)
+            and self.span <= _DENSE_SPAN_FACTOR * self.size
+        )
+        self._positions = positions
+        self._table = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            offsets = self.nodes - self.start
+            if self._positions:
+                table = np.full(self.span, -1, dtype=np.intp)
+                table[offsets] = np.arange(self.size)
+            else:
+                table = np.zeros(self.span, dtype=bool)
+                table[offsets] = True
+            self._table = table
+        return self._table
+
+    def _searchsorted(self, keys):
+        index = np.searchsorted(self.nodes, keys)
+        clipped = np.minimum(index, self.size - 1)
+        found = (index < self.size) & (self.nodes[clipped] == keys)
+        return np.where(found, index, -1)
+
+    def locate_one(self, key) -> int:
+        """Position of a single node id, or -1 if missing"""
+        if self.size == 0:
+            return -1
+        if isinstance(key, (int, np.integer)):
+            offset = int(key) - self.start
+            if self.is_contiguous:
+                return offset if 0 <= offset < self.size else -1
+            if self.is_dense:
+                if not 0 <= offset < self.span:
+                    return -1
+                if self._positions:
+                    return int(self.table[offset])
+                if not self.table[offset]:
+                    return -1
+        return int(self._searchsorted(key))
+
+    def locate(self, keys) -> np.ndarray:
+        """Positions of an array of node ids, with -1 for missing ids"""
+        keys = np.asarray(keys)
+        if self.size == 0:
+            return np.full(keys.shape, -1, dtype=np.intp)
+        if not issubclass(keys.dtype.type, np.integer) or not (
+            self.is_contiguous or (self.is_dense and self._positions)
+        ):
+            return self._searchsorted(keys)
+        offsets = keys.astype(np.intp) - self.start
+        valid = (offsets >= 0) & (offsets < self.span)
+        if self.is_contiguous:
+            return np.where(valid, offsets, -1)
+        positions = np.full(keys.shape, -1, dtype=np.intp)
+        positions[valid] = self.table[offsets[valid]]
+        return positions
+
+    def contains(self, keys) -> np.ndarray:
+        """Mask of which node ids in an array are present"""
+        keys = np.asarray(keys)
+        if self.is_dense and not self._positions and self.size:
+            if issubclass(keys.dtype.type, np.integer):
+                offsets = keys.astype(np.intp) - self.start
+                valid = (offsets >= 0) & (offsets < self.span)
+                found = np.zeros(keys.shape, dtype=bool)
+                found[valid] = self.table[offsets[valid]]
+                return found
+        return self.locate(keys) >= 0
+
+
 class NumpyNodeSet(NodeSetWrapper, abstract=NodeSet):
     def __init__(self, nodes, *, aprops=None):
         super().__init__(aprops=aprops)
-        self._assert_instance(nodes, (np.ndarray, list, tuple, set))
+        validate = self._validating()
+        if validate:
+            self._assert_instance(nodes, (np.ndarray, list, tuple, set))
         if not isinstance(nodes, np.ndarray):
             if isinstance(nodes, set):
                 nodes = tuple(nodes)  # np.array doesn't accept sets
             nodes = np.array(nodes)
-        if len(nodes.shape) != 1:
-            raise TypeError(f"Invalid number of dimensions: {len(nodes.shape)}")
-        if not issubclass(nodes.dtype.type, np.integer):
-            raise TypeError(f"Invalid dtype for NodeSet: {nodes.dtype}")
-        # Ensure sorted
-        nodes.sort()
-        # Ensure no duplicates
-        unique = np.diff(nodes) > 0
-        if not unique.all():
-            tmp = np.empty((unique.sum() + 1,), dtype=nodes.dtype)
-            tmp[0] = nodes[0]
-            tmp[1:] = nodes[1:][unique]
-            nodes = tmp
+        if validate:
+            if len(nodes.shape) != 1:
+                raise TypeError(f"Invalid number of dimensions: {len(nodes.shape)}")
+            if not issubclass(nodes.dtype.type, np.integer):
+                raise TypeError(f"Invalid dtype for NodeSet: {nodes.dtype}")
+            # Ensure sorted with no duplicates, leaving the caller's array unchanged
+            if len(nodes) > 1 and not (nodes[1:] > nodes[:-1]).all():
+                nodes = np.unique(nodes)
+            # Trusted node ids are kept as given; narrowing them would scan the values
+            nodes = as_index_array(nodes)
         self.value = nodes
+        self._index = _NodeIndex(self.value, positions=False)
 
     @classmethod
     def from_mask(cls, mask, *, aprops=None):
@@ -90,14 +195,25 @@ class NumpyNodeSet(NodeSetWrapper, abstract=NodeSet):
     def __iter__(self):
         return iter(self.value)
 
+    @property
+    def node_index(self) -> _NodeIndex:
+        index = getattr(self, "_index", None)
+        if index is None or index.nodes is not self.value:
+            self._index = _NodeIndex(self.value, positions=False)
+        return self._index
+
     def __contains__(self, key):
-        index = np.searchsorted(self.value, key)
-        if hasattr(index, "__len__"):
-            return (self.value[index] == key).all()
-        else:
-            return self.value[index] == key
+        if hasattr(key, "__len__"):
+            return bool(self.node_index.contains(key).all())
+        return self.node_index.locate_one(key) >= 0
 
     class TypeMixin:
+        @classmethod
+        def _estimate_size(cls, obj) -> SizeEstimate:
+            return SizeEstimate(
+                num_nodes=len(obj.value), num_edges=0, nbytes=obj.value.nbytes
+            )
+
         @classmethod
         def assert_equal(
             cls,
@@ -131,13 +247,18 @@ class NumpyNodeMap(NodeMapWrapper, abstract=NodeMap):
         are sequential and the same size as `data`.
         """
         super().__init__(aprops=aprops)
-        self._assert_instance(data, (np.ndarray, list, tuple))
+        validate = self._validating()
+        if validate:
+            self._assert_instance(data, (np.ndarray, list, tuple))
         if not isinstance(data, np.ndarray):
             data = np.array(data)
-        if len(data.shape) != 1:
+        if validate and len(data.shape) != 1:
             raise TypeError(f"Invalid number of dimensions: {len(data.shape)}")
         if nodes is None:
-            nodes = np.arange(len(data))
+            nodes = np.arange(len(data), dtype=index_dtype(len(data)))
+        elif not validate:
+            if not isinstance(nodes, np.ndarray):
+                nodes = np.array(nodes)
         else:
             self._assert_instance(nodes, (np.ndarray, list, tuple))
             if not isinstance(nodes, np.ndarray):
@@ -157,9 +278,11 @@ class NumpyNodeMap(NodeMapWrapper, abstract=NodeMap):
             unique = np.diff(nodes) > 0
             if not unique.all():
                 raise TypeError(f"Duplicate node ids found: {set(nodes[1:][~unique])}")
+            nodes = as_index_array(nodes)
 
         self.value = data
         self.nodes = nodes
+        self._index = _NodeIndex(self.nodes)
 
     @classmethod
     def from_mask(cls, data, mask, *, aprops=None):
@@ -181,20 +304,26 @@ class NumpyNodeMap(NodeMapWrapper, abstract=NodeMap):
     #     aprops = NumpyNodeMap.Type.compute_abstract_properties(self, {})
     #     return NumpyNodeMap(self.value.copy(), nodes=self.nodes.copy(), aprops=aprops)
 
+    @property
+    def node_index(self) -> _NodeIndex:
+        index = getattr(self, "_index", None)
+        if index is None or index.nodes is not self.nodes:
+            self._index = _NodeIndex(self.nodes)
+        return self._index
+
     def __contains__(self, key):
-        index = np.searchsorted(self.nodes, key)
-        if hasattr(index, "__len__"):
-            return (self.nodes[index] == key).all()
-        else:
-            return self.nodes[index] == key
+        if hasattr(key, "__len__"):
+            return bool((self.node_index.locate(key) >= 0).all())
+        return self.node_index.locate_one(key) >= 0
 
     def __getitem__(self, key):
-        index = np.searchsorted(self.nodes, key)
-        if hasattr(index, "__len__"):
-            if not (self.nodes[index] == key).all():
+        if hasattr(key, "__len__"):
+            index = self.node_index.locate(key)
+            if (index < 0).any():
                 raise KeyError(f"nodes {key} are not all in the NodeMap")
         else:
-            if self.nodes[index] != key:
+            index = self.node_index.locate_one(key)
+            if index < 0:
                 raise KeyError(f"node {key} is not in the NodeMap")
         return self.value[index]
 
@@ -212,6 +341,14 @@ class NumpyNodeMap(NodeMapWrapper, abstract=NodeMap):
 
             return ret
 
+        @classmethod
+        def _estimate_size(cls, obj) -> SizeEstimate:
+            return SizeEstimate(
+                num_nodes=len(obj.value),
+                num_edges=0,
+                nbytes=obj.value.nbytes + obj.nodes.nbytes,
+            )
+
         @classmethod
         def assert_equal(
             cls,
@@ -260,6 +397,10 @@ class NumpyMatrixType(ConcreteType, abstract=Matrix):
 
         return ret
 
+    @classmethod
+    def _estimate_size(cls, obj) -> SizeEstimate:
+        return SizeEstimate(nbytes=obj.nbytes)
+
     @classmethod
     def assert_equal(
         cls,
@@ -281,3 +422,371 @@ class NumpyMatrixType(ConcreteType, abstract=Matrix):
             assert np.isclose(obj1, obj2, rtol=rel_tol, atol=abs_tol).all().all()
         else:
             assert (obj1 == obj2).all().all()
+
+
+def _as_array(wrapper, arr, name, *, is_node_ids=False, validate=True):
+    if validate:
+        wrapper._assert_instance(arr, (np.ndarray, list, tuple))
+    if not isinstance(arr, np.ndarray):
+        arr = np.array(arr, dtype=np.int64 if is_node_ids and len(arr) == 0 else None)
+    if validate:
+        if len(arr.shape) != 1:
+            raise TypeError(
+                f"Invalid number of dimensions for {name}: {len(arr.shape)}"
+            )
+        if is_node_ids and len(arr) > 0 and not issubclass(arr.dtype.type, np.integer):
+            raise TypeError(f"Invalid dtype for {name}: {arr.dtype}")
+    if is_node_ids and validate:
+        arr = as_index_array(arr)
+    return arr
+
+
+def _check_edges(wrapper, src, dst, weights=None, *, validate=True):
+    src = _as_array(wrapper, src, "src", is_node_ids=True, validate=validate)
+    dst = _as_array(wrapper, dst, "dst", is_node_ids=True, validate=validate)
+    if validate:
+        wrapper._assert(
+            len(src) == len(dst),
+            f"src and dst sizes don't match: {len(src)} != {len(dst)}",
+        )
+    if weights is not None:
+        weights = _as_array(wrapper, weights, "weights", validate=validate)
+        if validate:
+            wrapper._assert(
+                len(weights) == len(src),
+                f"weights and edges sizes don't match: {len(weights)} != {len(src)}",
+            )
+    return src, dst, weights
+
+
+def edge_positions(src, dst, node_list=None):
+    """
+    Returns the sorted unique node ids of an edge list (unless node_list is given), along
+    with the positions of each source and destination node within them.
+    """
+    if node_list is None:
+        node_list, codes = np.unique(np.concatenate([src, dst]), return_inverse=True)
+        return node_list, codes[: len(src)], codes[len(src) :]
+    return node_list, np.searchsorted(node_list, src), np.searchsorted(node_list, dst)
+
+
+def check_edge_positions(node_list, ids, positions):
+    """
+    Raises ValueError unless every node id was found at its position in node_list
+    (as returned by `edge_positions` when node_list is given).
+    """
+    found = positions < len(node_list)
+    if found.all():
+        found = node_list[positions] == ids
+    else:
+        found[found] = node_list[positions[found]] == ids[found]
+    if not found.all():
+        raise ValueError(
+            f"Edge node ids not found in node_list: {set(ids[~found].tolist())}"
+        )
+
+
+def _sorted_edges(src, dst, is_directed):
+    """
+    Order of the edges sorted by (src, dst) along with the sorted src and dst.
+    Undirected edges are oriented with src <= dst first.
+    """
+    if not is_directed:
+        src, dst = np.minimum(src, dst), np.maximum(src, dst)
+    order = np.lexsort((dst, src))
+    return order, src[order], dst[order]
+
+
+def _assert_edges_equal(obj1, obj2, is_directed, rel_tol=None, abs_tol=None):
+    assert len(obj1.src) == len(
+        obj2.src
+    ), f"num edges mismatch: {len(obj1.src)} != {len(obj2.src)}"
+    order1, src1, dst1 = _sorted_edges(obj1.src, obj1.dst, is_directed)
+    order2, src2, dst2 = _sorted_edges(obj2.src, obj2.dst, is_directed)
+    assert (src1 == src2).all() and (dst1 == dst2).all(), "edge mismatch"
+    if getattr(obj1, "weights", None) is not None:
+        vals1 = obj1.weights[order1]
+        vals2 = obj2.weights[order2]
+        if issubclass(vals1.dtype.type, np.floating):
+            assert np.isclose(vals1, vals2, rtol=rel_tol, atol=abs_tol).all()
+        else:
+            assert (vals1 == vals2).all()
+
+
+def _has_negative_weights(weights, dtype):
+    if dtype in {"bool", "str"}:
+        return None
+    return bool(len(weights) > 0 and weights.min() < 0)
+
+
+class NumpyEdgeSet(EdgeSetWrapper, abstract=EdgeSet):
+    """
+    Edge list stored as numpy arrays of source and destination node ids.
+    Undirected edges are listed once, in either direction.
+    """
+
+    def __init__(self, src, dst, *, is_directed=True, aprops=None):
+        super().__init__(aprops=aprops)
+        self.src, self.dst, _ = _check_edges(
+            self, src, dst, validate=self._validating()
+        )
+        self.is_directed = is_directed
+
+    @property
+    def num_nodes(self):
+        return len(np.unique(np.concatenate([self.src, self.dst])))
+
+    class TypeMixin:
+        @classmethod
+        def _compute_abstract_properties(
+            cls, obj, props: Set[str], known_props: Dict[str, Any]
+        ) -> Dict[str, Any]:
+            ret = known_props.copy()
+
+            # fast properties
+            for prop in {"is_directed"} - ret.keys():
+                if prop == "is_directed":
+                    ret[prop] = obj.is_directed
+
+            return ret
+
+        @classmethod
+        def _estimate_size(cls, obj) -> SizeEstimate:
+            return SizeEstimate(
+                num_edges=len(obj.src), nbytes=obj.src.nbytes + obj.dst.nbytes
+            )
+
+        @classmethod
+        def assert_equal(
+            cls,
+            obj1,
+            obj2,
+            aprops1,
+            aprops2,
+            cprops1,
+            cprops2,
+            *,
+            rel_tol=None,
+            abs_tol=None,
+        ):
+            assert aprops1 == aprops2, f"property mismatch: {aprops1} != {aprops2}"
+            _assert_edges_equal(obj1, obj2, aprops1["is_directed"])
+
+
+class NumpyEdgeMap(EdgeMapWrapper, abstract=EdgeMap):
+    """
+    Edge list stored as numpy arrays of source node ids, destination node ids and weights.
+    Undirected edges are listed once, in either direction.
+    """
+
+    def __init__(self, src, dst, weights, *, is_directed=True, aprops=None):
+        super().__init__(aprops=aprops)
+        self.src, self.dst, self.weights = _check_edges(
+            self, src, dst, weights, validate=self._validating()
+        )
+        self.is_directed = is_directed
+
+    @property
+    def num_nodes(self):
+        return len(np.unique(np.concatenate([self.src, self.dst])))
+
+    class TypeMixin:
+        @classmethod
+        def _compute_abstract_properties(
+            cls, obj, props: Set[str], known_props: Dict[str, Any]
+        ) -> Dict[str, Any]:
+            ret = known_props.copy()
+
+            # fast properties
+            for prop in {"is_directed", "dtype"} - ret.keys():
+                if prop == "is_directed":
+                    ret[prop] = obj.is_directed
+                if prop == "dtype":
+                    ret[prop] = dtypes.dtypes_simplified[obj.weights.dtype]
+
+            # slow properties, only compute if asked
+            for prop in props - ret.keys():
+                if prop == "has_negative_weights":
+                    ret[prop] = _has_negative_weights(obj.weights, ret["dtype"])
+
+            return ret
+
+        @classmethod
+        def _estimate_size(cls, obj) -> SizeEstimate:
+            return SizeEstimate(
+                num_edges=len(obj.src),
+                nbytes=obj.src.nbytes + obj.dst.nbytes + obj.weights.nbytes,
+            )
+
+        @classmethod
+        def assert_equal(
+            cls,
+            obj1,
+            obj2,
+            aprops1,
+            aprops2,
+            cprops1,
+            cprops2,
+            *,
+            rel_tol=1e-9,
+            abs_tol=0.0,
+        ):
+            assert aprops1 == aprops2, f"property mismatch: {aprops1} != {aprops2}"
+            _assert_edges_equal(
+                obj1, obj2, aprops1["is_directed"], rel_tol=rel_tol, abs_tol=abs_tol
+            )
+
+
+class NumpyGraph(GraphWrapper, abstract=Graph):
+    """
+    Graph stored as numpy arrays of source node ids, destination node ids and (optionally)
+    weights. Undirected edges are listed once, in either direction.
+    node_list contains all node ids; it defaults to the nodes found in the edges.
+    node_vals (if populated) contains node weights aligned with node_list.
+    Node ids of the edges must be in node_list.
+    """
+
+    def __init__(
+        self,
+        src,
+        dst,
+        weights=None,
+        node_list=None,
+        node_vals=None,
+        *,
+        is_directed=True,
+        aprops=None,
+    ):
+        super().__init__(aprops=aprops)
+        validate = self._validating()
+        src, dst, weights = _check_edges(self, src, dst, weights, validate=validate)
+        given_node_list = node_list is not None
+        if node_list is None:
+            self._assert(
+                node_vals is None, "node_list is required when node_vals are given"
+            )
+            node_list = np.unique(np.concatenate([src, dst]))
+        else:
+            node_list = _as_array(
+                self, node_list, "node_list", is_node_ids=True, validate=validate
+            )
+        if node_vals is not None:
+            node_vals = _as_array(self, node_vals, "node_vals", validate=validate)
+            if validate:
+                self._assert(
+                    len(node_list) == len(node_vals),
+                    f"node vals size ({len(node_vals)}) and node list size ({len(node_list)}) don't match",
+                )
+        # Ensure sorted
+        if (
+            validate
+            and len(node_list) > 1
+            and not (node_list[1:] > node_list[:-1]).all()
+        ):
+            sorter = np.argsort(node_list)
+            node_list = node_list[sorter]
+            if node_vals is not None:
+                node_vals = node_vals[sorter]
+            unique = node_list[1:] > node_list[:-1]
+            if not unique.all():
+                raise TypeError(
+                    f"Duplicate node ids found: {set(node_list[1:][~unique])}"
+                )
+        if validate and given_node_list:
+            missing = np.setdiff1d(np.concatenate([src, dst]), node_list)
+            self._assert(
+                len(missing) == 0,
+                f"Edge node ids not found in node_list: {set(missing.tolist())}",
+            )
+        self.src = src
+        self.dst = dst
+        self.weights = weights
+        self.node_list = node_list
+        self.node_vals = node_vals
+        self.is_directed = is_directed
+
+    class TypeMixin:
+        @classmethod
+        def _compute_abstract_properties(
+            cls, obj, props: Set[str], known_props: Dict[str, Any]
+        ) -> Dict[str, Any]:
+            ret = known_props.copy()
+
+            # fast properties
+            for prop in {
+                "is_directed",
+                "node_type",
+                "edge_type",
+                "node_dtype",
+                "edge_dtype",
+            } - ret.keys():
+                if prop == "is_directed":
+                    ret[prop] = obj.is_directed
+                elif prop == "node_type":
+                    ret[prop] = "set" if obj.node_vals is None else "map"
+                elif prop == "edge_type":
+                    ret[prop] = "set" if obj.weights is None else "map"
+                elif prop == "node_dtype":
+                    ret[prop] = (
+                        None
+                        if obj.node_vals is None
+                        else dtypes.dtypes_simplified[obj.node_vals.dtype]
+                    )
+                elif prop == "edge_dtype":
+                    ret[prop] = (
+                        None
+                        if obj.weights is None
+                        else dtypes.dtypes_simplified[obj.weights.dtype]
+                    )
+
+            # slow properties, only compute if asked
+            for prop in props - ret.keys():
+                if prop == "edge_has_negative_weights":
+                    if obj.weights is None:
+                        ret[prop] = None
+                    else:
+                        ret[prop] = _has_negative_weights(
+                            obj.weights, ret["edge_dtype"]
+                        )
+
+            return ret
+
+        @classmethod
+        def _estimate_size(cls, obj) -> SizeEstimate:
+            nbytes = obj.src.nbytes + obj.dst.nbytes + obj.node_list.nbytes
+            for arr in (obj.weights, obj.node_vals):
+                if arr is not None:
+                    nbytes += arr.nbytes
+            return SizeEstimate(
+                num_nodes=len(obj.node_list), num_edges=len(obj.src), nbytes=nbytes
+            )
+
+        @classmethod
+        def assert_equal(
+            cls,
+            obj1,
+            obj2,
+            aprops1,
+            aprops2,
+            cprops1,
+            cprops2,
+            *,
+            rel_tol=1e-9,
+            abs_tol=0.0,
+        ):
+            assert aprops1 == aprops2, f"property mismatch: {aprops1} != {aprops2}"
+            assert len(obj1.node_list) == len(
+                obj2.node_list
+            ), f"num nodes mismatch: {len(obj1.node_list)} != {len(obj2.node_list)}"
+            assert (
+                obj1.node_list == obj2.node_list
+            ).all(), f"node list mismatch: {obj1.node_list} != {obj2.node_list}"
+            if aprops1["node_type"] == "map":
+                vals1, vals2 = obj1.node_vals, obj2.node_vals
+                if issubclass(vals1.dtype.type, np.floating):
+                    assert np.isclose(vals1, vals2, rtol=rel_tol, atol=abs_tol).all()
+                else:
+                    assert (vals1 == vals2).all()
+            _assert_edges_equal(
+                obj1, obj2, aprops1["is_directed"], rel_tol=rel_tol, abs_tol=abs_tol
+            )
@@ -13,7 +13,7 @@ if has_pandas:
     ) -> PandasEdgeMap:
         new_df = edgeset.value.copy()
         new_df["weight"] = pd.Series(np.full(len(new_df), default_value))
-        return PandasEdgeMap(
+        return PandasEdgeMap.trusted(
             new_df,
             src_label=edgeset.src_label,
             dst_label=edgeset.dst_label,
@@ -2,17 +2,28 @@ from metagraph import translator
 from metagraph.plugins import has_pandas, has_networkx, has_scipy
 
 if has_pandas:
+    import pandas as pd
     from .types import PandasEdgeMap, PandasEdgeSet
+    from ..numpy.types import NumpyEdgeSet, NumpyEdgeMap
 
     @translator
     def edgemap_to_edgeset(x: PandasEdgeMap, **props) -> PandasEdgeSet:
-        return PandasEdgeSet(
+        return PandasEdgeSet.trusted(
             x.value, x.src_label, x.dst_label, is_directed=x.is_directed
         )
 
+    @translator
+    def edgemap_from_numpy(x: NumpyEdgeMap, **props) -> PandasEdgeMap:
+        df = pd.DataFrame({"source": x.src, "target": x.dst, "weight": x.weights})
+        return PandasEdgeMap(df, is_directed=x.is_directed)
+
+    @translator
+    def edgeset_from_numpy(x: NumpyEdgeSet, **props) -> PandasEdgeSet:
+        df = pd.DataFrame({"source": x.src, "target": x.dst})
+        return PandasEdgeSet(df, is_directed=x.is_directed)
+
 
 if has_pandas and has_scipy:
-    import pandas as pd
     from ..scipy.types import ScipyEdgeMap, ScipyEdgeSet
 
     @translator
@@ -30,7 +41,7 @@ if has_pandas and has_scipy:
             column_ids = column_ids[mask]
             weights = weights[mask]
         df = pd.DataFrame({"source": row_ids, "target": column_ids, "weight": weights})
-        return PandasEdgeMap(df, is_directed=is_directed)
+        return PandasEdgeMap.trusted(df, is_directed=is_directed)
 
     @translator
     def edgeset_from_scipy(x: ScipyEdgeSet, **props) -> PandasEdgeSet:
@@ -45,4 +56,4 @@ if has_pandas and has_scipy:
             row_ids = row_ids[mask]
             column_ids = column_ids[mask]
         df = pd.DataFrame({"source": row_ids, "target": column_ids})
-        return PandasEdgeSet(df, is_directed=is_directed)
+        return PandasEdgeSet.trusted(df, is_directed=is_directed)
@@ -1,6 +1,11 @@
+import threading
+import weakref
+from collections import OrderedDict
 import numpy as np
+from dask.utils import parse_bytes
 from typing import Set, Dict, Any
-from metagraph import ConcreteType, dtypes
+from metagraph import ConcreteType, dtypes, config
+from metagraph.core.typecache import SizeEstimate
 from ..core.types import DataFrame, EdgeSet, EdgeMap
 from ..core.wrappers import EdgeSetWrapper, EdgeMapWrapper
 from metagraph.plugins import has_pandas
@@ -10,9 +15,89 @@ import math
 if has_pandas:
     import pandas as pd
 
+    def _frame_nbytes(df):
+        # Shallow memory usage; object columns only count the pointers
+        return int(df.memory_usage(index=True, deep=False).sum())
+
+    # Results of edge_positions, keyed by (id of frame, src_label, dst_label), in least
+    # recently used order and bounded by `core.memory.edge_positions_cache`
+    _edge_positions_cache = OrderedDict()
+    _edge_positions_lock = threading.Lock()
+
+    def _edge_positions_cache_limit():
+        limit = config.get("core.memory.edge_positions_cache", "256MB")
+        if isinstance(limit, str):
+            return parse_bytes(limit)
+        return int(limit)
+
+    def _positions_nbytes(result):
+        return sum(arr.nbytes for arr in result)
+
+    def _forget_frame(frame_id):
+        with _edge_positions_lock:
+            for key in [k for k in _edge_positions_cache if k[0] == frame_id]:
+                del _edge_positions_cache[key]
+
+    def edge_positions(df, src_label, dst_label):
+        """
+        Returns the sorted unique node ids of an edge list, along with the positions of
+        each source and destination node within them.
+
+        Recent results are cached while the frame is alive, so translations of several
+        wrappers sharing one frame factorize the node ids only once. Frames must not be
+        modified in place after they are wrapped.
+        """
+        key = (id(df), src_label, dst_label)
+        with _edge_positions_lock:
+            cached = _edge_positions_cache.get(key)
+            if cached is not None:
+                _edge_positions_cache.move_to_end(key)
+                return cached
+
+        src = df[src_label].values
+        codes, node_list = pd.factorize(
+            np.concatenate([src, df[dst_label].values]), sort=True
+        )
+        result = (np.asarray(node_list), codes[: len(src)], codes[len(src) :])
+
+        limit = _edge_positions_cache_limit()
+        if _positions_nbytes(result) > limit:
+            return result
+        with _edge_positions_lock:
+            if not any(k[0] == id(df) for k in _edge_positions_cache):
+                weakref.finalize(df, _forget_frame, id(df))
+            _edge_positions_cache[key] = result
+            total = sum(map(_positions_nbytes, _edge_positions_cache.values()))
+            while total > limit:
+                _, evicted = _edge_positions_cache.popitem(last=False)
+                total -= _positions_nbytes(evicted)
+        return result
+
+    def _check_labels(wrapper, df, src_label, dst_label, weight_label=None):
+        wrapper._assert(src_label in df, f"Indicated src_label not found: {src_label}")
+        wrapper._assert(dst_label in df, f"Indicated dst_label not found: {dst_label}")
+        if weight_label is not None:
+            wrapper._assert(
+                weight_label in df, f"Indicated weight_label not found: {weight_label}"
+            )
+
+    def _check_no_reversed_duplicates(wrapper):
+        # Undirected edges must not also be listed reversed (ignoring self-loops)
+        df, src_label, dst_label = wrapper.value, wrapper.src_label, wrapper.dst_label
+        rev_index = (
+            df[df[src_label] != df[dst_label]].set_index([dst_label, src_label]).index
+        )
+        dups = wrapper.index.intersection(rev_index)
+        if len(dups) > 0:
+            raise ValueError(f"is_directed=False, but duplicate edges found: {dups}")
+
     class PandasDataFrameType(ConcreteType, abstract=DataFrame):
         value_type = pd.DataFrame
 
+        @classmethod
+        def _estimate_size(cls, obj) -> SizeEstimate:
+            return SizeEstimate(nbytes=_frame_nbytes(obj))
+
         @classmethod
         def assert_equal(
             cls,
@@ -47,28 +132,26 @@ if has_pandas:
             aprops=None,
         ):
             super().__init__(aprops=aprops)
-            self._assert_instance(df, pd.DataFrame)
+            validate = self._validating()
+            if validate:
+                self._assert_instance(df, pd.DataFrame)
+                _check_labels(self, df, src_label, dst_label)
             self.value = df
             self.is_directed = is_directed
             self.src_label = src_label
             self.dst_label = dst_label
-            self._assert(src_label in df, f"Indicated src_label not found: {src_label}")
-            self._assert(dst_label in df, f"Indicated dst_label not found: {dst_label}")
-            # Build the MultiIndex representing the edges
-            self.index = df.set_index([src_label, dst_label]).index
-
-            if not is_directed:
-                # Ensure no duplicates (ignoring self-loops)
-                rev_index = (
-                    df[df[src_label] != df[dst_label]]
-                    .set_index([dst_label, src_label])
-                    .index
-                )
-                dups = self.index.intersection(rev_index)
-                if len(dups) > 0:
-                    raise ValueError(
-                        f"is_directed=False, but duplicate edges found: {dups}"
-                    )
+            self._index = None
+            if validate and not is_directed:
+                _check_no_reversed_duplicates(self)
+
+        @property
+        def index(self):
+            """MultiIndex of the (src, dst) edges, built on first use"""
+            if self._index is None:
+                self._index = self.value.set_index(
+                    [self.src_label, self.dst_label]
+                ).index
+            return self._index
 
         @property
         def num_nodes(self):
@@ -97,6 +180,13 @@ if has_pandas:
 
                 return ret
 
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                # Counting nodes or building the edge index would be O(E)
+                return SizeEstimate(
+                    num_edges=len(obj.value), nbytes=_frame_nbytes(obj.value)
+                )
+
             @classmethod
             def assert_equal(
                 cls,
@@ -154,32 +244,27 @@ if has_pandas:
             :param node_label:
             """
             super().__init__(aprops=aprops)
-            self._assert_instance(df, pd.DataFrame)
+            validate = self._validating()
+            if validate:
+                self._assert_instance(df, pd.DataFrame)
+                _check_labels(self, df, src_label, dst_label, weight_label)
             self.value = df
             self.is_directed = is_directed
             self.src_label = src_label
             self.dst_label = dst_label
             self.weight_label = weight_label
-            self._assert(src_label in df, f"Indicated src_label not found: {src_label}")
-            self._assert(dst_label in df, f"Indicated dst_label not found: {dst_label}")
-            self._assert(
-                weight_label in df, f"Indicated weight_label not found: {weight_label}"
-            )
-            # Build the MultiIndex representing the edges
-            self.index = df.set_index([src_label, dst_label]).index
-
-            if not is_directed:
-                # Ensure no duplicates (ignoring self-loops)
-                rev_index = (
-                    df[df[src_label] != df[dst_label]]
-                    .set_index([dst_label, src_label])
-                    .index
-                )
-                dups = self.index.intersection(rev_index)
-                if len(dups) > 0:
-                    raise ValueError(
-                        f"is_directed=False, but duplicate edges found: {dups}"
-                    )
+            self._index = None
+            if validate and not is_directed:
+                _check_no_reversed_duplicates(self)
+
+        @property
+        def index(self):
+            """MultiIndex of the (src, dst) edges, built on first use"""
+            if self._index is None:
+                self._index = self.value.set_index(
+                    [self.src_label, self.dst_label]
+                ).index
+            return self._index
 
         @property
         def num_nodes(self):
@@ -223,6 +308,13 @@ if has_pandas:
 
                 return ret
 
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                # Counting nodes or building the edge index would be O(E)
+                return SizeEstimate(
+                    num_edges=len(obj.value), nbytes=_frame_nbytes(obj.value)
+                )
+
             @classmethod
             def assert_equal(
                 cls,
@@ -9,17 +9,17 @@ def nodemap_to_nodeset(x: PythonNodeMapType, **props) -> PythonNodeSetType:
     return set(x)
 
 
-@translator
+@translator(memory_expansion=6)
 def nodeset_from_numpy(x: NumpyNodeSet, **props) -> PythonNodeSetType:
     return set(x.value.tolist())
 
 
-@translator
+@translator(memory_expansion=6)
 def nodemap_from_numpy(x: NumpyNodeMap, **props) -> PythonNodeMapType:
     return dict(zip(x.nodes.tolist(), x.value.tolist()))
 
 
-@translator
+@translator(memory_expansion=6)
 def nodeset_from_numpy_nodemap(x: NumpyNodeMap, **props) -> PythonNodeSetType:
     return set(x.nodes.tolist())
 
@@ -27,7 +27,7 @@ def nodeset_from_numpy_nodemap(x: NumpyNodeMap, **props) -> PythonNodeSetType:
 if has_grblas:
     from ..graphblas.types import GrblasNodeMap
 
-    @translator
+    @translator(memory_expansion=6)
     def nodemap_from_graphblas(x: GrblasNodeMap, **props) -> PythonNodeMapType:
         idx, vals = x.value.to_values()
         return dict(zip(idx.tolist(), vals.tolist()))
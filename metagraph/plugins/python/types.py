@@ -1,7 +1,9 @@
 from typing import Set, Dict, Any
 import math
+import sys
 from ..core.types import NodeSet, NodeMap
 from metagraph import ConcreteType
+from metagraph.core.typecache import SizeEstimate
 
 
 dtype_casting = {"str": str, "float": float, "int": int, "bool": bool}
@@ -9,6 +11,15 @@ dtype_casting = {"str": str, "float": float, "int": int, "bool": bool}
 
 class PythonNodeSetType(ConcreteType, abstract=NodeSet):
     value_type = set
+    gil_bound = True
+
+    @classmethod
+    def _estimate_size(cls, obj) -> SizeEstimate:
+        # Assume all elements are the same size as the first one
+        nbytes = sys.getsizeof(obj)
+        if obj:
+            nbytes += len(obj) * sys.getsizeof(next(iter(obj)))
+        return SizeEstimate(num_nodes=len(obj), num_edges=0, nbytes=nbytes)
 
     @classmethod
     def assert_equal(
@@ -31,6 +42,7 @@ class PythonNodeSetType(ConcreteType, abstract=NodeSet):
 
 class PythonNodeMapType(ConcreteType, abstract=NodeMap):
     value_type = dict
+    gil_bound = True
 
     @classmethod
     def _compute_abstract_properties(
@@ -52,6 +64,15 @@ class PythonNodeMapType(ConcreteType, abstract=NodeMap):
 
         return ret
 
+    @classmethod
+    def _estimate_size(cls, obj) -> SizeEstimate:
+        # Assume all keys and values are the same size as the first ones
+        nbytes = sys.getsizeof(obj)
+        if obj:
+            key, val = next(iter(obj.items()))
+            nbytes += len(obj) * (sys.getsizeof(key) + sys.getsizeof(val))
+        return SizeEstimate(num_nodes=len(obj), num_edges=0, nbytes=nbytes)
+
     @classmethod
     def assert_equal(
         cls,
@@ -14,10 +14,14 @@ if has_scipy:
     import scipy.sparse as ss
     from ..numpy.types import NumpyNodeMap, NumpyNodeSet, NumpyVectorType
 
+    # Traversals and max flow use scipy.sparse.csgraph, which works on CSR matrices
+    ScipyCSRGraph = ScipyGraph.Type(format="csr")
+
     @concrete_algorithm("clustering.connected_components")
     def ss_connected_components(graph: ScipyGraph) -> NumpyNodeMap:
+        # Edges are followed in both directions, so one triangle of an undirected graph suffices
         _, node_labels = ss.csgraph.connected_components(
-            graph.value, False, return_labels=True
+            graph.stored, False, return_labels=True
         )
         return NumpyNodeMap(node_labels, nodes=graph.node_list)
 
@@ -49,6 +53,13 @@ if has_scipy:
 
     @concrete_algorithm("traversal.minimum_spanning_tree")
     def ss_minimum_spanning_tree(graph: ScipyGraph) -> ScipyGraph:
+        if graph.storage == "upper":
+            # The tree only uses entries of the stored triangle, so it has the same storage
+            span_tree = ss.csgraph.minimum_spanning_tree(graph.stored)
+            span_tree = span_tree.astype(graph.stored.dtype, copy=False)
+            return ScipyGraph(
+                span_tree, graph.node_list, graph.node_vals, storage="upper"
+            )
         span_tree = ss.csgraph.minimum_spanning_tree(graph.value)
         span_tree_mask = (span_tree != 0).astype(int, copy=False)
         span_tree_mask_transposed = span_tree_mask.T
@@ -62,57 +73,85 @@ if has_scipy:
         )
         return ScipyGraph(undirected_span_tree, graph.node_list, graph.node_vals)
 
+    @concrete_algorithm("centrality.degree")
+    def ss_degree_centrality(
+        graph: ScipyGraph, in_edges: bool, out_edges: bool
+    ) -> NumpyNodeMap:
+        num_nodes = len(graph.node_list)
+        degrees = np.zeros(num_nodes, dtype=np.int64)
+        if not in_edges and not out_edges:
+            return NumpyNodeMap.trusted(degrees, nodes=graph.node_list)
+        is_directed = ScipyGraph.Type.compute_abstract_properties(
+            graph, {"is_directed"}
+        )["is_directed"]
+        if num_nodes == 1:
+            # Like networkx, a lone node is connected to every other node
+            degrees += 1 if not is_directed else in_edges + out_edges
+            return NumpyNodeMap.trusted(degrees, nodes=graph.node_list)
+        if not is_directed:
+            # Degrees of an undirected graph come from one triangle, with self-loops
+            # counted twice
+            degrees += graph.derived.out_degrees
+            degrees += _has_self_loop(graph.derived.asformat("csr"))
+        else:
+            if in_edges:
+                degrees += graph.derived.in_degrees
+            if out_edges:
+                degrees += graph.derived.out_degrees
+        return NumpyNodeMap.trusted(degrees / (num_nodes - 1), nodes=graph.node_list)
+
+    def _has_self_loop(csr: ss.csr_matrix) -> np.ndarray:
+        """Whether each row has a stored diagonal entry, even if its value is zero"""
+        rows = np.repeat(np.arange(csr.shape[0]), np.diff(csr.indptr))
+        has_loop = np.zeros(csr.shape[0], dtype=bool)
+        has_loop[rows[rows == csr.indices]] = True
+        return has_loop
+
+    def _structure(csr: ss.csr_matrix) -> ss.csr_matrix:
+        """Matrix with the same stored entries as csr, all set to 1"""
+        return ss.csr_matrix(
+            (np.ones(csr.nnz, dtype=np.int64), csr.indices, csr.indptr), shape=csr.shape
+        )
+
     @concrete_algorithm("clustering.triangle_count")
     def ss_triangle_count(graph: ScipyGraph) -> int:
         """
         Uses the triangle counting method described in
         https://www.sandia.gov/~srajama/publications/Tricount-HPEC.pdf
         """
-        props = ScipyGraph.Type.compute_abstract_properties(graph, {"edge_type"})
-        if props["edge_type"] == "map":
-            # Drop weights before performing triangle count
-            m = graph.value.copy()
-            m.data = np.ones_like(m.data)
-        elif props["edge_type"] == "set":
-            m = graph.value
-        L = ss.tril(m, k=-1).tocsr()
-        U = ss.triu(m, k=1).tocsc()
+        # Only the structure of the (cached) triangles is used, so weights are dropped
+        L = _structure(graph.derived.lower)
+        U = _structure(graph.derived.upper)
         return int((L @ U.T).multiply(L).sum())
 
+    # Undirected graphs are stored symmetrically, so traversing them as directed graphs
+    # visits the same nodes in the same order without scipy building the transpose
+
     @concrete_algorithm("traversal.bfs_iter")
     def ss_breadth_first_search_iter(
-        graph: ScipyGraph, source_node: NodeID, depth_limit: int
+        graph: ScipyCSRGraph, source_node: NodeID, depth_limit: int
     ) -> NumpyVectorType:
         if depth_limit != -1:  # TODO support depth_limit
             warnings.warn("scipy does not limit bfs_iter based on depth_limit")
-        is_directed = ScipyGraph.Type.compute_abstract_properties(
-            graph, {"is_directed"}
-        )["is_directed"]
         node_list: np.ndarray = graph.node_list
         source_node_position = np.flatnonzero(node_list == source_node).item()
         bfs_ordered_incides = ss.csgraph.breadth_first_order(
-            graph.value,
-            source_node_position,
-            directed=is_directed,
-            return_predecessors=False,
+            graph.value, source_node_position, directed=True, return_predecessors=False,
         )
         bfs_ordered_nodes = graph.node_list[bfs_ordered_incides]
         return bfs_ordered_nodes
 
     @concrete_algorithm("traversal.bfs_tree")
     def ss_breadth_first_search_tree(
-        graph: ScipyGraph, source_node: NodeID, depth_limit: int
+        graph: ScipyCSRGraph, source_node: NodeID, depth_limit: int
     ) -> Tuple[NumpyNodeMap, NumpyNodeMap]:
         """Specifying a depth_limit does not limit the work as an exhaustive search is performed first and results are fitlered after."""
 
-        is_directed = ScipyGraph.Type.compute_abstract_properties(
-            graph, {"is_directed"}
-        )["is_directed"]
         node_list: np.ndarray = graph.node_list
         depth_limit = len(node_list) - 1 if depth_limit == -1 else depth_limit
         source_node_position = np.flatnonzero(node_list == source_node).item()
         bfs_tree_csr = ss.csgraph.breadth_first_tree(  # depth_limit is not used here!
-            graph.value, source_node_position, directed=is_directed
+            graph.value, source_node_position, directed=True
         ).astype(bool)
 
         # Calcuate Depths
@@ -149,36 +188,24 @@ if has_scipy:
 
     @concrete_algorithm("traversal.dfs_iter")
     def ss_depth_first_search_iter(
-        graph: ScipyGraph, source_node: NodeID
+        graph: ScipyCSRGraph, source_node: NodeID
     ) -> NumpyVectorType:
-        is_directed = ScipyGraph.Type.compute_abstract_properties(
-            graph, {"is_directed"}
-        )["is_directed"]
         node_list: np.ndarray = graph.node_list
         source_node_position = np.flatnonzero(node_list == source_node).item()
         dfs_ordered_incides = ss.csgraph.depth_first_order(
-            graph.value,
-            source_node_position,
-            directed=is_directed,
-            return_predecessors=False,
+            graph.value, source_node_position, directed=True, return_predecessors=False,
         )
         dfs_ordered_nodes = graph.node_list[dfs_ordered_incides]
         return dfs_ordered_nodes
 
     @concrete_algorithm("traversal.dfs_tree")
     def ss_depth_first_search_tree(
-        graph: ScipyGraph, source_node: NodeID
+        graph: ScipyCSRGraph, source_node: NodeID
     ) -> NumpyNodeMap:
-        is_directed = ScipyGraph.Type.compute_abstract_properties(
-            graph, {"is_directed"}
-        )["is_directed"]
         node_list: np.ndarray = graph.node_list
         source_node_position = np.flatnonzero(node_list == source_node).item()
         _, predecessor_positions = ss.csgraph.depth_first_order(
-            graph.value,
-            source_node_position,
-            directed=is_directed,
-            return_predecessors=True,
+            graph.value, source_node_position, directed=True, return_predecessors=True,
         )
         predecessor_positions[source_node_position] = source_node_position
         reachable_nodes_mask = predecessor_positions != -9999
@@ -191,7 +218,7 @@ if has_scipy:
 
     @concrete_algorithm("flow.max_flow")
     def ss_max_flow(
-        graph: ScipyGraph, source_node: NodeID, target_node: NodeID,
+        graph: ScipyCSRGraph, source_node: NodeID, target_node: NodeID,
     ) -> Tuple[float, ScipyGraph]:
         max_flow_result = ss.csgraph.maximum_flow(graph.value, source_node, target_node)
         flow_value = max_flow_result.flow_value
@@ -233,7 +260,7 @@ if has_scipy:
         nrows = graph.value.shape[0]
         agg_values = np.full(nrows, initial_value)
         if in_edges:
-            csc_matrix = graph.value.tocsc()
+            csc_matrix = graph.derived.csc
             in_edges_aggregated_values, keep_mask = _reduce_sparse_matrix(
                 func, csc_matrix
             )
@@ -241,7 +268,7 @@ if has_scipy:
                 agg_values[keep_mask], in_edges_aggregated_values
             )
         if out_edges:
-            csr_matrix = graph.value.tocsr()
+            csr_matrix = graph.derived.csr
             out_edges_aggregated_values, keep_mask = _reduce_sparse_matrix(
                 func, csr_matrix
             )
@@ -4,7 +4,48 @@ import numpy as np
 
 if has_scipy:
     import scipy.sparse as ss
-    from .types import ScipyEdgeMap, ScipyEdgeSet
+    from .types import ScipyEdgeMap, ScipyEdgeSet, ScipyGraph, _convert_layout
+
+    # Translators from a type to itself enforce the `format` and `has_sorted_indices`
+    # concrete properties (and `storage` for graphs). The planner adds them when an
+    # algorithm requires a layout, and conversions are cached on the source, so each one
+    # happens at most once per matrix.
+
+    @translator
+    def edgeset_to_edgeset(
+        x: ScipyEdgeSet, *, format=None, has_sorted_indices=None, **props
+    ) -> ScipyEdgeSet:
+        m = _convert_layout(x, format, has_sorted_indices)
+        if m is x.value:
+            return x
+        aprops = ScipyEdgeSet.Type.get_typeinfo(x).known_abstract_props
+        return ScipyEdgeSet.trusted(m, x.node_list, aprops=aprops)
+
+    @translator
+    def edgemap_to_edgemap(
+        x: ScipyEdgeMap, *, format=None, has_sorted_indices=None, **props
+    ) -> ScipyEdgeMap:
+        m = _convert_layout(x, format, has_sorted_indices)
+        if m is x.value:
+            return x
+        aprops = ScipyEdgeMap.Type.get_typeinfo(x).known_abstract_props
+        return ScipyEdgeMap.trusted(m, x.node_list, aprops=aprops)
+
+    @translator
+    def graph_to_graph(
+        x: ScipyGraph, *, format=None, has_sorted_indices=None, storage=None, **props
+    ) -> ScipyGraph:
+        if storage == "upper" and x.storage != "upper":
+            aprops = ScipyGraph.Type.compute_abstract_properties(x, {"is_directed"})
+            if aprops["is_directed"]:
+                raise ValueError("upper storage is only valid for undirected graphs")
+        m = _convert_layout(x, format, has_sorted_indices, storage)
+        if m is x.stored:
+            return x
+        aprops = ScipyGraph.Type.get_typeinfo(x).known_abstract_props
+        return ScipyGraph.trusted(
+            m, x.node_list, x.node_vals, storage=storage or x.storage, aprops=aprops
+        )
 
     @translator
     def edgemap_to_edgeset(x: ScipyEdgeMap, **props) -> ScipyEdgeSet:
@@ -16,28 +57,40 @@ if has_scipy:
 
 
 if has_scipy and has_networkx:
-    import networkx as nx
-    from .types import ScipyGraph
-    from ..networkx.types import NetworkXGraph
+    from ..networkx.types import NetworkXGraph, adjacency_arrays
 
-    @translator
-    def graph_from_networkx(x: NetworkXGraph, **props) -> ScipyGraph:
+    @translator(memory_expansion=0.05)
+    def graph_from_networkx(x: NetworkXGraph, *, storage="full", **props) -> ScipyGraph:
         aprops = NetworkXGraph.Type.compute_abstract_properties(
             x, {"node_type", "edge_type", "node_dtype", "edge_dtype", "is_directed"}
         )
-        node_list = list(sorted(x.value.nodes()))
+        adj = x.value._adj
+        node_list = np.array(sorted(adj))
+        num_nodes = len(node_list)
         node_vals = None
         if aprops["node_type"] == "map":
+            node_attrs = x.value._node
             node_vals = np.array(
-                [x.value.nodes[n].get(x.node_weight_label) for n in node_list]
+                [node_attrs[n].get(x.node_weight_label) for n in node_list.tolist()]
             )
 
+        # Neighbor ids and weights are read straight from the adjacency dicts and
+        # mapped to positions in bulk
         weight = x.edge_weight_label if aprops["edge_type"] == "map" else None
-        m = nx.convert_matrix.to_scipy_sparse_matrix(
-            x.value, nodelist=node_list, weight=weight,
-        )
+        src, dst, data = adjacency_arrays(x.value, weight)
+        if data is None:
+            data = np.ones(len(src), dtype=np.int64)
+        rows = np.searchsorted(node_list, src)
+        cols = np.searchsorted(node_list, dst)
+        if storage == "upper" and not aprops["is_directed"]:
+            # Keep the copy of each undirected edge which lies in the upper triangle
+            upper = rows <= cols
+            rows, cols, data = rows[upper], cols[upper], data[upper]
+        else:
+            storage = "full"
+        m = ss.coo_matrix((data, (rows, cols)), shape=(num_nodes, num_nodes)).tocsr()
 
-        return ScipyGraph(m, node_list, node_vals, aprops=aprops)
+        return ScipyGraph(m, node_list, node_vals, storage=storage, aprops=aprops)
 
 
 if has_scipy and has_grblas:
@@ -47,32 +100,51 @@ if has_scipy and has_grblas:
         GrblasGraph,
         GrblasEdgeSet,
         GrblasEdgeMap,
-        dtype_grblas_to_mg,
         find_active_nodes,
     )
 
+    def _csr_from_graphblas(matrix, node_list, *, is_set=False):
+        """
+        scipy.sparse.csr_matrix of matrix[node_list, node_list] using the CSR buffers
+        exported from SuiteSparse. node_list must be sorted.
+        """
+        if len(node_list) == matrix.nrows:
+            # Every node is present, so no extraction is needed; the export copies the
+            # buffers of matrix
+            pieces = matrix.ss.export("csr", sort=True)
+        else:
+            compressed = matrix[node_list, node_list].new()
+            pieces = compressed.ss.export("csr", sort=True, give_ownership=True)
+        nvals = len(pieces["col_indices"])
+        if is_set:
+            data = np.ones(nvals, dtype=bool)
+        elif pieces.get("is_uniform"):
+            # Matrices with a single value only store it once
+            data = np.full(nvals, pieces["values"][0])
+        else:
+            data = pieces["values"]
+        # The exported uint64 buffers are assigned directly as int64 views; the wrapper
+        # narrows them to the index dtype of `core.memory.index_dtype`
+        size = len(node_list)
+        out = ss.csr_matrix((size, size), dtype=data.dtype)
+        out.data = data
+        out.indices = pieces["col_indices"].view(np.int64)
+        out.indptr = pieces["indptr"].view(np.int64)
+        out.has_sorted_indices = True
+        return out
+
     @translator
     def edgeset_from_graphblas(x: GrblasEdgeSet, **props) -> ScipyEdgeSet:
         aprops = GrblasEdgeSet.Type.compute_abstract_properties(x, {"is_directed"})
         active_nodes = find_active_nodes(x.value)
-        gm = x.value[active_nodes, active_nodes].new()
-        rows, cols, _ = gm.to_values()
-        sm = ss.coo_matrix(
-            (np.ones_like(rows), (rows, cols)), shape=gm.shape, dtype=bool
-        )
+        sm = _csr_from_graphblas(x.value, active_nodes, is_set=True)
         return ScipyEdgeSet(sm, node_list=active_nodes, aprops=aprops)
 
     @translator
     def edgemap_from_graphblas(x: GrblasEdgeMap, **props) -> ScipyEdgeMap:
         aprops = GrblasEdgeMap.Type.compute_abstract_properties(x, {"is_directed"})
         active_nodes = find_active_nodes(x.value)
-        gm = x.value[active_nodes, active_nodes].new()
-        rows, cols, vals = gm.to_values()
-        sm = ss.coo_matrix(
-            (vals, (rows, cols)),
-            dtype=dtype_grblas_to_mg[x.value.dtype.name],
-            shape=gm.shape,
-        )
+        sm = _csr_from_graphblas(x.value, active_nodes)
         return ScipyEdgeMap(sm, node_list=active_nodes, aprops=aprops)
 
     @translator(include_resolver=True)
@@ -84,71 +156,118 @@ if has_scipy and has_grblas:
         node_list, node_vals = x.nodes.to_values()
         if aprops["node_type"] == "set":
             node_vals = None
-        size = len(node_list)
-
-        compressed = x.value[node_list, node_list].new()
-        rows, cols, vals = compressed.to_values()
 
         if aprops["edge_type"] == "map":
-            dtype = dtype_grblas_to_mg[x.value.dtype.name]
-            matrix = ss.coo_matrix(
-                (vals, (rows, cols)), shape=(size, size), dtype=dtype
-            )
+            matrix = _csr_from_graphblas(x.value, node_list)
         elif aprops["edge_type"] == "set":
-            ones = np.ones_like(rows)
-            matrix = ss.coo_matrix((ones, (rows, cols)), shape=(size, size), dtype=bool)
+            matrix = _csr_from_graphblas(x.value, node_list, is_set=True)
         else:  # pragma: no cover
             raise TypeError(f"Cannot translate with edge_type={aprops['edge_type']}")
 
         return ScipyGraph(matrix, node_list, node_vals, aprops=aprops)
 
 
+if has_scipy:
+    from ..numpy.types import NumpyEdgeSet, NumpyEdgeMap, NumpyGraph
+    from ..numpy.types import edge_positions as numpy_edge_positions
+    from ..numpy.types import check_edge_positions
+
+    def _edgelist_to_csr(node_list, rows, cols, weights, is_directed, *, upper=False):
+        """
+        CSR matrix of an edge list given by the positions of its nodes in node_list.
+        Undirected edges are stored in both directions, or only in the upper triangle if
+        `upper` is True.
+        """
+        if not is_directed and upper:
+            rows, cols = np.minimum(rows, cols), np.maximum(rows, cols)
+        elif not is_directed:
+            nonself = rows != cols
+            rows, cols = (
+                np.concatenate([rows, cols[nonself]]),
+                np.concatenate([cols, rows[nonself]]),
+            )
+            weights = np.concatenate([weights, weights[nonself]])
+        # Group entries by row (edge lists are often already sorted by source)
+        if len(rows) > 1 and not (rows[1:] >= rows[:-1]).all():
+            order = np.argsort(rows, kind="stable")
+            rows, cols, weights = rows[order], cols[order], weights[order]
+        num_nodes = len(node_list)
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+        matrix = ss.csr_matrix((weights, cols, indptr), shape=(num_nodes, num_nodes))
+        matrix.sum_duplicates()
+        return matrix
+
+    @translator
+    def edgemap_from_numpy(x: NumpyEdgeMap, **props) -> ScipyEdgeMap:
+        node_list, rows, cols = numpy_edge_positions(x.src, x.dst)
+        matrix = _edgelist_to_csr(node_list, rows, cols, x.weights, x.is_directed)
+        return ScipyEdgeMap(matrix, node_list, aprops={"is_directed": x.is_directed})
+
+    @translator
+    def edgeset_from_numpy(x: NumpyEdgeSet, **props) -> ScipyEdgeSet:
+        node_list, rows, cols = numpy_edge_positions(x.src, x.dst)
+        ones = np.ones(len(rows), dtype=bool)
+        matrix = _edgelist_to_csr(node_list, rows, cols, ones, x.is_directed)
+        return ScipyEdgeSet(matrix, node_list, aprops={"is_directed": x.is_directed})
+
+    @translator
+    def graph_from_numpy(x: NumpyGraph, *, storage="full", **props) -> ScipyGraph:
+        aprops = NumpyGraph.Type.compute_abstract_properties(
+            x, {"is_directed", "node_type", "edge_type"}
+        )
+        _, rows, cols = numpy_edge_positions(x.src, x.dst, x.node_list)
+        # Trusted graphs are not checked on construction; positions past the end of
+        # node_list would corrupt the CSR matrix
+        check_edge_positions(x.node_list, x.src, rows)
+        check_edge_positions(x.node_list, x.dst, cols)
+        weights = x.weights
+        if weights is None:
+            weights = np.ones(len(rows), dtype=bool)
+        if x.is_directed:
+            storage = "full"
+        matrix = _edgelist_to_csr(
+            x.node_list, rows, cols, weights, x.is_directed, upper=storage == "upper"
+        )
+        return ScipyGraph(
+            matrix, x.node_list, x.node_vals, storage=storage, aprops=aprops
+        )
+
+
 if has_scipy and has_pandas:
-    import pandas as pd
-    from ..pandas.types import PandasEdgeMap, PandasEdgeSet
+    from ..pandas.types import PandasEdgeMap, PandasEdgeSet, edge_positions
 
     @translator
     def edgemap_from_pandas(x: PandasEdgeMap, **props) -> ScipyEdgeMap:
-        is_directed = x.is_directed
-        node_list = pd.unique(x.value[[x.src_label, x.dst_label]].values.ravel("K"))
-        node_list.sort()
-        num_nodes = len(node_list)
-        id2pos = dict(map(reversed, enumerate(node_list)))
-        get_id_pos = lambda node_id: id2pos[node_id]
-        source_positions = x.value[x.src_label].map(get_id_pos)
-        target_positions = x.value[x.dst_label].map(get_id_pos)
-        weights = x.value[x.weight_label]
-        if not is_directed:
-            nonself = source_positions != target_positions
-            source_positions, target_positions = (
-                pd.concat([source_positions, target_positions[nonself]]),
-                pd.concat([target_positions, source_positions[nonself]]),
-            )
-            weights = pd.concat([weights, weights[nonself]])
-        matrix = ss.coo_matrix(
-            (weights, (source_positions, target_positions)),
-            shape=(num_nodes, num_nodes),
-        )
-        return ScipyEdgeMap(matrix, node_list, aprops={"is_directed": is_directed})
+        node_list, rows, cols = edge_positions(x.value, x.src_label, x.dst_label)
+        weights = x.value[x.weight_label].values
+        matrix = _edgelist_to_csr(node_list, rows, cols, weights, x.is_directed)
+        return ScipyEdgeMap(matrix, node_list, aprops={"is_directed": x.is_directed})
 
     @translator
     def edgeset_from_pandas(x: PandasEdgeSet, **props) -> ScipyEdgeSet:
-        is_directed = x.is_directed
-        node_list = pd.unique(x.value[[x.src_label, x.dst_label]].values.ravel("K"))
-        node_list.sort()
-        num_nodes = len(node_list)
-        id2pos = dict(map(reversed, enumerate(node_list)))
-        get_id_pos = lambda node_id: id2pos[node_id]
-        source_positions = x.value[x.src_label].map(get_id_pos)
-        target_positions = x.value[x.dst_label].map(get_id_pos)
-        if not is_directed:
-            nonself = source_positions != target_positions
-            source_positions, target_positions = (
-                pd.concat([source_positions, target_positions[nonself]]),
-                pd.concat([target_positions, source_positions[nonself]]),
-            )
-        matrix = ss.coo_matrix(
-            (np.ones(len(source_positions)), (source_positions, target_positions)),
-            shape=(num_nodes, num_nodes),
+        node_list, rows, cols = edge_positions(x.value, x.src_label, x.dst_label)
+        ones = np.ones(len(rows))
+        matrix = _edgelist_to_csr(node_list, rows, cols, ones, x.is_directed)
+        return ScipyEdgeSet(matrix, node_list, aprops={"is_directed": x.is_directed})
+
+
+if has_scipy:
+    from ..dask.types import PartitionedEdgeMap, PartitionedGraph, assemble_blocks
+
+    @translator
+    def edgemap_from_partitioned(x: PartitionedEdgeMap, **props) -> ScipyEdgeMap:
+        aprops = dict(PartitionedEdgeMap.Type.get_typeinfo(x).known_abstract_props)
+        return ScipyEdgeMap(
+            assemble_blocks(x.blocks, x.offsets), x.node_list, aprops=aprops
+        )
+
+    @translator
+    def graph_from_partitioned(x: PartitionedGraph, **props) -> ScipyGraph:
+        aprops = dict(PartitionedGraph.Type.get_typeinfo(x).known_abstract_props)
+        return ScipyGraph(
+            assemble_blocks(x.blocks, x.offsets),
+            x.node_list,
+            x.node_vals,
+            aprops=aprops,
         )
-        return ScipyEdgeSet(matrix, node_list, aprops={"is_directed": is_directed})
@@ -1,5 +1,7 @@
 from typing import Set, Dict, Any
 from metagraph import ConcreteType, dtypes
+from metagraph.core.dtypes import index_dtype, as_index_array
+from metagraph.core.typecache import SizeEstimate
 from ..core.types import Matrix, EdgeSet, EdgeMap, Graph
 from ..core.wrappers import EdgeSetWrapper, EdgeMapWrapper, GraphWrapper
 from .. import has_scipy
@@ -9,6 +11,287 @@ import numpy as np
 if has_scipy:
     import scipy.sparse as ss
 
+    # Number of stored entries compared at a time when checking for symmetry
+    _SYMMETRY_CHUNKSIZE = 1 << 20
+
+    def _is_directed(matrix, check_values=True):
+        """
+        Determines whether a square adjacency matrix is asymmetric.
+
+        Cheap structural checks which can prove asymmetry are done first. Afterward,
+        the canonical CSR form is compared against its transpose (the CSC form read
+        as CSR) in chunks, stopping at the first mismatch.
+        """
+        if matrix.nnz == 0:
+            return False
+        csr = matrix.tocsr()
+        if not csr.has_canonical_format:
+            csr = csr.copy()
+            csr.sum_duplicates()
+        csc = csr.tocsc()
+        # Number of entries in each row must match the number in each column
+        if not np.array_equal(csr.indptr, csc.indptr):
+            return True
+        csc.sort_indices()
+        for start in range(0, csr.nnz, _SYMMETRY_CHUNKSIZE):
+            stop = start + _SYMMETRY_CHUNKSIZE
+            if not np.array_equal(csr.indices[start:stop], csc.indices[start:stop]):
+                return True
+            if check_values and not np.array_equal(
+                csr.data[start:stop], csc.data[start:stop]
+            ):
+                return True
+        return False
+
+    def _sparse_nbytes(matrix):
+        """
+        Bytes used by the arrays backing a scipy.sparse matrix.
+        Formats without flat backing arrays (dok, lil) are estimated from the number of entries.
+        """
+        if ss.isspmatrix_coo(matrix):
+            arrays = (matrix.data, matrix.row, matrix.col)
+        elif hasattr(matrix, "indptr"):
+            arrays = (matrix.data, matrix.indices, matrix.indptr)
+        else:
+            return matrix.nnz * (matrix.dtype.itemsize + 2 * np.dtype(np.intp).itemsize)
+        return sum(arr.nbytes for arr in arrays)
+
+    def _with_index_dtype(matrix):
+        """
+        Matrix whose index arrays are narrowed to int32 when `core.memory.index_dtype`
+        allows it. Index arrays of a matrix must share one dtype, so compressed formats are
+        only narrowed when both the indices and indptr fit. Index arrays are never widened,
+        as scipy.sparse.csgraph requires int32 indices. Other arrays are shared.
+        """
+        if matrix.format in {"csr", "csc"}:
+            names = ("indices", "indptr")
+            max_value = max(max(matrix.shape), matrix.nnz)
+        elif matrix.format == "coo":
+            names = ("row", "col")
+            max_value = max(matrix.shape)
+        else:
+            return matrix
+        dtype = index_dtype(max_value)
+        if dtype != np.int32 or all(
+            getattr(matrix, name).dtype == dtype for name in names
+        ):
+            return matrix
+        out = matrix.__class__(matrix.shape, dtype=matrix.dtype)
+        out.data = matrix.data
+        for name in names:
+            setattr(out, name, getattr(matrix, name).astype(dtype, copy=False))
+        if matrix.format != "coo":
+            out.has_sorted_indices = matrix.has_sorted_indices
+        out.has_canonical_format = matrix.has_canonical_format
+        return out
+
+    # Ways of storing the adjacency matrix of a ScipyGraph: "full" stores every edge,
+    # "upper" stores each edge of an undirected graph once, in the upper triangle
+    _STORAGE_MODES = ("full", "upper")
+
+    class _DerivedStructures:
+        """
+        Structures derived from an adjacency matrix which are needed by several algorithms.
+        Each one is computed on first use and kept until the wrapper holds a different
+        matrix, so chained algorithms on one graph reuse them. Matrices must not be modified
+        in place after they are wrapped.
+
+        With upper storage, `stored` is the upper triangle and the full symmetric `matrix`
+        is only built when a structure needs it. Triangles and degrees come from the
+        stored triangle directly.
+        """
+
+        def __init__(self, stored, storage="full"):
+            self.stored = stored
+            self.storage = storage
+            self._cache = {}
+
+        def _get(self, key, compute):
+            if key not in self._cache:
+                self._cache[key] = compute()
+            return self._cache[key]
+
+        @property
+        def matrix(self) -> ss.spmatrix:
+            """Full adjacency matrix, in the format of the stored matrix"""
+            if self.storage == "full":
+                return self.stored
+            return self._get("matrix", self._symmetrize)
+
+        def _symmetrize(self) -> ss.spmatrix:
+            mirrored = self.upper.T
+            return (self.stored + mirrored).asformat(self.stored.format)
+
+        @property
+        def csr(self) -> ss.csr_matrix:
+            return self._get("csr", self.matrix.tocsr)
+
+        @property
+        def csc(self) -> ss.csc_matrix:
+            return self._get("csc", self.matrix.tocsc)
+
+        @property
+        def coo(self) -> ss.coo_matrix:
+            return self._get("coo", self.matrix.tocoo)
+
+        def asformat(self, format: str, sorted_indices: bool = False) -> ss.spmatrix:
+            """
+            Stored matrix converted to `format` (csr, csc, or coo), with sorted indices if
+            requested. The stored matrix itself is returned when it already has the layout.
+            """
+            stored = self.stored
+            if stored.format == format:
+                matrix = stored
+            elif self.storage == "full":
+                matrix = getattr(self, format)
+            else:
+                matrix = self._get(("stored", format), lambda: stored.asformat(format))
+            if sorted_indices and not matrix.has_sorted_indices:
+                matrix = self._get(("sorted", format), matrix.sorted_indices)
+            return matrix
+
+        @property
+        def transpose(self) -> ss.csr_matrix:
+            """CSR form of the transpose, which shares the arrays of the CSC form"""
+            return self._get("transpose", lambda: self.csc.T)
+
+        @property
+        def out_degrees(self) -> np.ndarray:
+            """Number of stored entries in each row"""
+            return self._get("out_degrees", self._out_degrees)
+
+        def _out_degrees(self) -> np.ndarray:
+            if self.storage == "full":
+                return np.diff(self.csr.indptr)
+            # Entries of a row are those stored in the row plus the mirrored entries
+            # stored above the diagonal in the column
+            nrows = self.stored.shape[0]
+            mirrored = np.bincount(self.upper.indices, minlength=nrows)
+            return np.diff(self.asformat("csr").indptr) + mirrored
+
+        @property
+        def in_degrees(self) -> np.ndarray:
+            """Number of stored entries in each column"""
+            if self.storage == "upper":
+                return self.out_degrees
+            return self._get("in_degrees", lambda: np.diff(self.csc.indptr))
+
+        @property
+        def lower(self) -> ss.csr_matrix:
+            """Strictly lower triangle as CSR"""
+            if self.storage == "upper":
+                return self._get("lower", lambda: self.upper.T.tocsr())
+            return self._get("lower", lambda: ss.tril(self.csr, k=-1, format="csr"))
+
+        @property
+        def upper(self) -> ss.csr_matrix:
+            """Strictly upper triangle as CSR"""
+            source = self.stored if self.storage == "upper" else self.csr
+            return self._get("upper", lambda: ss.triu(source, k=1, format="csr"))
+
+        def is_symmetric(self, check_values=True) -> bool:
+            if self.storage == "upper":
+                return True
+            return self._get(
+                ("is_symmetric", check_values),
+                lambda: not _is_directed(self.matrix, check_values=check_values),
+            )
+
+    def _derived(wrapper) -> _DerivedStructures:
+        # Graphs keep the matrix as stored separately from the full `value`
+        stored = getattr(wrapper, "stored", None)
+        if stored is None:
+            stored = wrapper.value
+        storage = getattr(wrapper, "storage", "full")
+        derived = getattr(wrapper, "_derived", None)
+        if (
+            derived is None
+            or derived.stored is not stored
+            or derived.storage != storage
+        ):
+            derived = wrapper._derived = _DerivedStructures(stored, storage)
+        return derived
+
+    def _compute_edge_properties(
+        matrix,
+        props: Set[str],
+        known_props: Dict[str, Any],
+        *,
+        is_edgemap: bool,
+        derived: _DerivedStructures = None,
+    ) -> Dict[str, Any]:
+        """
+        Computes all requested EdgeSet/EdgeMap properties directly from the matrix,
+        ordered from cheapest to most expensive.
+        Symmetry is shared with the derived structures of the wrapper, if given.
+        """
+        ret = known_props.copy()
+
+        # fast properties
+        if is_edgemap and "dtype" not in ret:
+            ret["dtype"] = dtypes.dtypes_simplified[matrix.dtype]
+
+        # slow properties, only compute if asked
+        slow_props = props - ret.keys()
+        if "has_negative_weights" in slow_props:
+            if ret["dtype"] in {"bool", "str"}:
+                neg_weights = None
+            else:
+                data = matrix.data
+                neg_weights = bool(len(data) > 0 and data.min() < 0)
+            ret["has_negative_weights"] = neg_weights
+        if "is_directed" in slow_props:
+            if derived is not None:
+                ret["is_directed"] = not derived.is_symmetric(check_values=is_edgemap)
+            else:
+                ret["is_directed"] = _is_directed(matrix, check_values=is_edgemap)
+
+        return ret
+
+    # Sparse formats which algorithms can request through the `format` concrete property
+    _LAYOUT_FORMATS = ("csr", "csc", "coo")
+
+    def _compute_layout_properties(
+        matrix, props: Set[str], known_props: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Computes the concrete properties describing the sparse layout of the matrix"""
+        ret = known_props.copy()
+        if "format" in props:
+            ret["format"] = matrix.format
+        if "has_sorted_indices" in props:
+            ret["has_sorted_indices"] = bool(
+                matrix.format in {"csr", "csc"} and matrix.has_sorted_indices
+            )
+        return ret
+
+    def _convert_layout(wrapper, format=None, has_sorted_indices=None, storage=None):
+        """
+        Matrix of wrapper in the requested layout, reusing conversions cached on the wrapper.
+        Sorted indices are only available for csr and csc. Changing the storage (only
+        possible for graphs) builds a new matrix.
+        """
+        derived = _derived(wrapper)
+        if format is None:
+            format = derived.stored.format
+        if format not in _LAYOUT_FORMATS:
+            raise ValueError(f"format must be one of {_LAYOUT_FORMATS}, not {format!r}")
+        if has_sorted_indices and format == "coo":
+            raise ValueError("has_sorted_indices is only supported for csr and csc")
+        if storage is None or storage == derived.storage:
+            return derived.asformat(format, sorted_indices=bool(has_sorted_indices))
+
+        if storage == "upper":
+            matrix = ss.triu(derived.matrix, format=format)
+        elif storage == "full":
+            matrix = derived.matrix.asformat(format, copy=True)
+        else:
+            raise ValueError(
+                f"storage must be one of {_STORAGE_MODES}, not {storage!r}"
+            )
+        if has_sorted_indices and not matrix.has_sorted_indices:
+            matrix.sort_indices()
+        return matrix
+
     class ScipyEdgeSet(EdgeSetWrapper, abstract=EdgeSet):
         """
         scipy.sparse matrix is the minimal size to contain all edges.
@@ -23,9 +306,9 @@ if has_scipy:
             self._assert_instance(data, ss.spmatrix)
             nrows, ncols = data.shape
             self._assert(nrows == ncols, "Adjacency Matrix must be square")
-            self.value = data
+            self.value = _with_index_dtype(data)
             if node_list is None:
-                node_list = np.arange(nrows)
+                node_list = np.arange(nrows, dtype=index_dtype(nrows))
             else:
                 self._assert_instance(node_list, (np.ndarray, list, tuple))
                 if not isinstance(node_list, np.ndarray):
@@ -34,24 +317,35 @@ if has_scipy:
                 nrows == len(node_list),
                 f"node list size ({len(node_list)}) and data matrix size ({nrows}) don't match.",
             )
-            self.node_list = node_list
+            self.node_list = as_index_array(node_list)
 
         # def copy(self):
         #     return ScipyEdgeSet(self.value.copy(), node_list=self.node_list.copy())
 
         class TypeMixin:
+            allowed_props = dict(format=str, has_sorted_indices=bool)
+
             @classmethod
             def _compute_abstract_properties(
                 cls, obj, props: Set[str], known_props: Dict[str, Any]
             ) -> Dict[str, Any]:
-                ret = known_props.copy()
+                return _compute_edge_properties(
+                    obj.value, props, known_props, is_edgemap=False
+                )
 
-                # slow properties, only compute if asked
-                for prop in props - ret.keys():
-                    if prop == "is_directed":
-                        ret[prop] = (obj.value.T != obj.value).nnz > 0
+            @classmethod
+            def _compute_concrete_properties(
+                cls, obj, props: Set[str], known_props: Dict[str, Any]
+            ) -> Dict[str, Any]:
+                return _compute_layout_properties(obj.value, props, known_props)
 
-                return ret
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                return SizeEstimate(
+                    num_nodes=len(obj.node_list),
+                    num_edges=obj.value.nnz,
+                    nbytes=_sparse_nbytes(obj.value) + obj.node_list.nbytes,
+                )
 
             @classmethod
             def assert_equal(
@@ -101,9 +395,9 @@ if has_scipy:
             self._assert_instance(data, ss.spmatrix)
             nrows, ncols = data.shape
             self._assert(nrows == ncols, "Adjacency Matrix must be square")
-            self.value = data
+            self.value = _with_index_dtype(data)
             if node_list is None:
-                node_list = np.arange(nrows)
+                node_list = np.arange(nrows, dtype=index_dtype(nrows))
             else:
                 self._assert_instance(node_list, (np.ndarray, list, tuple))
                 if not isinstance(node_list, np.ndarray):
@@ -112,7 +406,12 @@ if has_scipy:
                 nrows == len(node_list),
                 f"node list size ({len(node_list)}) and data matrix size ({nrows}) don't match.",
             )
-            self.node_list = node_list
+            self.node_list = as_index_array(node_list)
+
+        @property
+        def derived(self) -> _DerivedStructures:
+            """Cached structures derived from the matrix (transpose, degrees, triangles)"""
+            return _derived(self)
 
         # def copy(self):
         #     node_list = (
@@ -121,33 +420,29 @@ if has_scipy:
         #     return ScipyEdgeMap(self.value.copy(), node_list=node_list)
 
         class TypeMixin:
+            allowed_props = dict(format=str, has_sorted_indices=bool)
+
             @classmethod
             def _compute_abstract_properties(
                 cls, obj, props: Set[str], known_props: Dict[str, Any]
             ) -> Dict[str, Any]:
-                ret = known_props.copy()
-
-                # fast properties
-                for prop in {"dtype"} - ret.keys():
-                    if prop == "dtype":
-                        ret[prop] = dtypes.dtypes_simplified[obj.value.dtype]
+                return _compute_edge_properties(
+                    obj.value, props, known_props, is_edgemap=True, derived=obj.derived
+                )
 
-                # slow properties, only compute if asked
-                for prop in props - ret.keys():
-                    if prop == "is_directed":
-                        ret[prop] = (obj.value.T != obj.value).nnz > 0
-                    if prop == "has_negative_weights":
-                        if ret["dtype"] in {"bool", "str"}:
-                            neg_weights = None
-                        else:
-                            min_val = obj.value.data.min()
-                            if min_val < 0:
-                                neg_weights = True
-                            else:
-                                neg_weights = False
-                        ret[prop] = neg_weights
+            @classmethod
+            def _compute_concrete_properties(
+                cls, obj, props: Set[str], known_props: Dict[str, Any]
+            ) -> Dict[str, Any]:
+                return _compute_layout_properties(obj.value, props, known_props)
 
-                return ret
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                return SizeEstimate(
+                    num_nodes=len(obj.node_list),
+                    num_edges=obj.value.nnz,
+                    nbytes=_sparse_nbytes(obj.value) + obj.node_list.nbytes,
+                )
 
             @classmethod
             def assert_equal(
@@ -193,9 +488,20 @@ if has_scipy:
         scipy.sparse matrix is the minimal size to contain all nodes in the graph.
         If nodes are not sequential, a node_list must be provided to map the matrix index to NodeId.
         node_vals (if populated) contains node weights
+
+        Undirected graphs may be stored with storage="upper", where matrix only holds the
+        upper triangle (including the diagonal) and each edge is stored once. `stored` is
+        the matrix as given, while `value` is always the full adjacency matrix, built from
+        the triangle the first time it is accessed.
         """
 
-        def __init__(self, matrix, node_list=None, node_vals=None, *, aprops=None):
+        def __init__(
+            self, matrix, node_list=None, node_vals=None, *, storage="full", aprops=None
+        ):
+            if storage == "upper":
+                aprops = dict(aprops or {})
+                if aprops.setdefault("is_directed", False):
+                    raise TypeError("upper storage is only valid for undirected graphs")
             super().__init__(aprops=aprops)
             self._assert_instance(matrix, ss.spmatrix)
             nrows, ncols = matrix.shape
@@ -203,7 +509,7 @@ if has_scipy:
                 nrows == ncols, f"adjacency matrix must be square, not {nrows}x{ncols}"
             )
             if node_list is None:
-                node_list = np.arange(nrows)
+                node_list = np.arange(nrows, dtype=index_dtype(nrows))
             else:
                 self._assert_instance(node_list, (np.ndarray, list, tuple))
                 if not isinstance(node_list, np.ndarray):
@@ -220,15 +526,44 @@ if has_scipy:
                     nrows == len(node_vals),
                     f"node vals size ({len(node_vals)}) and data matrix size ({nrows}) don't match",
                 )
-            self.value = matrix
-            self.node_list: np.ndarray = node_list
+            self._assert(
+                storage in _STORAGE_MODES,
+                f"storage must be one of {_STORAGE_MODES}, not {storage!r}",
+            )
+            if storage == "upper" and self._validating():
+                self._assert(
+                    ss.tril(matrix, k=-1).nnz == 0,
+                    "matrix with upper storage must not have entries below the diagonal",
+                )
+            self.value = _with_index_dtype(matrix)
+            self.storage = storage
+            self.node_list: np.ndarray = as_index_array(node_list)
             self.node_vals: np.ndarray = node_vals
 
+        @property
+        def value(self) -> ss.spmatrix:
+            """Full adjacency matrix"""
+            if self.storage == "full":
+                return self.stored
+            return self.derived.matrix
+
+        @value.setter
+        def value(self, matrix):
+            self.stored = matrix
+            self.storage = "full"
+
+        @property
+        def derived(self) -> _DerivedStructures:
+            """Cached structures derived from the matrix (transpose, degrees, triangles)"""
+            return _derived(self)
+
         # def copy(self):
         #     node_vals = None if self.node_vals is None else self.node_vals.copy()
         #     return ScipyGraph(self.value.copy(), self.node_list.copy(), node_vals)
 
         class TypeMixin:
+            allowed_props = dict(format=str, has_sorted_indices=bool, storage=str)
+
             # Both forward and reverse lookup
             _edge_prop_map = {
                 "is_directed": "is_directed",
@@ -249,26 +584,26 @@ if has_scipy:
                     if prop == "node_type":
                         ret[prop] = "set" if obj.node_vals is None else "map"
                     elif prop == "edge_type":
-                        ret[prop] = "set" if obj.value.dtype == bool else "map"
+                        ret[prop] = "set" if obj.stored.dtype == bool else "map"
 
-                # Delegate to ScipyEdge{Set/Map} to compute edge properties
+                # Compute edge properties directly from the matrix
                 if ret["edge_type"] == "set":
                     ret["edge_dtype"] = None
                     ret["edge_has_negative_weights"] = None
-                    edgeclass = ScipyEdgeSet
-                else:
-                    edgeclass = ScipyEdgeMap
                 edge_props = {
                     cls._edge_prop_map[p] for p in props if p in cls._edge_prop_map
                 }
                 known_edge_props = {
                     cls._edge_prop_map[p]: v
-                    for p, v in known_props.items()
+                    for p, v in ret.items()
                     if p in cls._edge_prop_map
                 }
-                edges = edgeclass(obj.value, obj.node_list)
-                edge_computed_props = edgeclass.Type._compute_abstract_properties(
-                    edges, edge_props, known_edge_props
+                edge_computed_props = _compute_edge_properties(
+                    obj.stored,
+                    edge_props,
+                    known_edge_props,
+                    is_edgemap=ret["edge_type"] == "map",
+                    derived=obj.derived,
                 )
                 ret.update(
                     {cls._edge_prop_map[p]: v for p, v in edge_computed_props.items()}
@@ -284,6 +619,26 @@ if has_scipy:
 
                 return ret
 
+            @classmethod
+            def _compute_concrete_properties(
+                cls, obj, props: Set[str], known_props: Dict[str, Any]
+            ) -> Dict[str, Any]:
+                ret = _compute_layout_properties(obj.stored, props, known_props)
+                if "storage" in props:
+                    ret["storage"] = obj.storage
+                return ret
+
+            @classmethod
+            def _estimate_size(cls, obj) -> SizeEstimate:
+                nbytes = _sparse_nbytes(obj.stored) + obj.node_list.nbytes
+                if obj.node_vals is not None:
+                    nbytes += obj.node_vals.nbytes
+                return SizeEstimate(
+                    num_nodes=len(obj.node_list),
+                    num_edges=obj.stored.nnz,
+                    nbytes=nbytes,
+                )
+
             @classmethod
             def assert_equal(
                 cls,
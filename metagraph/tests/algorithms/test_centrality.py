@@ -335,3 +335,40 @@ def test_degree_centrality_undirected(default_plugin_resolver):
     MultiVerify(dpr).compute("centrality.degree", graph, False, False).assert_equal(
         {0: 0, 1: 0, 2: 0, 3: 0,}
     )
+
+
+def test_degree_centrality_edge_cases(default_plugin_resolver):
+    import scipy.sparse as ss
+
+    dpr = default_plugin_resolver
+    # A self-loop with an explicitly stored zero weight still counts twice
+    m = ss.csr_matrix(
+        (np.array([0.0, 1.0, 1.0, 2.0, 2.0]), ([0, 0, 1, 1, 2], [0, 1, 0, 2, 1])),
+        shape=(3, 3),
+    )
+    assert m.nnz == 5
+    graph = dpr.wrappers.Graph.ScipyGraph(m, [0, 1, 2])
+    MultiVerify(dpr).compute("centrality.degree", graph, True, True).assert_equal(
+        {0: 3 / 2, 1: 2 / 2, 2: 1 / 2}
+    )
+    upper = dpr.wrappers.Graph.ScipyGraph(ss.triu(m).tocsr(), storage="upper")
+    dpr.assert_equal(
+        dpr.algos.centrality.degree(upper, True, True),
+        dpr.algos.centrality.degree(graph, True, True),
+    )
+
+    # A lone node is fully connected, like networkx
+    g = nx.Graph()
+    g.add_node(5)
+    MultiVerify(dpr).compute(
+        "centrality.degree", dpr.wrappers.Graph.NetworkXGraph(g), True, True
+    ).assert_equal({5: 1})
+    g = nx.DiGraph()
+    g.add_node(5)
+    graph = dpr.wrappers.Graph.NetworkXGraph(g)
+    MultiVerify(dpr).compute("centrality.degree", graph, True, True).assert_equal(
+        {5: 2}
+    )
+    MultiVerify(dpr).compute("centrality.degree", graph, False, True).assert_equal(
+        {5: 1}
+    )
@@ -249,3 +249,34 @@ def test_greedy_coloring(default_plugin_resolver):
     results[1].assert_equal(3)
     # Check coloring of triangle in the graph
     results[0].normalize(dpr.types.NodeMap.PythonNodeMapType).custom_compare(cmp_func)
+
+
+def test_partitioned_connected_components(default_plugin_resolver):
+    import numpy as np
+    import metagraph as mg
+    from metagraph.plugins.dask.types import PartitionedGraph
+    from metagraph.dask import DaskResolver
+
+    dpr = default_plugin_resolver
+    # Components are spread across the partitions: {0, 5, 9}, {1, 2, 8}, {3}, {4, 6, 7}
+    g = nx.Graph()
+    g.add_nodes_from(range(10))
+    g.add_edges_from([(0, 9), (9, 5), (1, 8), (8, 2), (4, 7), (7, 6)])
+    with mg.config.set({"core.dask.npartitions": 4}):
+        graph = dpr.translate(dpr.wrappers.Graph.NetworkXGraph(g), PartitionedGraph)
+        if isinstance(dpr, DaskResolver):
+            graph = graph.compute()
+    assert graph.npartitions > 1
+    labels = dpr.plugins.core_dask.algos.clustering.connected_components(graph)
+    labels = dpr.translate(labels, dpr.types.NodeMap.PythonNodeMapType)
+    if isinstance(dpr, DaskResolver):
+        labels = labels.compute()
+    components = {}
+    for node, label in labels.items():
+        components.setdefault(label, set()).add(node)
+    assert sorted(map(sorted, components.values())) == [
+        [0, 5, 9],
+        [1, 2, 8],
+        [3],
+        [4, 6, 7],
+    ]
@@ -1,7 +1,13 @@
 import pytest
+import time
+import functools
+import operator
+import metagraph as mg
 from metagraph import Compiler, abstract_algorithm, concrete_algorithm, PluginRegistry
 from metagraph.core.plugin import CompileError
-from metagraph.tests.util import example_resolver, FailCompiler
+from metagraph.plugins.core.types import Vector
+from metagraph.core.resolver import Resolver
+from metagraph.tests.util import example_resolver, FailCompiler, IdentityCompiler
 
 
 def test_compile_immediate(example_resolver):
@@ -26,3 +32,157 @@ def test_compile_immediate(example_resolver):
 
     assert add_two_c(4, resolver=example_resolver) == 6
     assert add_two_c(4) == 6
+    # Literals are baked into compiled functions, so other values need a resolver
+    with pytest.raises(CompileError, match="Cannot call add_two_c"):
+        add_two_c(5)
+    assert add_two_c(5, resolver=example_resolver) == 7
+    assert add_two_c(5) == 7
+    assert add_two_c(4) == 6
+
+
+def test_compile_cache_specialization():
+    from metagraph.plugins.numpy.types import NumpyVectorType
+    import numpy as np
+
+    compiler = IdentityCompiler()
+
+    @abstract_algorithm("testing.scale_by")
+    def scale_by(x: Vector, factor: float) -> Vector:  # pragma: no cover
+        pass
+
+    @concrete_algorithm("testing.scale_by", compiler="identity_comp")
+    def scale_by_c(x: NumpyVectorType, factor: float) -> NumpyVectorType:
+        return x * factor
+
+    registry = PluginRegistry("test_compile_cache")
+    registry.register(scale_by)
+    registry.register(scale_by_c)
+    registry.register(compiler)
+    res = Resolver()
+    res.load_plugins_from_environment()
+    res.register(registry.plugins)
+
+    ints = np.arange(3)
+    floats = np.arange(3.0)
+    res.algos.testing.scale_by(ints, 2.0)
+    res.algos.testing.scale_by(ints, 2.0)
+    assert len(compiler.compile_algorithm_calls) == 1
+    args, kwargs = compiler.compile_algorithm_calls[0]
+    assert args[0].func is scale_by_c.func
+    assert args[1] == {"factor": 2.0}
+    assert res.compile_cache.stats.hits == 1
+    assert res.compile_cache.stats.misses == 1
+
+    # new literal value and new input dtype are separate specializations
+    res.algos.testing.scale_by(ints, 3.0)
+    res.algos.testing.scale_by(floats, 2.0)
+    assert len(compiler.compile_algorithm_calls) == 3
+    assert len(res.compile_cache) == 3
+    assert res.compile_cache.stats.compile_seconds >= 0
+
+    # least recently used entries are evicted
+    with mg.config.set({"core.compiler.cache.maxsize": 2}):
+        res.algos.testing.scale_by(floats, 3.0)
+        assert len(res.compile_cache) == 2
+        res.algos.testing.scale_by(floats, 3.0)
+        res.algos.testing.scale_by(ints, 2.0)
+    assert len(compiler.compile_algorithm_calls) == 5
+
+
+def test_compile_cache_persistence(tmp_path):
+    from metagraph.core.compilecache import CompileCache
+
+    class PicklingCompiler(Compiler):
+        def __init__(self):
+            super().__init__(name="pickling")
+            self.num_compiles = 0
+
+        def compile_algorithm(self, algo, literals=None):
+            self.num_compiles += 1
+            return functools.partial(operator.add, literals["x"])
+
+    @concrete_algorithm("testing.add_x", compiler="pickling")
+    def add_x(x: int, y: int) -> int:  # pragma: no cover
+        return x + y
+
+    compiler = PicklingCompiler()
+    cache = CompileCache(directory=str(tmp_path))
+    func = cache.get_or_compile(add_x, compiler, {"x": 3})
+    assert func(4) == 7
+    assert compiler.num_compiles == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+    # A new cache (e.g. in another process) loads from disk instead of compiling
+    cache2 = CompileCache(directory=str(tmp_path))
+    func2 = cache2.get_or_compile(add_x, compiler, {"x": 3})
+    assert func2(4) == 7
+    assert compiler.num_compiles == 1
+    assert cache2.stats.disk_hits == 1
+    assert cache2.stats.misses == 0
+
+    # Functions which cannot be serialized are only cached in memory
+    class ClosureCompiler(PicklingCompiler):
+        def compile_algorithm(self, algo, literals=None):
+            self.num_compiles += 1
+            return lambda y: literals["x"] + y
+
+    cache3 = CompileCache(directory=str(tmp_path))
+    func3 = cache3.get_or_compile(add_x, ClosureCompiler(), {"x": 5})
+    assert func3(1) == 6
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_warmup():
+    from metagraph.plugins.numpy.types import NumpyVectorType
+    import numpy as np
+
+    compiler = IdentityCompiler()
+
+    @abstract_algorithm("testing.shift")
+    def shift(x: Vector, amount: int) -> Vector:  # pragma: no cover
+        pass
+
+    @concrete_algorithm("testing.shift", compiler="identity_comp")
+    def shift_c(x: NumpyVectorType, amount: int) -> NumpyVectorType:
+        return x + amount
+
+    registry = PluginRegistry("test_warmup")
+    registry.register(shift)
+    registry.register(shift_c)
+    registry.register(compiler)
+    res = Resolver()
+    res.load_plugins_from_environment()
+    res.register(registry.plugins)
+
+    with pytest.raises(ValueError, match="testing.does_not_exist"):
+        res.warmup(algos=["testing.does_not_exist"])
+
+    ints = np.arange(3)
+    futures = res.warmup(
+        algos=["testing.shift"],
+        signatures=[(ints, 1), {"x": ints, "amount": 2}, ("not a vector", 1)],
+        wait=True,
+    )
+    assert all(f.done() for f in futures)
+    assert compiler.initialize_runtime_calls == 1
+    assert len(compiler.compile_algorithm_calls) == 2
+    assert res.compile_cache.stats.misses == 2
+
+    # Calls matching a warmed-up specialization do not compile again
+    np.testing.assert_array_equal(res.algos.testing.shift(ints, 2), ints + 2)
+    assert len(compiler.compile_algorithm_calls) == 2
+    assert res.compile_cache.stats.hits == 1
+
+
+def test_warmup_on_register():
+    compiler = IdentityCompiler()
+    registry = PluginRegistry("test_warmup_on_register")
+    registry.register(compiler)
+    res = Resolver()
+    with mg.config.set({"core.compiler.warmup.on_register": True}):
+        res.register(registry.plugins)
+    for _ in range(100):
+        if compiler.initialize_runtime_calls:
+            break
+        time.sleep(0.05)
+    assert compiler.initialize_runtime_calls == 1
@@ -0,0 +1,95 @@
+import pytest
+
+numba = pytest.importorskip("numba")
+
+import numpy as np
+import dask
+import metagraph.core.compiler as mg_compiler
+from metagraph.dask import DaskResolver
+from metagraph.core.dask.tasks import DelayedJITAlgo
+from metagraph.plugins.numpy.types import NumpyNodeMap, NumpyNodeSet
+from metagraph.plugins.numba.compiler import NumbaCompiler
+from metagraph.tests.util import default_plugin_resolver
+
+
+def test_numba_compiler_registered(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    assert isinstance(dpr.compilers["numba"], NumbaCompiler)
+
+
+def test_compile_nodemap_ops(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    x = NumpyNodeMap(np.array([1.5, -2.0, 3.0, 4.5]), nodes=np.array([2, 4, 6, 8]))
+
+    def compute(result):
+        return result.compute() if isinstance(dpr, DaskResolver) else result
+
+    y = compute(dpr.algos.util.nodemap.apply(x, lambda v: v * 2))
+    assert isinstance(y, NumpyNodeMap)
+    np.testing.assert_array_equal(y.value, [3.0, -4.0, 6.0, 9.0])
+    np.testing.assert_array_equal(y.nodes, [2, 4, 6, 8])
+
+    s = compute(dpr.algos.util.nodemap.filter(x, lambda v: v > 2))
+    assert isinstance(s, NumpyNodeSet)
+    np.testing.assert_array_equal(s.value, [6, 8])
+
+    assert compute(dpr.algos.util.nodemap.reduce(x, np.add)) == 7.0
+    assert compute(dpr.algos.util.nodemap.reduce(x, lambda a, b: max(a, b))) == 4.5
+
+
+def test_run_nodemap_chain(default_plugin_resolver):
+    compiler = default_plugin_resolver.compilers["numba"]
+    x = NumpyNodeMap(np.array([1, 2, 3, 4]), nodes=np.array([0, 3, 5, 9]))
+    funcs = [lambda v: v + 1, lambda v: v * 1.5]
+
+    y = compiler.run_nodemap_chain(x, funcs, "apply", lambda v: v > 4)
+    assert y.value.dtype == bool
+    np.testing.assert_array_equal(y.value, [False, True, True, True])
+
+    s = compiler.run_nodemap_chain(x, funcs, "filter", lambda v: v > 4)
+    np.testing.assert_array_equal(s.value, [3, 5, 9])
+
+    total = compiler.run_nodemap_chain(x, funcs, "reduce", np.add)
+    assert total == 21.0
+
+    empty = NumpyNodeMap(np.array([], dtype=np.float64), nodes=np.array([]))
+    assert compiler.run_nodemap_chain(empty, funcs, "reduce", np.add) == 0.0
+
+    # Composed chains are compiled once and reused
+    num_composed = len(compiler._composed)
+    y2 = compiler.run_nodemap_chain(x, funcs, "apply", lambda v: v > 4)
+    np.testing.assert_array_equal(y2.value, y.value)
+    assert len(compiler._composed) == num_composed + 1
+    final = compiler._jit(np.negative)
+    chain = tuple(compiler._jit(f) for f in funcs) + (final,)
+    composed = compiler._compose_chain(chain)
+    compiler.run_nodemap_chain(x, funcs, "apply", np.negative)
+    assert compiler._compose_chain(chain) is composed
+    assert len(composed.overloads) == 1
+
+
+def test_fuse_nodemap_chain(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    if not isinstance(dpr, DaskResolver):
+        dpr = DaskResolver(dpr)
+    x = NumpyNodeMap(np.arange(10, dtype=np.float64))
+
+    y = dpr.algos.util.nodemap.apply(x, lambda v: v - 3)
+    z = dpr.algos.util.nodemap.apply(y, lambda v: v * v)
+    s = dpr.algos.util.nodemap.filter(z, lambda v: v > 10)
+
+    optimized_dsk = mg_compiler.optimize(s.__dask_graph__(), output_keys=[s.key])
+    fused_tasks = [
+        task for task in optimized_dsk.values() if isinstance(task[0], DelayedJITAlgo)
+    ]
+    assert len(fused_tasks) == 1
+    assert len(fused_tasks[0][0].source_algos) == 3
+
+    result = s.compute()
+    assert isinstance(result, NumpyNodeSet)
+    np.testing.assert_array_equal(result.value, [7, 8, 9])
+
+    # Intermediate results which are requested are still computed
+    z_result, s_result = dask.compute(z, s)
+    np.testing.assert_array_equal(z_result.value, (np.arange(10) - 3) ** 2)
+    np.testing.assert_array_equal(s_result.value, [7, 8, 9])
@@ -0,0 +1,147 @@
+import pytest
+
+grblas = pytest.importorskip("grblas")
+
+import numpy as np
+import dask
+import metagraph as mg
+import metagraph.core.optimizer as mg_optimizer
+from metagraph.core.optimizer import (
+    Optimizer,
+    OptimizerPass,
+    GraphState,
+    GraphStats,
+    CullPass,
+    RedundantTranslationPass,
+    TranslationHoistingPass,
+    CompilerFusionPass,
+    default_optimizer,
+)
+from metagraph.dask import DaskResolver
+from metagraph.plugins.numpy.types import NumpyNodeMap, NumpyVectorType
+from metagraph.plugins.python.types import PythonNodeMapType
+from metagraph.plugins.graphblas.types import GrblasNodeMap, GrblasVectorType
+from metagraph.tests.util import default_plugin_resolver
+
+
+@pytest.fixture
+def dpr(default_plugin_resolver):
+    if isinstance(default_plugin_resolver, DaskResolver):
+        return default_plugin_resolver
+    return DaskResolver(default_plugin_resolver)
+
+
+def test_redundant_translations(dpr):
+    x = NumpyNodeMap(np.array([1.5, 2.5, 3.5]), nodes=np.array([0, 3, 7]))
+    y = dpr.translate(x, PythonNodeMapType)
+    z = dpr.translate(y, NumpyNodeMap)
+
+    optimized = default_optimizer.run(z.__dask_graph__(), [z.key])
+    report = default_optimizer.last_report
+    assert report.before.num_translations == 2
+    assert report.after.num_translations == 0
+    assert len(optimized) == 1
+    result = dask.core.get(optimized, z.key)
+    assert result is x
+
+    # An intermediate which is requested is kept
+    dsk = dask.base.collections_to_dsk([y, z], optimize_graph=False)
+    optimized = default_optimizer.run(dsk, [y.key, z.key])
+    assert GraphStats.from_graph(optimized).num_translations == 1
+    y_result, z_result = dask.core.get(optimized, [y.key, z.key])
+    assert y_result == {0: 1.5, 3: 2.5, 7: 3.5}
+    assert z_result is x
+
+
+def test_redundant_translations_unhashable_literal(dpr):
+    # A bare numpy array is an unhashable literal in the task graph
+    x = np.array([1.5, 2.5, 3.5])
+    y = dpr.translate(dpr.translate(x, GrblasVectorType), NumpyVectorType)
+
+    optimized = default_optimizer.run(y.__dask_graph__(), [y.key])
+    assert GraphStats.from_graph(optimized).num_translations == 0
+    assert dask.core.get(optimized, y.key) is x
+
+
+def test_hoist_translations(dpr):
+    x = {0: 1.5, 3: 2.5, 7: 3.5}
+    direct = dpr.translate(x, NumpyNodeMap)
+    indirect = dpr.translate(dpr.translate(x, GrblasNodeMap), NumpyNodeMap)
+
+    dsk = dask.base.collections_to_dsk([direct, indirect], optimize_graph=False)
+    num_translations = GraphStats.from_graph(dsk).num_translations
+    optimized = default_optimizer.run(dsk, [direct.key, indirect.key])
+    # the indirect path through grblas is no longer needed
+    assert GraphStats.from_graph(optimized).num_translations < num_translations
+    assert optimized[indirect.key] == direct.key
+    direct_result, indirect_result = dask.core.get(
+        optimized, [direct.key, indirect.key]
+    )
+    assert indirect_result is direct_result
+    dpr.assert_equal(direct_result, NumpyNodeMap(np.array([1.5, 2.5, 3.5]), [0, 3, 7]))
+
+
+def test_register_passes():
+    calls = []
+
+    class RecordPass(OptimizerPass):
+        def __init__(self, name):
+            self.name = name
+
+        def run(self, state):
+            calls.append((self.name, len(state.dsk)))
+
+    optimizer = Optimizer([CullPass(), CompilerFusionPass()])
+    optimizer.register(RecordPass("first"), before="cull")
+    optimizer.register(RecordPass("middle"), after="cull")
+    optimizer.register(RecordPass("last"))
+    assert [p.name for p in optimizer.passes] == [
+        "first",
+        "cull",
+        "middle",
+        "compile",
+        "last",
+    ]
+
+    with pytest.raises(ValueError, match="already registered"):
+        optimizer.register(CullPass())
+    with pytest.raises(ValueError, match="must have a name"):
+        optimizer.register(OptimizerPass())
+    with pytest.raises(ValueError, match="both"):
+        optimizer.register(RecordPass("x"), before="cull", after="cull")
+    with pytest.raises(KeyError, match="missing"):
+        optimizer.register(RecordPass("x"), before="missing")
+
+    dsk = {"a": 1, "b": (sum, ["a", "a"]), "unused": (sum, ["a"])}
+    optimized = optimizer.run(dsk, ["b"])
+    assert set(optimized) == {"a", "b"}
+    assert calls == [("first", 3), ("middle", 2), ("last", 2)]
+
+    report = optimizer.last_report
+    assert [p.name for p in report.passes] == [p.name for p in optimizer.passes]
+    assert report.before.num_tasks == 3
+    assert report.after.num_tasks == 2
+    assert report.total_seconds >= 0
+    assert "cull" in str(report)
+
+    removed = optimizer.unregister("middle")
+    assert removed.name == "middle"
+    assert "middle" not in [p.name for p in optimizer.passes]
+
+
+def test_shared_dependencies(monkeypatch):
+    def fail(*args, **kwargs):  # pragma: no cover
+        raise AssertionError("dependencies should not be recomputed")
+
+    state = GraphState({"a": 1, "b": (sum, ["a", "a"])}, ["b"])
+    CullPass().run(state)
+    monkeypatch.setattr(mg_optimizer, "get_deps", fail)
+    assert state.dependencies == {"a": set(), "b": {"a"}}
+    assert state.dependents == {"a": {"b"}, "b": set()}
+
+
+def test_optimizer_logging(capsys):
+    optimizer = Optimizer([CullPass()])
+    with mg.config.set({"core.logging.optimizer": True}):
+        optimizer.run({"a": 1}, ["a"])
+    assert "cull" in capsys.readouterr().out
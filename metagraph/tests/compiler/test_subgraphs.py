@@ -5,6 +5,8 @@ from metagraph import translator, abstract_algorithm, concrete_algorithm
 import networkx as nx
 from metagraph.core.resolver import Resolver
 from metagraph.core.dask.resolver import DaskResolver
+from metagraph.core.dask.tasks import DelayedJITAlgo
+from metagraph.plugins.numpy.types import NumpyVectorType
 from metagraph import PluginRegistry
 from pytest import fixture
 import pytest
@@ -80,31 +82,21 @@ def test_extract_subgraphs_two_chains(res):
     z2 = scale_func(scale_func(scale_func(a, 2.5), 3.5), 4.5)
     merge = res.algos.testing.add(z1, z2)
 
-    # The merge node cannot be fused with z1 or z2 without reducing parallelism in the graph
-
+    # Both chains and the merge node are fused into one multi-input subgraph
     subgraphs = mg_compiler.extract_compilable_subgraphs(
         merge.__dask_graph__(),
         compiler="identity_comp",
         output_keys=[merge.key],
-        include_singletons=False,  # exclude the add node
-    )
-    assert len(subgraphs) == 2
-    for subgraph in subgraphs:
-        assert len(subgraph.tasks) == 3
-        # FIXME: This is zero because the input numpy array is not wrapped in its own placeholder object
-        assert len(subgraph.input_keys) == 0
-        # we don't know what order the two chains will come out in
-        assert subgraph.output_key in (z1.key, z2.key)
-
-    # now check if we get the add node
-    subgraphs = mg_compiler.extract_compilable_subgraphs(
-        merge.__dask_graph__(),
-        output_keys=[merge.key],
-        compiler="identity_comp",
-        include_singletons=True,
+        include_singletons=False,
     )
-    assert len(subgraphs) == 3
-    assert merge.key in [s.output_key for s in subgraphs]
+    assert len(subgraphs) == 1
+    subgraph = subgraphs[0]
+    assert len(subgraph.tasks) == 7
+    # FIXME: This is zero because the input numpy array is not wrapped in its own placeholder object
+    assert len(subgraph.input_keys) == 0
+    assert subgraph.output_key == merge.key
+    assert subgraph.output_keys == [merge.key]
+    assert not subgraph.is_multi_output
 
 
 def test_extract_subgraphs_three_chains(res):
@@ -116,45 +108,18 @@ def test_extract_subgraphs_three_chains(res):
     merge = res.algos.testing.add(z1, z2)
     ans = scale_func(merge, 2.8)
 
-    # The merge node cannot be fused with z1 or z2 without reducing parallelism in the graph,
-    # but the merge node can start the final chain
-
     subgraphs = mg_compiler.extract_compilable_subgraphs(
         ans.__dask_graph__(), output_keys=[ans.key], compiler="identity_comp"
     )
-    assert len(subgraphs) == 3
-
-    # separate the final chain from the input chains
-    final_chain = None
-    input_chains = []
-    for subgraph in subgraphs:
-        # FIXME: key property
-        if subgraph.output_key == ans.key:
-            assert (
-                final_chain is None
-            ), "found more than one subgraph with key of final chain"
-            final_chain = subgraph
-        else:
-            input_chains.append(subgraph)
-
-    # final chain tests
-    assert len(final_chain.tasks) == 2
-    assert len(final_chain.input_keys) == 2
-    for input_key in final_chain.input_keys:
-        # FIXME: key property
-        assert input_key in (z1.key, z2.key)
-    assert (
-        final_chain.output_key == ans.key
-    )  # true by construction, checked here for completeness
-
-    # input_chain tests
-    for subgraph in input_chains:
-        assert len(subgraph.tasks) == 3
-        # FIXME: This is zero because the input numpy array is not wrapped in its own placeholder object
-        assert len(subgraph.input_keys) == 0
-        # we don't know what order the two chains will come out in
-        # FIXME: key property
-        assert subgraph.output_key in (z1.key, z2.key)
+    assert len(subgraphs) == 1
+    subgraph = subgraphs[0]
+    assert len(subgraph.tasks) == 8
+    assert subgraph.output_key == ans.key
+    # tasks are in topological order
+    task_keys = list(subgraph.tasks)
+    assert task_keys.index(z1.key) < task_keys.index(merge.key)
+    assert task_keys.index(z2.key) < task_keys.index(merge.key)
+    assert task_keys[-1] == ans.key
 
 
 def test_extract_subgraphs_diamond(res):
@@ -170,33 +135,64 @@ def test_extract_subgraphs_diamond(res):
         result_node.__dask_graph__(),
         output_keys=[result_node.key],
         compiler="identity_comp",
+        include_singletons=False,
     )
-    assert len(subgraphs) == 4
-
-    key_to_node = {
-        top_node.key: top_node,
-        left_node.key: left_node,
-        right_node.key: right_node,
-        bottom_node.key: bottom_node,
-    }
-    node_key_to_input_node_keys = {
-        top_node.key: set(),
-        left_node.key: {top_node.key},
-        right_node.key: {top_node.key},
-        bottom_node.key: {left_node.key, right_node.key},
+    assert len(subgraphs) == 1
+    subgraph = subgraphs[0]
+    assert set(subgraph.tasks) == {
+        top_node.key,
+        left_node.key,
+        right_node.key,
+        bottom_node.key,
     }
+    assert list(subgraph.tasks)[0] == top_node.key
+    assert subgraph.input_keys == []
+    assert subgraph.output_keys == [bottom_node.key]
 
-    for subgraph in subgraphs:
-        expected_input_node_keys = node_key_to_input_node_keys[subgraph.output_key]
-        assert set(subgraph.input_keys) == expected_input_node_keys
 
+def test_extract_subgraphs_diamond_branch_used_outside(res):
+    """Branches of a diamond which are needed elsewhere become extra outputs"""
+    a = np.arange(100)
+    scale_func = res.algos.testing.scale
+    top_node = res.algos.testing.offset(a, offset=2.0)
+    left_node = scale_func(top_node, 3.0)
+    right_node = scale_func(top_node, 5.0)
+    bottom_node = res.algos.testing.add(left_node, right_node)
+    other_node = res.algos.testing.negate(left_node)
+
+    dsk = dask.base.collections_to_dsk([bottom_node, other_node], optimize_graph=False)
     subgraphs = mg_compiler.extract_compilable_subgraphs(
-        result_node.__dask_graph__(),
-        compiler="identity_comp",
-        output_keys=[result_node.key],
-        include_singletons=False,
+        dsk, output_keys=[bottom_node.key, other_node.key], compiler="identity_comp",
     )
-    assert len(subgraphs) == 0
+    assert len(subgraphs) == 1
+    subgraph = subgraphs[0]
+    assert len(subgraph.tasks) == 4
+    assert subgraph.is_multi_output
+    assert subgraph.output_key is None
+    assert subgraph.output_keys == [left_node.key, bottom_node.key]
+
+
+def test_extract_subgraphs_not_convex(res):
+    """Tasks connected through a non-compilable task must not be fused"""
+    a = np.arange(100)
+    scale_func = res.algos.testing.scale
+    x = scale_func(a, 2.0)
+    y = res.algos.testing.negate(x)
+    z = res.algos.testing.add(x, y)
+
+    subgraphs = mg_compiler.extract_compilable_subgraphs(
+        z.__dask_graph__(), output_keys=[z.key], compiler="identity_comp"
+    )
+    assert len(subgraphs) == 2
+    subgraphs = {s.output_key: s for s in subgraphs}
+    assert list(subgraphs[x.key].tasks) == [x.key]
+    assert list(subgraphs[z.key].tasks) == [z.key]
+    assert set(subgraphs[z.key].input_keys) == {x.key, y.key}
+
+    optimized_dsk = mg_compiler.compile_subgraphs(
+        z.__dask_graph__(), output_keys=[z.key], compiler=res.compilers["identity_comp"]
+    )
+    np.testing.assert_array_equal(dask.core.get(optimized_dsk, z.key), a * 2 - a * 2)
 
 
 def test_compile_subgraphs_three_chains(res):
@@ -213,9 +209,7 @@ def test_compile_subgraphs_three_chains(res):
     optimized_dsk = mg_compiler.compile_subgraphs(
         ans.__dask_graph__(), output_keys=[ans.key], compiler=compiler
     )
-    assert len(optimized_dsk) == 3
-    assert z1.key in optimized_dsk
-    assert z2.key in optimized_dsk
+    assert len(optimized_dsk) == 1
     assert ans.key in optimized_dsk
 
     optimized_result = dask.core.get(optimized_dsk, ans.key)
@@ -255,17 +249,12 @@ def test_extract_subgraphs_multiple_outputs(res):
     subgraphs = mg_compiler.extract_compilable_subgraphs(
         z.__dask_graph__(), output_keys=[z.key, y.key], compiler="identity_comp"
     )
-    assert len(subgraphs) == 2
-    for subgraph in subgraphs:
-        if subgraph.output_key == z.key:
-            assert len(subgraph.tasks) == 1
-            assert subgraph.input_keys == [y.key]
-        elif subgraph.output_key == y.key:
-            assert len(subgraph.tasks) == 2
-            # FIXME: This is zero because the input numpy array is not wrapped in its own placeholder object
-            assert subgraph.input_keys == []
-        else:
-            assert Fail, f"unexpected subgraph with output key {subgraph.output_key}"
+    assert len(subgraphs) == 1
+    subgraph = subgraphs[0]
+    assert len(subgraph.tasks) == 3
+    # FIXME: This is zero because the input numpy array is not wrapped in its own placeholder object
+    assert subgraph.input_keys == []
+    assert subgraph.output_keys == [y.key, z.key]
 
 
 def test_compile_subgraphs_multiple_outputs(res):
@@ -276,10 +265,20 @@ def test_compile_subgraphs_multiple_outputs(res):
     z = scale_func(y, 4.0)
 
     compiler = res.compilers["identity_comp"]
+    compiler.clear_trace()
     optimized_dsk = mg_compiler.compile_subgraphs(
         z.__dask_graph__(), output_keys=[z.key, y.key], compiler=compiler
     )
-    assert len(optimized_dsk) == 2
+    assert len(compiler.compile_subgraph_calls) == 1
+    # one fused task plus a getitem task for each output
+    assert len(optimized_dsk) == 3
+    fused_keys = set(optimized_dsk) - {y.key, z.key}
+    assert len(fused_keys) == 1
+    fused_task = optimized_dsk[fused_keys.pop()][0]
+    assert isinstance(fused_task, DelayedJITAlgo)
+    assert len(fused_task.result_type) == 2
+    assert all(isinstance(rt, NumpyVectorType) for rt in fused_task.result_type)
+    assert fused_task.data_label == "NumpyVectorType, NumpyVectorType"
     z_comp, y_comp = dask.core.get(optimized_dsk, [z.key, y.key])
     np.testing.assert_array_equal(z_comp, a * 2 * 3 * 4)
     np.testing.assert_array_equal(y_comp, a * 2 * 3)
@@ -296,7 +295,7 @@ def test_optimize(res):
     optimized_dsk = mg_compiler.optimize(
         z.__dask_graph__(), output_keys=[z.key, y.key], compiler=compiler
     )
-    assert len(optimized_dsk) == 2
+    assert len(optimized_dsk) == 3
 
 
 def test_optimize_cull(res):
@@ -328,12 +327,12 @@ def test_automatic_optimize(res):
     np.testing.assert_array_equal(z.compute(), a * 2 * 3 * 4)
     assert len(compiler.compile_subgraph_calls) == 1
 
-    # expect 2 compiled chains
+    # expect 1 compiled chain with 2 outputs
     compiler.clear_trace()
     result = dask.compute(z, y)
     np.testing.assert_array_equal(result[0], a * 2 * 3 * 4)
     np.testing.assert_array_equal(result[1], a * 2 * 3)
-    assert len(compiler.compile_subgraph_calls) == 2
+    assert len(compiler.compile_subgraph_calls) == 1
 
     # expect no compiled chains
     compiler.clear_trace()
@@ -370,6 +369,14 @@ def res():
     def compiled_offset(a: NumpyVectorType, *, offset: float) -> NumpyVectorType:
         return a + offset
 
+    @abstract_algorithm("testing.negate")
+    def testing_negate(a: Vector) -> Vector:  # pragma: no cover
+        pass
+
+    @concrete_algorithm("testing.negate")
+    def negate(a: NumpyVectorType) -> NumpyVectorType:
+        return -a
+
     registry = PluginRegistry("test_subgraphs_plugin")
     registry.register(testing_add)
     registry.register(compiled_add)
@@ -377,6 +384,8 @@ def res():
     registry.register(compiled_scale)
     registry.register(testing_offset)
     registry.register(compiled_offset)
+    registry.register(testing_negate)
+    registry.register(negate)
     registry.register(IdentityCompiler())
 
     resolver = Resolver()
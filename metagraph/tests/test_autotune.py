@@ -0,0 +1,129 @@
+import pytest
+import json
+import logging
+import numpy as np
+import scipy.sparse as ss
+from metagraph import config
+from metagraph.core.autotune import Autotuner
+from metagraph.dask import DaskResolver
+from .util import default_plugin_resolver
+
+
+@pytest.fixture
+def tuned_resolver(default_plugin_resolver, tmp_path):
+    dpr = default_plugin_resolver
+    if isinstance(dpr, DaskResolver):
+        # Timings are measured on concrete values
+        dpr = dpr._resolver
+    orig_autotuner = dpr.autotuner
+    dpr.autotuner = Autotuner(path=str(tmp_path / "autotune.json"))
+    try:
+        yield dpr
+    finally:
+        dpr.autotuner = orig_autotuner
+
+
+def test_autotune(tuned_resolver):
+    dpr = tuned_resolver
+    m = ss.csr_matrix(np.array([[0, 1, 0], [1, 0, 0], [0, 0, 0]], dtype=bool))
+    graph = dpr.wrappers.Graph.ScipyGraph(m)
+    algo_name = "clustering.connected_components"
+    default_order = dpr.find_algorithm_solutions(algo_name, graph)
+    assert len(default_order) > 1
+
+    # Disabled by default
+    dpr.algos.clustering.connected_components(graph)
+    assert dpr.autotuner.profile == {}
+
+    with config.set({"core.autotune.enabled": True}):
+        key = dpr.autotuner.make_key(dpr, algo_name, (graph,), {})
+        assert key.startswith(f"{algo_name}|3|graph=ScipyGraphType(")
+        assert dpr.autotuner.needs_tuning(key)
+
+        dpr.algos.clustering.connected_components(graph)
+        entry = dpr.autotuner.profile[key]
+        assert entry["winner"] in entry["timings"]
+        assert entry["calls"] == 0
+        with open(dpr.autotuner.path) as f:
+            assert json.load(f) == dpr.autotuner.profile
+
+        # Stored winner is preferred
+        slowest = Autotuner.algo_id(default_order[-1])
+        entry["winner"] = slowest
+        plans = dpr.find_algorithm_solutions(algo_name, graph)
+        assert Autotuner.algo_id(plans[0]) == slowest
+        assert plans[1:] == [p for p in plans if Autotuner.algo_id(p) != slowest]
+
+        dpr.algos.clustering.connected_components(graph)
+        assert entry["calls"] == 1
+        assert not dpr.autotuner.needs_tuning(key)
+        # Dispatch counts are persisted
+        dpr.autotuner.save_calls()
+        assert Autotuner(path=dpr.autotuner.path).profile[key]["calls"] == 1
+
+        # Periodic re-validation
+        with config.set({"core.autotune.revalidate_every": 1}):
+            assert dpr.autotuner.needs_tuning(key)
+            dpr.algos.clustering.connected_components(graph)
+            assert dpr.autotuner.profile[key]["calls"] == 0
+
+    # A new Autotuner loads the persisted profile
+    assert Autotuner(path=dpr.autotuner.path).profile == dpr.autotuner.profile
+
+
+def test_autotune_placeholders(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    if not isinstance(dpr, DaskResolver):
+        dpr = DaskResolver(dpr)
+    m = ss.csr_matrix(np.array([[0, 1, 0], [1, 0, 0], [0, 0, 0]], dtype=bool))
+    graph = dpr.wrappers.Graph.ScipyGraph(m)
+    key = Autotuner.make_key(dpr, "clustering.connected_components", (graph,), {})
+    assert key is None
+
+
+def test_autotune_make_key_once(tuned_resolver, monkeypatch):
+    dpr = tuned_resolver
+    m = ss.csr_matrix(np.array([[0, 1, 0], [1, 0, 0], [0, 0, 0]], dtype=bool))
+    graph = dpr.wrappers.Graph.ScipyGraph(m)
+    calls = []
+    make_key = Autotuner.make_key
+
+    def counting_make_key(*args):
+        calls.append(args)
+        return make_key(*args)
+
+    monkeypatch.setattr(Autotuner, "make_key", staticmethod(counting_make_key))
+    with config.set({"core.autotune.enabled": True}):
+        dpr.algos.clustering.connected_components(graph)
+        assert len(calls) == 1
+        dpr.algos.clustering.connected_components(graph)
+        assert len(calls) == 2
+
+
+def test_autotune_failing_candidate(tuned_resolver, caplog):
+    dpr = tuned_resolver
+    m = ss.csr_matrix(np.array([[0, 1, 0], [1, 0, 0], [0, 0, 0]], dtype=bool))
+    graph = dpr.wrappers.Graph.ScipyGraph(m)
+    solutions = dpr.find_algorithm_solutions("clustering.connected_components", graph)
+
+    def broken_connected_components(graph):  # pragma: no cover
+        pass
+
+    class BrokenPlan:
+        exceeds_memory_limit = False
+        algo = type("Algo", (), {"func": broken_connected_components})
+
+        def __call__(self, *args, **kwargs):
+            raise RuntimeError("broken implementation")
+
+    with caplog.at_level(logging.WARNING, logger="metagraph.core.autotune"):
+        result = dpr.autotuner.tune("key", [BrokenPlan()] + solutions[:1], (graph,), {})
+    dpr.assert_equal(result, solutions[0](graph))
+    assert "broken_connected_components failed" in caplog.text
+    assert "broken implementation" in caplog.text
+    timings = dpr.autotuner.profile["key"]["timings"]
+    assert list(timings) == [Autotuner.algo_id(solutions[0])]
+
+    # The error is raised if every candidate fails
+    with pytest.raises(RuntimeError, match="broken implementation"):
+        dpr.autotuner.tune("key", [BrokenPlan()], (graph,), {})
@@ -143,3 +143,88 @@ def test_call_using_exact_dispatcher(default_plugin_resolver):
     nxg = dpr.wrappers.Graph.NetworkXGraph(g)
     result = dpr.algos.centrality.pagerank.core_networkx(nxg)
     assert isinstance(result, Placeholder)
+
+
+def test_placeholder_properties(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    if not isinstance(dpr, DaskResolver):
+        dpr = DaskResolver(dpr)
+    g = nx.Graph()
+    g.add_edges_from([(0, 1), (1, 2), (2, 0)])
+    graph = dpr.wrappers.Graph.NetworkXGraph(g, edge_weight_label=None)
+    assert graph.known_abstract_props == {}
+
+    def aggregate_task(nm):
+        return next(
+            task[0]
+            for key, task in nm._dsk.items()
+            if key[1] == "util.graph.aggregate_edges"
+        )
+
+    # edge_type is not known, so it is checked when computed
+    nm = dpr.algos.util.graph.aggregate_edges(graph, lambda x, y: x + y, 0)
+    assert aggregate_task(nm).property_checks == {"graph": ({"edge_type": "map"}, {})}
+    with pytest.raises(TypeError, match="`edge_type` must be 'map'"):
+        nm.compute()
+
+    # The return annotation declares edge_type, so no check is needed
+    weighted = dpr.algos.util.graph.assign_uniform_weight(graph, 3)
+    assert weighted.known_abstract_props == {"edge_type": "map"}
+    nm = dpr.algos.util.graph.aggregate_edges(weighted, lambda x, y: x + y, 0)
+    assert aggregate_task(nm).property_checks == {}
+    dpr.assert_equal(nm, {0: 6, 1: 6, 2: 6})
+
+    # Abstract properties are preserved by translation
+    translated = dpr.translate(weighted, ScipyGraph)
+    assert translated.known_abstract_props == {"edge_type": "map"}
+
+    # Known properties which do not satisfy the requirements fail right away
+    unweighted = dpr.wrappers.Graph.NetworkXGraph(
+        g, edge_weight_label=None, aprops={"edge_type": "set"}
+    )
+    assert unweighted.known_abstract_props == {"edge_type": "set"}
+    with pytest.raises(TypeError, match="edge_type"):
+        dpr.algos.util.graph.aggregate_edges(unweighted, lambda x, y: x + y, 0)
+
+
+def test_translated_placeholder_property_checks(default_plugin_resolver):
+    from metagraph import PluginRegistry, abstract_algorithm, concrete_algorithm
+    from metagraph.plugins.core.types import Graph
+    from metagraph.core.dask.tasks import CheckedCall
+
+    @abstract_algorithm("testing.undirected_only")
+    def undirected_only(graph: Graph(is_directed=False)) -> bool:  # pragma: no cover
+        pass
+
+    @concrete_algorithm("testing.undirected_only")
+    def ss_undirected_only(graph: ScipyGraph) -> bool:
+        return True
+
+    registry = PluginRegistry("test_translated_placeholder_property_checks")
+    registry.register(undirected_only)
+    registry.register(ss_undirected_only)
+    res = Resolver()
+    res.load_plugins_from_environment()
+    res.register(registry.plugins)
+    dpr = DaskResolver(res)
+
+    g = nx.DiGraph()
+    g.add_edges_from([(0, 1), (1, 2)])
+    with pytest.raises(TypeError, match="is_directed"):
+        res.algos.testing.undirected_only(NetworkXGraph(g))
+
+    # is_directed is unknown before the translation, so it is checked after it
+    graph = dpr.delayed_wrapper(NetworkXGraph)(g)
+    result = dpr.algos.testing.undirected_only(graph)
+    call = next(
+        task[0]
+        for key, task in dict(result.__dask_graph__()).items()
+        if key[1] == "testing.undirected_only"
+    )
+    assert isinstance(call, CheckedCall)
+    assert call.property_checks == {"graph": ({"is_directed": False}, {})}
+    with pytest.raises(TypeError, match="`is_directed` must be False"):
+        result.compute()
+
+    graph = dpr.delayed_wrapper(NetworkXGraph)(g.to_undirected())
+    assert dpr.algos.testing.undirected_only(graph).compute()
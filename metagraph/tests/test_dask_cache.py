@@ -0,0 +1,98 @@
+import pytest
+
+grblas = pytest.importorskip("grblas")
+
+import networkx as nx
+import metagraph as mg
+from metagraph.dask import DaskResolver, result_cache
+from metagraph.core.dask.cache import ResultCache
+from metagraph.core.optimizer import default_optimizer, GraphStats
+from metagraph.plugins.networkx.types import NetworkXGraph
+from metagraph.plugins.scipy.types import ScipyGraph
+from metagraph.plugins.graphblas.types import GrblasGraph
+from metagraph.tests.util import default_plugin_resolver
+
+
+@pytest.fixture
+def dpr(default_plugin_resolver):
+    result_cache.clear()
+    yield (
+        default_plugin_resolver
+        if isinstance(default_plugin_resolver, DaskResolver)
+        else DaskResolver(default_plugin_resolver)
+    )
+    result_cache.clear()
+
+
+def test_reuse_across_computes(dpr):
+    g = nx.Graph()
+    g.add_weighted_edges_from([(0, 1, 1), (0, 2, 2), (2, 3, 5)])
+    y = dpr.translate(NetworkXGraph(g), ScipyGraph)
+    sums = dpr.algos.util.graph.aggregate_edges(y, lambda x, y: x + y, 0)
+    filtered = dpr.algos.util.graph.filter_edges(y, lambda w: w > 1)
+
+    # Disabled by default
+    sums.compute()
+    assert len(result_cache) == 0
+
+    with mg.config.set({"core.dask.cache.enabled": True}):
+        expected = sums.compute()
+        assert y.key in result_cache
+        assert sums.key in result_cache
+        hits = result_cache.stats.hits
+
+        # The translation shared with the first graph is not recomputed
+        optimized = default_optimizer.run(filtered.__dask_graph__(), [filtered.key])
+        assert GraphStats.from_graph(optimized).num_translations == 0
+        assert result_cache.stats.hits == hits + 1
+        assert filtered.compute().value.nnz == 4  # two undirected edges
+
+        # Cached output keys are returned directly
+        assert sums.compute() is expected
+
+
+def test_cached_upstream_not_looked_up(dpr):
+    g = nx.Graph()
+    g.add_weighted_edges_from([(0, 1, 1), (0, 2, 2), (2, 3, 5)])
+    y = dpr.translate(NetworkXGraph(g), ScipyGraph)
+    z = dpr.translate(y, GrblasGraph)
+    sums = dpr.algos.util.graph.aggregate_edges(z, lambda x, y: x + y, 0)
+
+    with mg.config.set({"core.dask.cache.enabled": True}):
+        z.compute()
+        assert y.key in result_cache
+        hits = result_cache.stats.hits
+        # Only the cached z is looked up, not the translation feeding it
+        default_optimizer.run(sums.__dask_graph__(), [sums.key])
+        assert result_cache.stats.hits == hits + 1
+
+
+def test_cost_based_eviction():
+    cache = ResultCache(memory_limit=100)
+    with mg.config.set({"core.dask.cache.min_seconds": 0.0}):
+        cache.put("expensive", "a", seconds=10.0, nbytes=50)
+        cache.put("cheap", "b", seconds=0.01, nbytes=40)
+        assert cache.total_nbytes == 90
+        # Storing another entry evicts the one cheapest to recompute per byte
+        cache.put("medium", "c", seconds=1.0, nbytes=40)
+        assert "cheap" not in cache
+        assert "expensive" in cache and "medium" in cache
+        assert cache.stats.evictions == 1
+
+        # Reuse makes an entry more valuable
+        for _ in range(20):
+            assert cache.get("medium") == "c"
+        cache.put("new", "d", seconds=10.0, nbytes=40)
+        assert "expensive" not in cache
+        assert "medium" in cache and "new" in cache
+
+        # Entries larger than the budget are never stored
+        cache.put("huge", "e", seconds=100.0, nbytes=101)
+        assert "huge" not in cache
+        assert cache.get("huge", "missing") == "missing"
+        assert cache.stats.misses == 1
+
+    with mg.config.set({"core.dask.cache.min_seconds": 1.0}):
+        cache.clear()
+        cache.put("quick", "f", seconds=0.5, nbytes=1)
+        assert len(cache) == 0
@@ -0,0 +1,122 @@
+import pytest
+
+grblas = pytest.importorskip("grblas")
+
+import os
+import threading
+import time
+import dask
+from dask.callbacks import Callback
+import numpy as np
+import networkx as nx
+import metagraph as mg
+from metagraph.dask import DaskResolver
+from metagraph.core.dask import scheduler
+from metagraph.core.dask.tasks import MetagraphTask, TaskAnnotations
+from metagraph.plugins.numpy.types import NumpyNodeMap
+from metagraph.plugins.graphblas.types import GrblasNodeMap
+from metagraph.plugins.python.types import PythonNodeMapType
+from metagraph.plugins.scipy.types import ScipyGraph
+from metagraph.plugins.networkx.types import NetworkXGraph
+from metagraph.tests.util import default_plugin_resolver
+
+
+@pytest.fixture
+def dpr(default_plugin_resolver):
+    if isinstance(default_plugin_resolver, DaskResolver):
+        return default_plugin_resolver
+    return DaskResolver(default_plugin_resolver)
+
+
+def test_task_annotations(dpr):
+    x = NumpyNodeMap(np.arange(100, dtype=np.float64))
+    y = dpr.translate(x, GrblasNodeMap)
+    z = dpr.translate(y, PythonNodeMapType)
+
+    translate_y = y.__dask_graph__()[y.key][0]
+    nbytes = NumpyNodeMap.Type.estimate_size(x).nbytes
+    expected = int(nbytes * translate_y.translator.memory_expansion)
+    assert translate_y.annotations == TaskAnnotations(
+        gil_bound=False, memory=expected, executor="threads"
+    )
+    assert y.estimated_nbytes == expected
+
+    # Python types are GIL-bound, so prefer processes
+    translate_z = z.__dask_graph__()[z.key][0]
+    assert translate_z.annotations.gil_bound
+    assert translate_z.annotations.executor == "processes"
+    with mg.config.set({"core.dask.gil_bound_executor": "threads"}):
+        assert translate_z.annotations.executor == "threads"
+
+    g = nx.Graph()
+    g.add_weighted_edges_from([(0, 1, 1), (1, 2, 2)])
+    nm = dpr.algos.util.graph.aggregate_edges(
+        dpr.wrappers.Graph.NetworkXGraph(g), lambda x, y: x + y, 0
+    )
+    algo_task = nm.__dask_graph__()[nm.key][0]
+    assert algo_task.annotations.gil_bound
+    # sizes of lazily constructed inputs are unknown
+    assert algo_task.annotations.memory is None
+
+
+def test_scheduler_compute(dpr):
+    g = nx.Graph()
+    g.add_weighted_edges_from([(0, 1, 1), (0, 2, 2), (2, 3, 5)])
+    # networkx is GIL-bound, so this translation runs in a separate process
+    graph = dpr.translate(NetworkXGraph(g), ScipyGraph)
+    assert graph.__dask_graph__()[graph.key][0].annotations.executor == "processes"
+    nm = dpr.algos.util.graph.aggregate_edges(graph, lambda x, y: x + y, 0)
+    x = dpr.translate({0: 1.5, 2: 2.5}, NumpyNodeMap)
+    workers = {}
+
+    def posttask(key, result, dsk, state, worker_id):
+        workers[key] = worker_id
+
+    with Callback(posttask=posttask):
+        result, numpy_result = dask.compute(
+            nm, x, scheduler=scheduler.get, num_workers=2, num_processes=1
+        )
+    # Callbacks receive the id of the process or thread which ran each task
+    assert workers[graph.key] != os.getpid()
+    assert workers[x.key] not in {os.getpid(), threading.get_ident()}
+    sums = {0: 3, 1: 1, 2: 7, 3: 5}
+    assert dpr._resolver.translate(result, PythonNodeMapType) == sums
+    dpr.assert_equal(numpy_result, NumpyNodeMap(np.array([1.5, 2.5]), [0, 2]))
+
+    # The config selects the scheduler used by Placeholders
+    with mg.config.set(
+        {"core.dask.scheduler": "metagraph", "core.dask.num_processes": 1}
+    ):
+        assert dpr._resolver.translate(nm.compute(), PythonNodeMapType) == sums
+
+
+class SleepTask(MetagraphTask):
+    def __init__(self, memory, record):
+        def call(*args):
+            with record["lock"]:
+                record["active"] += 1
+                record["max_active"] = max(record["max_active"], record["active"])
+            time.sleep(0.05)
+            with record["lock"]:
+                record["active"] -= 1
+            return memory
+
+        super().__init__(callable=call, result_type=None, memory=memory)
+
+
+def test_memory_admission():
+    def run(memory_limit):
+        record = {"lock": threading.Lock(), "active": 0, "max_active": 0}
+        dsk = {f"t{i}": (SleepTask(100, record),) for i in range(4)}
+        dsk["total"] = (sum, [f"t{i}" for i in range(4)])
+        result = scheduler.get(
+            dsk, "total", num_workers=4, num_processes=1, memory_limit=memory_limit
+        )
+        assert result == 400
+        return record["max_active"]
+
+    assert run(memory_limit=None) > 1
+    assert run(memory_limit=200) <= 2
+    assert run(memory_limit="150 B") == 1
+    # A task larger than the limit still runs (by itself)
+    assert run(memory_limit=10) == 1
@@ -1,7 +1,13 @@
 import numpy as np
 from dask.utils import tmpfile
 from metagraph.tests.compiler.test_subgraphs import res
-from metagraph.core.dask.visualize import visualize, merge_dict_of_dict
+from metagraph.core.dask.visualize import (
+    visualize,
+    merge_dict_of_dict,
+    graph_attributes,
+)
+from metagraph.core.dask.profile import TaskProfiler
+from metagraph.core.dask.tasks import MetagraphTask
 
 
 def test_merge_dict_of_dict():
@@ -72,3 +78,39 @@ def test_optimize_and_visualize(res):
         with open(fn) as f:
             contents = f.read()
         assert "identity_comp fused" in contents
+
+
+def test_profile_annotations(res):
+    a = np.arange(100)
+    scale_func = res.algos.testing.scale
+    z1 = scale_func(scale_func(a, 2.0), 3.0)
+    z2 = scale_func(a, 2.5)
+    ans = res.algos.testing.add(z1, z2)
+
+    with TaskProfiler() as prof:
+        result = ans.compute()
+    np.testing.assert_array_equal(result, a * 6.0 + a * 2.5)
+
+    # the optimized graph is recorded, so fused tasks are measured as they ran
+    assert prof.records
+    for key, record in prof.records.items():
+        assert isinstance(prof.dsk[key][0], MetagraphTask)
+        assert record.duration >= 0
+        assert record.nbytes > 0
+
+    path = prof.critical_path()
+    assert path
+    assert path[-1].key in prof.records
+    assert all(a.end <= b.end for a, b in zip(path, path[1:]))
+    table = prof.critical_path_table()
+    assert table.splitlines()[0].startswith("task")
+    assert table.splitlines()[-1].startswith("total")
+
+    function_attributes, data_attributes = graph_attributes(prof.dsk, prof)
+    for key in prof.records:
+        assert "s on " in function_attributes[key]["label"]
+        assert function_attributes[key]["fillcolor"].startswith("#ff")
+        assert "B" in data_attributes[key]["label"]
+    slowest = max(prof.records.values(), key=lambda r: r.duration)
+    if slowest.duration > 0:
+        assert function_attributes[slowest.key]["fillcolor"] == "#ff0000"
@@ -9,3 +9,11 @@ def test_dtype():
 
     assert dtypes.dtype("bool") == dtypes.bool
     assert dtypes.dtype(np.int32) == dtypes.int32
+
+
+def test_as_index_array():
+    assert dtypes.as_index_array(np.array([0, 2 ** 40], dtype=np.uint64)).dtype == (
+        np.int64
+    )
+    with pytest.raises(ValueError, match="does not fit in int64"):
+        dtypes.as_index_array(np.array([0, 2 ** 63], dtype=np.uint64))
@@ -1,7 +1,11 @@
 import numpy as np
+import pandas as pd
+import scipy.sparse as ss
 import pytest
 
 from metagraph.core.node_labels import NodeLabels
+from metagraph.plugins import has_grblas
+from metagraph.tests.util import default_plugin_resolver
 
 
 def test_nodelabels():
@@ -62,3 +66,67 @@ def test_nodelabels_errors():
         NodeLabels.from_dict([("A", 1), ("B", 2)])
     with pytest.raises(ValueError, match="mapping is empty"):
         NodeLabels.from_dict({})
+
+
+def test_vectorized_lookups():
+    # Unsorted ids are located with a hash table
+    labels = NodeLabels(np.array([42, 0, 10]), np.array(["C", "A", "B"]))
+    np.testing.assert_array_equal(
+        labels[np.array(["A", "C", "A"])], np.array([0, 42, 0])
+    )
+    np.testing.assert_array_equal(labels.ids[np.array([10, 42])], np.array(["B", "C"]))
+    assert labels.ids[0] == "A" and type(labels.ids[0]) is str
+    assert labels == NodeLabels([0, 10, 42], ["A", "B", "C"])
+    with pytest.raises(KeyError, match="labels not found"):
+        labels[np.array(["A", "D"])]
+    with pytest.raises(KeyError, match="node ids not found"):
+        labels.ids[np.array([0, 1])]
+
+    # Tuples remain single labels
+    tuples = NodeLabels([1, 2], [("a", 1), ("b", 2)])
+    assert tuples[("b", 2)] == 2
+    assert tuples.ids[[2, 1]] == [("b", 2), ("a", 1)]
+
+    # Categorical labels
+    cats = NodeLabels(np.arange(4), pd.Categorical(["x", "y", "z", "w"]))
+    assert cats["z"] == 2
+    assert cats.ids[3] == "w"
+    np.testing.assert_array_equal(cats.ids_to_labels([1, 0]), ["y", "x"])
+
+
+def test_relabel(default_plugin_resolver):
+    from metagraph.plugins.numpy.types import NumpyNodeMap, NumpyNodeSet
+
+    dpr = default_plugin_resolver
+    labels = NodeLabels([0, 10, 42], ["A", "B", "C"])
+    series = labels.relabel(NumpyNodeMap(np.array([1.5, 2.5]), nodes=[10, 42]))
+    assert series.to_dict() == {"B": 1.5, "C": 2.5}
+    assert labels.relabel({0: 1, 42: 2}) == {"A": 1, "C": 2}
+    assert labels.relabel({0, 10}) == {"A", "B"}
+    pns = dpr.translate(NumpyNodeSet([0, 42]), dpr.types.NodeSet.PythonNodeSetType)
+    assert labels.relabel(pns, resolver=dpr) == {"A", "C"}
+    if has_grblas:
+        from metagraph.plugins.graphblas.types import GrblasNodeSet
+
+        grb = dpr.translate(NumpyNodeSet([0, 42]), GrblasNodeSet)
+        np.testing.assert_array_equal(labels.relabel(grb, resolver=dpr), ["A", "C"])
+    with pytest.raises(TypeError, match="expected a NodeSet or NodeMap"):
+        labels.relabel(
+            dpr.wrappers.EdgeSet.ScipyEdgeSet(ss.csr_matrix(np.eye(2))), resolver=dpr
+        )
+
+
+def test_save_load(tmp_path):
+    labels = NodeLabels([5, 1, 3], ["five", "one", "three"])
+    labels.save(tmp_path / "labels")
+    loaded = NodeLabels.load(tmp_path / "labels")
+    assert isinstance(loaded.node_ids, np.memmap)
+    assert loaded == labels
+    assert loaded["three"] == 3
+    assert loaded.ids[[1, 5]] == ["one", "five"]
+    assert 2 not in loaded.ids
+
+    NodeLabels([0, 1], [2.5, 3]).save(tmp_path / "numbers")
+    assert NodeLabels.load(tmp_path / "numbers", mmap_mode=None)[3.0] == 1
+    with pytest.raises(TypeError, match="only string or numeric labels"):
+        NodeLabels([0, 1], [("a", 1), "b"]).save(tmp_path / "mixed")
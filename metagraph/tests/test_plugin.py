@@ -155,6 +155,31 @@ def test_wrapper():
         StrNumZeroOnlyDefaultErrorMessage(0)
 
 
+def test_wrapper_trusted():
+    from metagraph import config
+
+    class StrNumValidated(plugin.Wrapper, abstract=MyNumericAbstractType):
+        def __init__(self, val):
+            super().__init__()
+            if self._validating():
+                self._assert_instance(val, str)
+            self.value = val
+
+        class TypeMixin:
+            pass
+
+    with pytest.raises(TypeError, match="is not an instance of"):
+        StrNumValidated(0)
+    with config.set({"core.debug.validate_trusted": False}):
+        assert StrNumValidated.trusted(0).value == 0
+    # Construction after a trusted one is validated again
+    with pytest.raises(TypeError, match="is not an instance of"):
+        StrNumValidated(0)
+    with config.set({"core.debug.validate_trusted": True}):
+        with pytest.raises(TypeError, match="is not an instance of"):
+            StrNumValidated.trusted(0)
+
+
 def test_translator():
     assert isinstance(int_to_str, plugin.Translator)
     assert int_to_str.__name__ == "int_to_str"
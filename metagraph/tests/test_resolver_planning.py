@@ -24,7 +24,7 @@ import typing
 from typing import Tuple, List, Dict, Any
 from collections import OrderedDict
 
-from .util import site_dir, example_resolver
+from .util import site_dir, example_resolver, default_plugin_resolver
 
 
 def test_translate_plan(example_resolver):
@@ -51,3 +51,101 @@ def test_run_algorithm_plan(example_resolver, capsys):
         'No concrete algorithm for "power" can be satisfied for the given inputs'
         in captured.out
     )
+
+
+def test_memory_limit(default_plugin_resolver):
+    from metagraph.core.planning import MemoryLimitError
+    import numpy as np
+    import scipy.sparse as ss
+    from metagraph.dask import DaskResolver
+
+    dpr = default_plugin_resolver
+    if isinstance(dpr, DaskResolver):
+        # The limit is checked when translating concrete values, not placeholders
+        dpr = dpr._resolver
+    m = ss.csr_matrix(np.array([[0, 1, 0], [1, 0, 2], [0, 2, 0]], dtype=np.int64))
+    graph = dpr.wrappers.Graph.ScipyGraph(m)
+    nbytes = dpr.size_of(graph).nbytes
+
+    mst = dpr.plan.translate(graph, dpr.wrappers.Graph.NetworkXGraph)
+    peak, final = mst.estimate_memory(nbytes)
+    assert peak == final == nbytes * mst.translators[0].memory_expansion
+
+    # No limit by default
+    dpr.translate(graph, dpr.wrappers.Graph.NetworkXGraph)
+
+    with config.set({"core.dispatch.memory_limit": nbytes * 2}):
+        with pytest.raises(MemoryLimitError, match="NumpyGraph") as excinfo:
+            dpr.translate(graph, dpr.wrappers.Graph.NetworkXGraph)
+        # Not translating is not an alternative
+        assert "ScipyGraphType:" not in str(excinfo.value)
+        # Cheaper translations are still allowed
+        dpr.translate(graph, dpr.wrappers.Graph.NumpyGraph)
+
+        # Algorithm only implemented for networkx requires an expensive translation
+        plans = dpr.find_algorithm_solutions("subgraph.maximal_independent_set", graph)
+        assert plans[0].exceeds_memory_limit
+        assert plans[0].estimated_nbytes > nbytes * 2
+        with pytest.raises(MemoryLimitError, match="subgraph.maximal_independent_set"):
+            dpr.algos.subgraph.maximal_independent_set(graph)
+
+    with config.set({"core.dispatch.memory_limit": "1 GB"}):
+        plans = dpr.find_algorithm_solutions("subgraph.maximal_independent_set", graph)
+        assert not plans[0].exceeds_memory_limit
+        dpr.algos.subgraph.maximal_independent_set(graph)
+
+
+def test_concrete_property_self_translation(default_plugin_resolver):
+    import numpy as np
+    import scipy.sparse as ss
+    from metagraph.dask import DaskResolver
+
+    dpr = default_plugin_resolver
+    if isinstance(dpr, DaskResolver):
+        dpr = dpr._resolver
+    ScipyGraph = dpr.wrappers.Graph.ScipyGraph
+    m = ss.csc_matrix(np.array([[0, 1, 0], [0, 0, 1], [1, 0, 0]], dtype=np.int64))
+    graph = ScipyGraph(m)
+    assert ScipyGraph.Type.compute_concrete_properties(
+        graph, {"format", "has_sorted_indices"}
+    ) == {"format": "csc", "has_sorted_indices": True}
+
+    # Same-type translation enforces the layout and caches the conversion
+    mst = dpr.plan.translate(graph, ScipyGraph.Type(format="csr"))
+    assert [t.__name__ for t in mst.translators] == ["graph_to_graph"]
+    csr_graph = mst(graph)
+    assert csr_graph.value.format == "csr"
+    assert mst(graph).value is csr_graph.value
+    assert mst(csr_graph) is csr_graph
+    dpr.assert_equal(csr_graph, graph)
+
+    # Translations from other types finish with the same-type translation
+    nx_graph = dpr.translate(graph, dpr.wrappers.Graph.NetworkXGraph)
+    mst = dpr.plan.translate(nx_graph, ScipyGraph.Type(format="coo"))
+    assert mst.translators[-1].__name__ == "graph_to_graph"
+    assert mst(nx_graph).value.format == "coo"
+
+    # Algorithms declaring a layout get the graph converted once before being called
+    def scipy_plan(graph, resolver=dpr):
+        plans = resolver.find_algorithm_solutions("traversal.bfs_iter", graph, 0)
+        (plan,) = [
+            p for p in plans if p.algo.func.__name__ == "ss_breadth_first_search_iter"
+        ]
+        return plan
+
+    plan = scipy_plan(graph)
+    translators = plan.required_translations["graph"].translators
+    assert [t.__name__ for t in translators] == ["graph_to_graph"]
+    np.testing.assert_array_equal(plan(graph, 0), [0, 1, 2])
+    assert not scipy_plan(csr_graph).required_translations
+
+    # Lazy graphs with unknown layout are converted as well
+    ldpr = DaskResolver(dpr)
+    lazy_graph = ldpr.translate(nx_graph, ScipyGraph)
+    plan = scipy_plan(lazy_graph, ldpr)
+    translators = plan.required_translations["graph"].translators
+    assert [t.__name__ for t in translators] == ["graph_to_graph"]
+    np.testing.assert_array_equal(plan(lazy_graph, 0).compute(), [0, 1, 2])
+    lazy_coo = ldpr.translate(graph, ScipyGraph.Type(format="coo"))
+    assert lazy_coo.known_concrete_props == {"format": "coo"}
+    assert lazy_coo.compute().value.format == "coo"
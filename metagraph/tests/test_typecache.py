@@ -9,7 +9,7 @@ from metagraph import (
     concrete_algorithm,
 )
 from metagraph.core.resolver import Resolver
-from metagraph.core.typecache import TypeCache, TypeInfo
+from metagraph.core.typecache import TypeCache, TypeInfo, SizeEstimate
 
 from .util import site_dir, example_resolver
 import numpy as np
@@ -30,6 +30,28 @@ def test_typeinfo(example_resolver):
         typeinfo.update_props({"foo": True})
 
 
+def test_size_estimate(example_resolver):
+    from .util import StrType
+
+    # Types which don't override _estimate_size know nothing about their size
+    assert example_resolver.size_of("python") == SizeEstimate()
+
+    class CountingStrType(StrType, abstract=StrType.abstract):
+        calls = 0
+
+        @classmethod
+        def _estimate_size(cls, obj):
+            cls.calls += 1
+            return SizeEstimate(nbytes=len(obj))
+
+    obj = "metagraph"
+    assert CountingStrType.estimate_size(obj) == SizeEstimate(nbytes=9)
+    # Estimate is cached in the TypeInfo
+    assert CountingStrType.get_typeinfo(obj).size == SizeEstimate(nbytes=9)
+    CountingStrType.estimate_size(obj)
+    assert CountingStrType.calls == 1
+
+
 def test_typecache_basic(example_resolver):
     typecache = TypeCache()
 
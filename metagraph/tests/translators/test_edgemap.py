@@ -1,7 +1,9 @@
 from metagraph.tests.util import default_plugin_resolver
 from . import RoundTripper
 from metagraph.plugins.pandas.types import PandasEdgeMap, PandasEdgeSet
+from metagraph.plugins.numpy.types import NumpyEdgeMap, NumpyEdgeSet
 import pandas as pd
+import numpy as np
 
 
 def test_edgemap_roundtrip_directed(default_plugin_resolver):
@@ -130,3 +132,99 @@ def test_edgemap_edgeset_oneway_directed_symmetric(default_plugin_resolver):
         PandasEdgeMap(df_start, "Source", "Target", "wgt", is_directed=True),
         PandasEdgeSet(df_end, "Source", "Target", is_directed=True),
     )
+
+
+def test_pandas_2_partitioned(default_plugin_resolver):
+    import metagraph as mg
+    from metagraph.plugins.scipy.types import ScipyEdgeMap
+    from metagraph.plugins.dask.types import PartitionedEdgeMap
+    from metagraph.dask import DaskResolver
+
+    dpr = default_plugin_resolver
+    df = pd.DataFrame(
+        {
+            "Source": [1, 3, 5, 9, 9],
+            "Target": [3, 7, 5, 1, 3],
+            "weight": [1.1, -3.3, 4.4, 2.5, 7.0],
+        }
+    )
+    for is_directed in (True, False):
+        x = PandasEdgeMap(df, "Source", "Target", is_directed=is_directed)
+        with mg.config.set({"core.dask.npartitions": 3}):
+            y = dpr.translate(x, PartitionedEdgeMap)
+            if isinstance(dpr, DaskResolver):
+                y = y.compute()
+        assert y.npartitions == 3
+        assert list(y.offsets) == [0, 1, 3, 5]
+        dpr.assert_equal(dpr.translate(y, ScipyEdgeMap), dpr.translate(x, ScipyEdgeMap))
+
+
+def test_pandas_2_scipy_shared_frame(default_plugin_resolver):
+    import gc
+    import numpy as np
+    import scipy.sparse as ss
+    import metagraph as mg
+    from metagraph.plugins.pandas import types as pandas_types
+    from metagraph.plugins.scipy.types import ScipyEdgeMap, ScipyEdgeSet
+    from metagraph.dask import DaskResolver
+
+    dpr = default_plugin_resolver
+
+    def translate(value, dst_type):
+        result = dpr.translate(value, dst_type)
+        return result.compute() if isinstance(dpr, DaskResolver) else result
+
+    # Unsorted sources with non-integer node ids
+    df = pd.DataFrame(
+        {
+            "Source": ["c", "a", "b", "a"],
+            "Target": ["a", "b", "d", "d"],
+            "weight": [3, 1, 2, 4],
+        }
+    )
+    edgemap = PandasEdgeMap(df, "Source", "Target", is_directed=False)
+    edgeset = PandasEdgeSet(df, "Source", "Target", is_directed=False)
+    y = translate(edgemap, ScipyEdgeMap)
+    key = (id(df), "Source", "Target")
+    cached = pandas_types._edge_positions_cache[key]
+    z = translate(edgeset, ScipyEdgeSet)
+    # The node index is factorized once for both translations
+    assert pandas_types._edge_positions_cache[key] is cached
+
+    expected = ss.csr_matrix(
+        np.array([[0, 1, 3, 4], [1, 0, 0, 2], [3, 0, 0, 0], [4, 2, 0, 0]])
+    )
+    assert list(y.node_list) == ["a", "b", "c", "d"]
+    assert y.value.has_canonical_format
+    assert (y.value != expected).nnz == 0
+    assert (z.value != (expected != 0)).nnz == 0
+
+    # The cache is bounded; least recently used positions are dropped first
+    nbytes = sum(arr.nbytes for arr in cached)
+    df2 = df.copy()
+    with mg.config.set({"core.memory.edge_positions_cache": nbytes}):
+        translate(PandasEdgeSet(df2, "Source", "Target"), ScipyEdgeSet)
+        assert key not in pandas_types._edge_positions_cache
+        assert (id(df2), "Source", "Target") in pandas_types._edge_positions_cache
+    with mg.config.set({"core.memory.edge_positions_cache": nbytes - 1}):
+        translate(edgeset, ScipyEdgeSet)
+        assert key not in pandas_types._edge_positions_cache
+
+    # The cache entry is dropped along with the frame
+    key2 = (id(df2), "Source", "Target")
+    del df2
+    gc.collect()  # task graphs of lazy translations may be part of reference cycles
+    assert key2 not in pandas_types._edge_positions_cache
+
+
+def test_numpy_edgemap_roundtrip(default_plugin_resolver):
+    rt = RoundTripper(default_plugin_resolver)
+    src = np.array([1, 3, 3, 5])
+    weights = np.array([1.1, 0.0, -3.3, 4.4])
+    rt.verify_round_trip(NumpyEdgeMap(src, np.array([3, 1, 7, 5]), weights))
+    undirected = NumpyEdgeMap(src, np.array([3, 5, 7, 5]), weights, is_directed=False)
+    rt.verify_round_trip(undirected)
+    # Undirected edges may be listed in either direction
+    rt.verify_one_way(
+        undirected, NumpyEdgeSet([3, 5, 7, 5], [1, 3, 3, 5], is_directed=False),
+    )
@@ -1,6 +1,8 @@
 from metagraph.tests.util import default_plugin_resolver
 from . import RoundTripper
 from metagraph.plugins.pandas.types import PandasEdgeSet
+from metagraph.plugins.numpy.types import NumpyEdgeSet
+import numpy as np
 import pandas as pd
 
 
@@ -20,3 +22,10 @@ def test_edgeset_roundtrip_directed_symmetric(default_plugin_resolver):
     rt = RoundTripper(default_plugin_resolver)
     df = pd.DataFrame({"Source": [1, 3, 3, 5], "Target": [3, 1, 5, 3]})
     rt.verify_round_trip(PandasEdgeSet(df, "Source", "Target", is_directed=True))
+
+
+def test_numpy_edgeset_roundtrip(default_plugin_resolver):
+    rt = RoundTripper(default_plugin_resolver)
+    src = np.array([1, 3, 3, 5])
+    rt.verify_round_trip(NumpyEdgeSet(src, np.array([3, 1, 7, 5])))
+    rt.verify_round_trip(NumpyEdgeSet(src, np.array([3, 5, 7, 5]), is_directed=False))
@@ -4,18 +4,26 @@ grblas = pytest.importorskip("grblas")
 
 from metagraph.tests.util import default_plugin_resolver
 from . import RoundTripper
-from metagraph.plugins.numpy.types import NumpyNodeSet
+from metagraph.plugins.numpy.types import NumpyNodeSet, NumpyGraph
 from metagraph.plugins.scipy.types import ScipyEdgeMap, ScipyEdgeSet, ScipyGraph
 from metagraph.plugins.networkx.types import NetworkXGraph
 from metagraph.plugins.graphblas.types import GrblasEdgeMap, GrblasGraph
 from metagraph.plugins.pandas.types import PandasEdgeSet
+import metagraph as mg
 from metagraph import NodeLabels
+from metagraph.dask import DaskResolver
 import networkx as nx
 import scipy.sparse as ss
 import pandas as pd
 import numpy as np
 
 
+def _translate(dpr, value, dst_type):
+    """Translates value, computing the result if dpr is a DaskResolver"""
+    result = dpr.translate(value, dst_type)
+    return result.compute() if isinstance(dpr, DaskResolver) else result
+
+
 def test_graph_roundtrip_directed_unweighted(default_plugin_resolver):
     dpr = default_plugin_resolver
     rt = RoundTripper(dpr)
@@ -351,6 +359,36 @@ def test_networkx_scipy_graph_from_edgeset(default_plugin_resolver):
     dpr.assert_equal(y, intermediate)
 
 
+def test_scipy_networkx_bulk_adjacency(default_plugin_resolver):
+    dpr = default_plugin_resolver
+
+    #    2 5 9
+    # 2 [1 4  ]
+    # 5 [4   6]
+    # 9 [  6  ]
+    m = ss.csr_matrix(
+        ([1, 4, 4, 6, 6], ([0, 0, 1, 1, 2], [0, 1, 0, 2, 1])), dtype=np.int64
+    )
+    x = ScipyGraph(m, [2, 5, 9], np.array([0.5, 1.5, 2.5]))
+    g = _translate(dpr, x, NetworkXGraph).value
+    assert not g.is_directed()
+    assert sorted(g.edges(data="weight")) == [(2, 2, 1), (2, 5, 4), (5, 9, 6)]
+    assert type(g.edges[2, 5]["weight"]) is int
+    assert g.nodes[9] == {"weight": 2.5}
+    # Both directions of an undirected edge share their attributes, like networkx
+    assert g.adj[2][5] is g.adj[5][2]
+
+    # Directed graphs share attributes between successors and predecessors
+    m = ss.csr_matrix(([1.5, 2.5, 3.5], ([0, 1, 2], [1, 2, 1])))
+    x = ScipyGraph(m, [2, 5, 9])
+    g = _translate(dpr, x, NetworkXGraph).value
+    assert g.is_directed()
+    assert dict(g.pred[5]) == {2: {"weight": 1.5}, 9: {"weight": 3.5}}
+    assert g.pred[5][9] is g.succ[9][5]
+    assert g.nodes[2] == {}
+    dpr.assert_equal(dpr.translate(NetworkXGraph(g), ScipyGraph), x)
+
+
 def test_scipy_graphblas_edgemap(default_plugin_resolver):
     dpr = default_plugin_resolver
     #    0 2 7
@@ -370,6 +408,57 @@ def test_scipy_graphblas_edgemap(default_plugin_resolver):
     dpr.assert_equal(y, intermediate)
 
 
+def test_scipy_graphblas_csr_import_export(default_plugin_resolver):
+    dpr = default_plugin_resolver
+
+    # Duplicate entries are summed
+    g = ss.csr_matrix(
+        ([1.5, 2.5, 1.0, 3.0, 1.0], [1, 2, 2, 0, 0], [0, 2, 3, 5]), shape=(3, 3)
+    )
+    indices = g.indices.copy()
+    data = g.data.copy()
+    expected = grblas.Matrix.from_values(
+        [0, 0, 1, 2], [1, 2, 2, 0], [1.5, 2.5, 1.0, 4.0], nrows=3, ncols=3
+    )
+    # Dense, sorted sparse and unsorted node lists
+    for node_list, (rows, cols) in [
+        ([0, 1, 2], ([0, 0, 1, 2], [1, 2, 2, 0])),
+        ([1, 4, 6], ([1, 1, 4, 6], [4, 6, 6, 1])),
+        ([6, 1, 4], ([6, 6, 1, 4], [1, 4, 4, 6])),
+    ]:
+        x = ScipyGraph(g, node_list)
+        y = _translate(dpr, x, GrblasGraph)
+        m = grblas.Matrix.from_values(
+            rows,
+            cols,
+            [1.5, 2.5, 1.0, 4.0],
+            nrows=max(node_list) + 1,
+            ncols=max(node_list) + 1,
+        )
+        assert y.value.isequal(m)
+        # The scipy buffers are left untouched
+        np.testing.assert_array_equal(g.indices, indices)
+        np.testing.assert_array_equal(g.data, data)
+
+    # Exported buffers become the scipy arrays, narrowed to the index dtype
+    x = GrblasGraph(expected)
+    y = _translate(dpr, x, ScipyGraph)
+    assert y.value.indices.dtype == y.value.indptr.dtype == np.int32
+    g.sum_duplicates()
+    dpr.assert_equal(y, ScipyGraph(g))
+    with mg.config.set({"core.memory.index_dtype": "int64"}):
+        y = _translate(dpr, x, ScipyGraph)
+    assert y.value.indices.dtype == y.value.indptr.dtype == np.int64
+    dpr.assert_equal(y, ScipyGraph(g))
+    assert x.value.nvals == 4
+
+    # Matrices with a single value store it once; inactive nodes are extracted away
+    m = grblas.Matrix.from_values([0, 3], [3, 5], [2, 2], nrows=6, ncols=6)
+    y = _translate(dpr, GrblasEdgeMap(m), ScipyEdgeMap)
+    np.testing.assert_array_equal(y.node_list, [0, 3, 5])
+    np.testing.assert_array_equal(y.value.toarray(), [[0, 2, 0], [0, 0, 2], [0, 0, 0]])
+
+
 # def test_networkx_2_pandas(default_plugin_resolver):
 #     dpr = default_plugin_resolver
 #     g = nx.DiGraph()
@@ -389,3 +478,93 @@ def test_scipy_graphblas_edgemap(default_plugin_resolver):
 #     # Convert networkx <- pandas edge list
 #     x2 = dpr.translate(y, NetworkXGraph)
 #     dpr.assert_equal(x, x2)
+
+
+def test_scipy_partitioned_graphblas(default_plugin_resolver):
+    import metagraph as mg
+    from metagraph.plugins.dask.types import PartitionedGraph
+
+    dpr = default_plugin_resolver
+    #     0 1 2 3 4
+    # 0 [ 1 2 - - - ]
+    # 1 [ - - 3 - - ]
+    # 2 [ - - - - - ]
+    # 3 [ 4 - 5 6 7 ]
+    # 4 [ - - - - 8 ]
+    matrix = ss.csr_matrix(
+        ([1, 2, 3, 4, 5, 6, 7, 8], [0, 1, 2, 0, 2, 3, 4, 4], [0, 2, 3, 3, 7, 8]),
+        shape=(5, 5),
+    )
+    x = ScipyGraph(matrix, [2, 4, 5, 8, 9], [1.5, 2.5, 3.5, 4.5, 5.5])
+    with mg.config.set({"core.dask.npartitions": 2}):
+        y = dpr.translate(x, PartitionedGraph)
+        if isinstance(dpr, DaskResolver):
+            y = y.compute()
+    # Blocks hold roughly equal numbers of edges
+    assert y.npartitions == 2
+    assert [block.nnz for block in y.blocks] == [3, 5]
+    dpr.assert_equal(dpr.translate(y, ScipyGraph), x)
+
+    z = dpr.translate(y, GrblasGraph)
+    dpr.assert_equal(z, dpr.translate(x, GrblasGraph))
+    if isinstance(dpr, DaskResolver):
+        # Otherwise the round trip back to PartitionedGraph is optimized away
+        z = z.compute()
+    with mg.config.set({"core.dask.npartitions": 3}):
+        y2 = dpr.translate(z, PartitionedGraph)
+        if isinstance(dpr, DaskResolver):
+            y2 = y2.compute()
+    assert y2.npartitions == 3
+    dpr.assert_equal(y2, y)
+
+
+def test_numpy_graph_roundtrip(default_plugin_resolver):
+    rt = RoundTripper(default_plugin_resolver)
+    src = np.array([1, 3, 3, 5, 7])
+    dst = np.array([3, 1, 5, 5, 9])
+    # Node 8 is an isolate
+    node_list = np.array([1, 3, 5, 7, 8, 9])
+    rt.verify_round_trip(NumpyGraph(src, dst, node_list=node_list))
+    rt.verify_round_trip(
+        NumpyGraph(
+            src,
+            dst,
+            np.array([1.5, 2.5, -1.0, 0.0, 4.5]),
+            node_list,
+            np.array([10, 30, 50, 70, 80, 90]),
+        )
+    )
+    dst = np.array([3, 5, 7, 5, 9])
+    rt.verify_round_trip(
+        NumpyGraph(src, dst, np.array([1, 2, 3, 4, 5]), node_list, is_directed=False)
+    )
+    rt.verify_round_trip(NumpyGraph(src, dst, is_directed=False))
+
+
+def test_numpy_graph_index_dtype(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    g = nx.DiGraph()
+    g.add_weighted_edges_from([(0, 3, 1.5), (3, 7, 2.5)])
+    x = NetworkXGraph(g)
+    # Translations produce node ids with the index dtype directly
+    with mg.config.set({"core.debug.validate_trusted": False}):
+        for src in (x, _translate(dpr, x, GrblasGraph)):
+            y = _translate(dpr, src, NumpyGraph)
+            assert y.src.dtype == y.dst.dtype == y.node_list.dtype == np.int32
+        with mg.config.set({"core.memory.index_dtype": "int64"}):
+            y = _translate(dpr, x, NumpyGraph)
+            assert y.src.dtype == y.dst.dtype == y.node_list.dtype == np.int64
+
+
+def test_numpy_graph_missing_nodes(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    # Trusted construction does not check the edges against node_list
+    with mg.config.set({"core.debug.validate_trusted": False}):
+        g = NumpyGraph.trusted(
+            np.array([0, 5]),
+            np.array([1, 7]),
+            np.array([1.0, 2.0]),
+            np.array([0, 1, 6]),
+        )
+    with pytest.raises(ValueError, match=r"not found in node_list: \{5\}"):
+        _translate(dpr, g, ScipyGraph.Type)
@@ -5,6 +5,7 @@ grblas = pytest.importorskip("grblas")
 import metagraph as mg
 from metagraph import NodeLabels
 from metagraph.tests.util import default_plugin_resolver
+from metagraph.dask import DaskResolver
 from . import RoundTripper
 from metagraph.plugins.python.types import PythonNodeMapType, PythonNodeSetType
 from metagraph.plugins.numpy.types import NumpyNodeMap, NumpyNodeSet
@@ -31,6 +32,21 @@ def test_nodemap_nodeset_oneway(default_plugin_resolver):
     rt.verify_one_way(start, end)
 
 
+def test_numpy_index_dtype(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    if isinstance(dpr, DaskResolver):
+        dpr = dpr._resolver
+    gnm = GrblasNodeMap(grblas.Vector.from_values([1, 42], [1.5, 2.5], size=100))
+    gns = GrblasNodeSet(grblas.Vector.from_values([1, 42], [True, True], size=100))
+    # Translations produce node ids with the index dtype directly
+    with mg.config.set({"core.debug.validate_trusted": False}):
+        assert dpr.translate({1: 1.5, 42: 2.5}, NumpyNodeMap).nodes.dtype == np.int32
+        assert dpr.translate(gnm, NumpyNodeMap).nodes.dtype == np.int32
+        assert dpr.translate(gns, NumpyNodeSet).value.dtype == np.int32
+        with mg.config.set({"core.memory.index_dtype": "int64"}):
+            assert dpr.translate(gnm, NumpyNodeMap).nodes.dtype == np.int64
+
+
 def test_method_call(default_plugin_resolver):
     dpr = default_plugin_resolver
     with dpr:
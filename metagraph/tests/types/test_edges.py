@@ -5,6 +5,7 @@ grblas = pytest.importorskip("grblas")
 from metagraph.plugins.pandas.types import PandasEdgeMap, PandasEdgeSet
 from metagraph.plugins.graphblas.types import GrblasEdgeMap, GrblasEdgeSet
 from metagraph.plugins.scipy.types import ScipyEdgeMap, ScipyEdgeSet
+from metagraph.plugins.numpy.types import NumpyEdgeMap, NumpyEdgeSet
 import pandas as pd
 import scipy.sparse as ss
 import numpy as np
@@ -260,3 +261,47 @@ def test_scipy():
     # Exercise ScipyEdgeSet
     y = ScipyEdgeSet(g_int)
     assert (y.node_list == [0, 1, 2]).all()
+
+
+def test_numpy_edge():
+    aprops = {"is_directed": True, "dtype": "int", "has_negative_weights": True}
+    x = NumpyEdgeMap([0, 0, 1, 2], [1, 2, 2, 0], [1, -2, 3, 4])
+    assert NumpyEdgeMap.Type.compute_abstract_properties(x, set(aprops)) == aprops
+    NumpyEdgeMap.Type.assert_equal(
+        x,
+        NumpyEdgeMap([2, 1, 0, 0], [0, 2, 2, 1], [4, 3, -2, 1]),
+        aprops,
+        aprops,
+        {},
+        {},
+    )
+    with pytest.raises(AssertionError):
+        NumpyEdgeMap.Type.assert_equal(
+            x,
+            NumpyEdgeMap([2, 1, 0, 0], [0, 2, 2, 1], [4, 3, 2, 1]),
+            aprops,
+            aprops,
+            {},
+            {},
+        )
+    with pytest.raises(TypeError, match="weights and edges sizes"):
+        NumpyEdgeMap([0, 1], [1, 2], [1.0])
+
+    uprops = {"is_directed": False}
+    NumpyEdgeSet.Type.assert_equal(
+        NumpyEdgeSet([0, 1, 2], [1, 2, 2], is_directed=False),
+        NumpyEdgeSet([2, 2, 1], [2, 1, 0], is_directed=False),
+        uprops,
+        uprops,
+        {},
+        {},
+    )
+    with pytest.raises(AssertionError):
+        NumpyEdgeSet.Type.assert_equal(
+            NumpyEdgeSet([0, 1], [1, 2]),
+            NumpyEdgeSet([1, 2], [0, 1]),
+            {"is_directed": True},
+            {"is_directed": True},
+            {},
+            {},
+        )
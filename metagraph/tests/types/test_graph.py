@@ -2,6 +2,7 @@ import pytest
 
 from metagraph.plugins.networkx.types import NetworkXGraph
 from metagraph.plugins.scipy.types import ScipyGraph
+from metagraph.plugins.numpy.types import NumpyGraph, NumpyNodeMap
 import networkx as nx
 import numpy as np
 import scipy.sparse as ss
@@ -106,6 +107,14 @@ def test_networkx():
         g.add_weighted_edges_from([(0, 2, "a"), (1, 0, "b"), (1, 2, "c")])
         gr = NetworkXGraph(g)
         NetworkXGraph.Type.compute_abstract_properties(gr, {"edge_dtype"})
+    # Python ints too large for int64 are still ints
+    g = nx.Graph()
+    g.add_weighted_edges_from([(0, 1, 2 ** 70), (1, 2, -1)])
+    props = NetworkXGraph.Type.compute_abstract_properties(
+        NetworkXGraph(g), {"edge_dtype", "edge_has_negative_weights"}
+    )
+    assert props["edge_dtype"] == "int"
+    assert props["edge_has_negative_weights"] is True
 
 
 def test_scipy():
@@ -411,3 +420,299 @@ def test_graphblas():
     GrblasGraph.Type.assert_equal(
         GrblasGraph(m_unweighted), GrblasGraph(m_unweighted), uprops, uprops, {}, {}
     )
+
+
+def test_scipy_derived_structures():
+    # [1 2  ]
+    # [  0 3]
+    # [  3  ]
+    m = ss.csr_matrix(
+        ([1, 2, 0, 3, 3], ([0, 0, 1, 1, 2], [0, 1, 1, 2, 1])), shape=(3, 3)
+    )
+    g = ScipyGraph(m)
+    derived = g.derived
+    assert g.derived is derived
+    np.testing.assert_array_equal(derived.out_degrees, [2, 2, 1])
+    np.testing.assert_array_equal(derived.in_degrees, [1, 3, 1])
+    assert (derived.transpose != m.T).nnz == 0
+    assert (derived.lower != ss.tril(m, k=-1)).nnz == 0
+    assert (derived.upper != ss.triu(m, k=1)).nnz == 0
+    # Structures are computed once
+    assert derived.lower is derived.lower
+    assert derived.csc is derived.csc
+    # Symmetry is shared with the is_directed property
+    assert not derived.is_symmetric()
+    assert ScipyGraph.Type.compute_abstract_properties(g, {"is_directed"})[
+        "is_directed"
+    ]
+    assert not derived.is_symmetric(check_values=False)
+    # A new matrix gets new structures
+    g.value = ss.csr_matrix(m + m.T)
+    assert g.derived is not derived
+    assert g.derived.is_symmetric()
+
+
+def test_scipy_upper_storage():
+    import metagraph as mg
+
+    # Undirected graph with a self-loop
+    # [1 2   ]
+    # [2   3 5]
+    # [  3   4]
+    # [  5 4  ]
+    full = ss.csr_matrix(
+        np.array([[1, 2, 0, 0], [2, 0, 3, 5], [0, 3, 0, 4], [0, 5, 4, 0]])
+    )
+    upper = ScipyGraph(ss.triu(full, format="csr"), storage="upper")
+    assert ScipyGraph.Type.compute_concrete_properties(upper, {"storage"}) == {
+        "storage": "upper"
+    }
+    assert not ScipyGraph.Type.compute_abstract_properties(upper, {"is_directed"})[
+        "is_directed"
+    ]
+    # Triangles and degrees are derived without building the full matrix
+    derived = upper.derived
+    np.testing.assert_array_equal(derived.out_degrees, [2, 3, 2, 2])
+    np.testing.assert_array_equal(derived.in_degrees, [2, 3, 2, 2])
+    assert (derived.lower != ss.tril(full, k=-1)).nnz == 0
+    assert (derived.upper != ss.triu(full, k=1)).nnz == 0
+    assert "matrix" not in derived._cache
+    # The full matrix is built on first access of `value`
+    assert (upper.value != full).nnz == 0
+    assert upper.value is upper.value
+    mg.resolver.assert_equal(ScipyGraph(full), upper)
+
+    with pytest.raises(TypeError, match="below the diagonal"):
+        ScipyGraph(full, storage="upper")
+    with pytest.raises(TypeError, match="only valid for undirected"):
+        ScipyGraph(upper.stored, storage="upper", aprops={"is_directed": True})
+    with pytest.raises(TypeError, match="storage must be one of"):
+        ScipyGraph(full, storage="lower")
+
+    # Translations to and from upper storage
+    dpr = mg.resolver
+    to_upper = dpr.translate(ScipyGraph(full), ScipyGraph.Type(storage="upper"))
+    assert to_upper.storage == "upper"
+    assert (to_upper.stored != ss.triu(full)).nnz == 0
+    to_full = dpr.translate(upper, ScipyGraph.Type(storage="full"))
+    assert to_full.storage == "full"
+    assert (to_full.stored != full).nnz == 0
+    with pytest.raises(ValueError, match="only valid for undirected"):
+        dpr.translate(ScipyGraph(ss.triu(full)), ScipyGraph.Type(storage="upper"))
+
+    # Edge lists and networkx graphs are translated directly into upper storage
+    edges = NumpyGraph(
+        np.array([0, 1, 1, 3, 0]),
+        np.array([1, 2, 3, 2, 0]),
+        np.array([2, 3, 5, 4, 1]),
+        is_directed=False,
+    )
+    mst = dpr.plan.translate(edges, ScipyGraph.Type(storage="upper"))
+    assert [t.__name__ for t in mst.translators] == [
+        "graph_from_numpy",
+        "graph_to_graph",
+    ]
+    from_edges = mst(edges)
+    assert from_edges.storage == "upper"
+    assert (from_edges.stored != upper.stored).nnz == 0
+    nx_graph = dpr.translate(upper, NetworkXGraph)
+    from_nx = dpr.translate(nx_graph, ScipyGraph.Type(storage="upper"))
+    assert from_nx.storage == "upper"
+    assert (from_nx.stored != upper.stored).nnz == 0
+
+    # Algorithms working on one triangle give the same results as on the full matrix
+    assert dpr.algos.clustering.triangle_count(upper) == 1
+    dpr.assert_equal(
+        dpr.algos.clustering.connected_components(upper),
+        dpr.algos.clustering.connected_components(ScipyGraph(full)),
+    )
+    dpr.assert_equal(
+        dpr.algos.centrality.degree(upper),
+        dpr.translate(dpr.algos.centrality.degree(nx_graph), NumpyNodeMap),
+    )
+    tree = dpr.algos.traversal.minimum_spanning_tree(upper)
+    assert tree.storage == "upper"
+    dpr.assert_equal(tree, dpr.algos.traversal.minimum_spanning_tree(ScipyGraph(full)))
+
+
+def test_graphblas_derived_structures():
+    grblas = pytest.importorskip("grblas")
+    from metagraph.plugins.graphblas.types import GrblasGraph, GrblasEdgeMap
+
+    m = grblas.Matrix.from_values(
+        [0, 0, 1, 1, 2], [0, 1, 1, 2, 1], [1, 2, 0, 3, 3], nrows=3, ncols=3
+    )
+    g = GrblasGraph(m)
+    derived = g.derived
+    assert g.derived is derived
+    assert derived.out_degrees.isequal(
+        grblas.Vector.from_values([0, 1, 2], [2, 2, 1], dtype=grblas.dtypes.UINT64)
+    )
+    assert derived.in_degrees.isequal(
+        grblas.Vector.from_values([0, 1, 2], [1, 3, 1], dtype=grblas.dtypes.UINT64)
+    )
+    assert derived.transpose.isequal(m.T.new())
+    assert derived.lower.isequal(
+        grblas.Matrix.from_values([2], [1], [3], nrows=3, ncols=3)
+    )
+    assert derived.upper.isequal(
+        grblas.Matrix.from_values([0, 1], [1, 2], [2, 3], nrows=3, ncols=3)
+    )
+    assert derived.lower is derived.lower
+    assert not derived.is_symmetric()
+    assert not derived.is_symmetric(check_values=False)
+    em = GrblasEdgeMap(m)
+    assert GrblasEdgeMap.Type.compute_abstract_properties(em, {"is_directed"})[
+        "is_directed"
+    ]
+    assert ("is_symmetric", True) in em.derived._cache
+    g.value = m.ewise_add(m.T).new()
+    assert g.derived is not derived
+    assert g.derived.is_symmetric()
+
+
+def test_compute_abstract_properties():
+    all_props = {
+        "is_directed",
+        "node_type",
+        "node_dtype",
+        "edge_type",
+        "edge_dtype",
+        "edge_has_negative_weights",
+    }
+
+    # NetworkX
+    g = nx.Graph()
+    g.add_weighted_edges_from([(0, 1, 2), (1, 2, -3.5)])
+    props = NetworkXGraph.Type.compute_abstract_properties(NetworkXGraph(g), all_props)
+    assert props == {
+        "is_directed": False,
+        "node_type": "set",
+        "node_dtype": None,
+        "edge_type": "map",
+        "edge_dtype": "float",
+        "edge_has_negative_weights": True,
+    }
+    g.add_edge(2, 3)  # edge missing a weight makes the edges a set
+    props = NetworkXGraph.Type.compute_abstract_properties(NetworkXGraph(g), all_props)
+    assert props["edge_type"] == "set"
+    assert props["edge_dtype"] is None
+    assert props["edge_has_negative_weights"] is None
+
+    # Scipy
+    # [  2  ]
+    # [2   3]
+    # [  3  ]
+    m = ss.csr_matrix(
+        (np.array([2, 2, 3, 3]), np.array([1, 0, 2, 1]), np.array([0, 1, 3, 4])),
+        shape=(3, 3),
+    )
+    props = ScipyGraph.Type.compute_abstract_properties(ScipyGraph(m), all_props)
+    assert props == {
+        "is_directed": False,
+        "node_type": "set",
+        "node_dtype": None,
+        "edge_type": "map",
+        "edge_dtype": "int",
+        "edge_has_negative_weights": False,
+    }
+    # Same structure, asymmetric values
+    m_asym = m.copy()
+    m_asym[2, 1] = 4
+    props = ScipyGraph.Type.compute_abstract_properties(
+        ScipyGraph(m_asym), {"is_directed"}
+    )
+    assert props["is_directed"] is True
+    # Only the structure matters for edge sets
+    props = ScipyGraph.Type.compute_abstract_properties(
+        ScipyGraph(m_asym.astype(bool)), all_props
+    )
+    assert props["is_directed"] is False
+    assert props["edge_type"] == "set"
+    assert props["edge_has_negative_weights"] is None
+    # Unsorted indices and non-csr formats
+    m_unsorted = ss.csr_matrix(
+        (np.array([2, 3, 2, 3]), np.array([1, 2, 0, 1]), np.array([0, 1, 3, 4])),
+        shape=(3, 3),
+    )
+    m_unsorted.has_sorted_indices = False
+    for mat in (m_unsorted, m_unsorted.tocoo(), m_unsorted.tocsc()):
+        props = ScipyGraph.Type.compute_abstract_properties(
+            ScipyGraph(mat), {"is_directed"}
+        )
+        assert props["is_directed"] is False
+    props = ScipyGraph.Type.compute_abstract_properties(
+        ScipyGraph(ss.csr_matrix((3, 3), dtype=np.int64)), all_props
+    )
+    assert props["is_directed"] is False
+    assert props["edge_has_negative_weights"] is False
+
+
+def test_numpy():
+    aprops = {
+        "is_directed": False,
+        "node_type": "map",
+        "node_dtype": "int",
+        "edge_type": "map",
+        "edge_dtype": "float",
+    }
+    g = NumpyGraph(
+        [0, 1, 3],
+        [1, 2, 0],
+        [1.0, 2.0, 3.0],
+        [3, 1, 0, 2],
+        [30, 10, 0, 20],
+        is_directed=False,
+    )
+    # node_list is sorted along with node_vals
+    np.testing.assert_array_equal(g.node_list, [0, 1, 2, 3])
+    np.testing.assert_array_equal(g.node_vals, [0, 10, 20, 30])
+    assert NumpyGraph.Type.compute_abstract_properties(g, set(aprops)) == aprops
+    # Undirected edges may be listed in either direction and order
+    g2 = NumpyGraph(
+        [0, 2, 1],
+        [3, 1, 0],
+        [3.0, 2.0, 1.0],
+        [0, 1, 2, 3],
+        [0, 10, 20, 30],
+        is_directed=False,
+    )
+    NumpyGraph.Type.assert_equal(g, g2, aprops, aprops, {}, {})
+    g3 = NumpyGraph(
+        [0, 2, 1],
+        [3, 1, 0],
+        [3.0, 2.0, 1.5],
+        [0, 1, 2, 3],
+        [0, 10, 20, 30],
+        is_directed=False,
+    )
+    with pytest.raises(AssertionError):
+        NumpyGraph.Type.assert_equal(g, g3, aprops, aprops, {}, {})
+    # Directed edges must match exactly
+    directed = {**aprops, "is_directed": True}
+    with pytest.raises(AssertionError):
+        NumpyGraph.Type.assert_equal(
+            NumpyGraph(
+                [0, 1, 3], [1, 2, 0], [1.0, 2.0, 3.0], [0, 1, 2, 3], [0, 10, 20, 30]
+            ),
+            NumpyGraph(
+                [1, 2, 0], [0, 1, 3], [1.0, 2.0, 3.0], [0, 1, 2, 3], [0, 10, 20, 30]
+            ),
+            directed,
+            directed,
+            {},
+            {},
+        )
+    # Nodes default to those found in the edges
+    np.testing.assert_array_equal(NumpyGraph([5, 2], [2, 9]).node_list, [2, 5, 9])
+
+    with pytest.raises(TypeError, match="src and dst sizes"):
+        NumpyGraph([0, 1], [1])
+    with pytest.raises(TypeError, match="Invalid dtype"):
+        NumpyGraph([0.5], [1.0])
+    with pytest.raises(TypeError, match="Duplicate node ids"):
+        NumpyGraph([0], [1], node_list=[1, 0, 1])
+    with pytest.raises(TypeError, match="node vals size"):
+        NumpyGraph([0], [1], node_list=[0, 1], node_vals=[1])
+    with pytest.raises(TypeError, match=r"not found in node_list: \{5, 7\}"):
+        NumpyGraph([0, 5], [1, 7], [1.0, 2.0], node_list=[0, 1, 6])
@@ -5,6 +5,7 @@ grblas = pytest.importorskip("grblas")
 from metagraph.plugins.python.types import PythonNodeMapType
 from metagraph.plugins.numpy.types import NumpyNodeMap, NumpyNodeSet
 from metagraph.plugins.graphblas.types import GrblasNodeMap, GrblasNodeSet
+import metagraph as mg
 from metagraph import NodeLabels
 import numpy as np
 from grblas import Vector
@@ -113,6 +114,24 @@ def test_numpy():
     assert len(x) == 4
     assert 1 in x
     assert [2, 3, 4] in x
+    # The caller's array is not sorted in place
+    nodes = np.array([3, 1, 2])
+    NumpyNodeSet(nodes)
+    np.testing.assert_array_equal(nodes, [3, 1, 2])
+    # Trusted construction skips the checks and uses the array as is
+    # (int64 ids are not narrowed, which would scan and copy them)
+    with mg.config.set({"core.debug.validate_trusted": False}):
+        assert NumpyNodeSet.trusted(nodes).value is nodes
+        assert NumpyNodeMap.trusted([1, 2, 3], nodes=nodes).nodes is nodes
+
+    # Node ids are narrowed to int32 when they fit
+    assert NumpyNodeSet(nodes).value.dtype == np.int32
+    assert NumpyNodeMap([1, 2, 3]).nodes.dtype == np.int32
+    assert NumpyNodeSet([0, 2 ** 40]).value.dtype == np.int64
+    with mg.config.set({"core.memory.index_dtype": "int64"}):
+        assert NumpyNodeMap([1, 2, 3], nodes=nodes.astype(np.int32)).nodes.dtype == (
+            np.int64
+        )
 
     # Exercise NumpyNodeMap
     with pytest.raises(TypeError, match="Invalid number of dimensions: 2"):
@@ -134,6 +153,44 @@ def test_numpy():
         y[[7, 8, 9]]
 
 
+def test_numpy_node_index():
+    # Default nodes are contiguous and located by offset
+    x = NumpyNodeMap(np.array([10.0, 11.0, 12.0, 13.0]))
+    assert x.node_index.is_contiguous
+    assert x[2] == 12.0
+    assert 3 in x and 4 not in x and -1 not in x
+    np.testing.assert_array_equal(x[np.array([3, 0])], [13.0, 10.0])
+    with pytest.raises(KeyError, match="are not all in the NodeMap"):
+        x[[0, 4]]
+
+    # Dense ids use a lookup table, sparse ids use searchsorted
+    dense = NumpyNodeMap(np.array([1, 2, 3, 4]), nodes=[5, 6, 8, 9])
+    assert dense.node_index.is_dense
+    assert dense[8] == 3
+    assert 7 not in dense and 10 not in dense and 4 not in dense
+    np.testing.assert_array_equal(
+        dense.node_index.locate([9, 7, 5, 100]), [3, -1, 0, -1]
+    )
+    sparse = NumpyNodeMap(np.array([1, 2, 3]), nodes=[5, 100, 10000])
+    assert not sparse.node_index.is_dense
+    assert sparse[10000] == 3
+    assert 10001 not in sparse
+    np.testing.assert_array_equal(
+        sparse.node_index.locate([10000, 7, 5, 20000]), [2, -1, 0, -1]
+    )
+
+    # Node sets use a presence bitmap
+    s = NumpyNodeSet([2, 3, 5, 6])
+    assert s.node_index.is_dense
+    assert 5 in s and 4 not in s and 7 not in s
+    assert [2, 6] in s and [2, 4] not in s
+    assert 3 not in NumpyNodeSet(np.array([], dtype=np.int64))
+
+    # Reassigned nodes are reindexed
+    dense.nodes = np.array([0, 1, 2, 3])
+    assert dense[3] == 4
+
+
 def test_graphblas():
     GrblasNodeMap.Type.assert_equal(
         GrblasNodeMap(Vector.from_values([0, 1, 3, 4], [1, 2, 3, 4])),
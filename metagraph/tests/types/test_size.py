@@ -0,0 +1,64 @@
+from metagraph.core.typecache import SizeEstimate
+from metagraph.dask import DaskResolver
+from metagraph.tests.util import default_plugin_resolver
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as ss
+
+
+def test_size_of(default_plugin_resolver):
+    dpr = default_plugin_resolver
+    if isinstance(dpr, DaskResolver):
+        # Placeholders only carry an estimate of their size
+        nm = dpr.wrappers.NodeMap.NumpyNodeMap(np.array([1.1, 2.2]), nodes=[3, 4])
+        assert dpr.size_of(nm) == SizeEstimate(nbytes=nm.estimated_nbytes)
+        dpr = dpr._resolver
+
+    # Numpy
+    x = np.arange(5)
+    assert dpr.size_of(x) == SizeEstimate(nbytes=x.nbytes)
+    nm = dpr.wrappers.NodeMap.NumpyNodeMap(np.array([1.1, 2.2]), nodes=[3, 4])
+    size = dpr.size_of(nm)
+    assert size.num_nodes == 2
+    assert size.num_edges == 0
+    assert size.nbytes == nm.value.nbytes + nm.nodes.nbytes
+    em = dpr.wrappers.EdgeMap.NumpyEdgeMap([0, 1, 1], [1, 2, 0], [1.0, 2.0, 3.0])
+    size = dpr.size_of(em)
+    # Counting nodes would require a pass over the edges
+    assert size.num_nodes is None
+    assert size.num_edges == 3
+    assert size.nbytes == em.src.nbytes + em.dst.nbytes + em.weights.nbytes
+
+    # Python
+    size = dpr.size_of({1: 1.1, 2: 2.2, 3: 3.3})
+    assert size.num_nodes == 3
+    assert size.nbytes > 0
+
+    # Scipy
+    m = ss.csr_matrix(np.array([[0, 1, 0], [1, 0, 2], [0, 2, 0]]))
+    graph = dpr.wrappers.Graph.ScipyGraph(m)
+    size = dpr.size_of(graph)
+    assert size.num_nodes == 3
+    assert size.num_edges == 4
+    assert size.nbytes == (
+        m.data.nbytes + m.indices.nbytes + m.indptr.nbytes + graph.node_list.nbytes
+    )
+
+    # NetworkX counts undirected edges in both directions, like the matrix
+    g = nx.Graph()
+    g.add_weighted_edges_from([(0, 1, 1), (1, 2, 2)])
+    size = dpr.size_of(dpr.wrappers.Graph.NetworkXGraph(g))
+    assert size.num_nodes == 3
+    assert size.num_edges == 4
+    assert size.nbytes > 0
+
+    # Pandas
+    df = pd.DataFrame({"source": [0, 1, 1], "target": [1, 2, 0]})
+    es = dpr.wrappers.EdgeSet.PandasEdgeSet(df, is_directed=True)
+    size = dpr.size_of(es)
+    # Counting nodes would require a pass over the edges
+    assert size.num_nodes is None
+    assert size.num_edges == 3
+    assert size.nbytes == df.memory_usage().sum()
+    assert es._index is None